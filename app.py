@@ -4,8 +4,22 @@ Managers' Lab - Main Application Entry Point
 Strategic Financial Planning & Unit Economics Platform
 """
 
+import importlib
+
 import streamlit as st
 
+from core import telemetry
+
+# Structured Path stages, routed by flow_step
+PATH_STEPS = {
+    0: "step0_calibration",
+    1: "step1_survival",
+    2: "step2_cash",
+    3: "step3_unit_economics",
+    4: "step4_sustainability",
+    5: "step5_strategy",
+}
+
 # ═══════════════════════════════════════════════════════════
 # 1. PAGE CONFIGURATION
 # ═══════════════════════════════════════════════════════════
@@ -37,8 +51,10 @@ mode = st.session_state.get("mode", "home")
 # 4.1 HOME MODE
 # ───────────────────────────────────────────────────────────
 if mode == "home":
-    from ui.home import show_home
-    show_home()
+    with telemetry.target("page", "home") as timing:
+        with timing.phase("import"):
+            from ui.home import show_home
+        show_home()
 
 # ───────────────────────────────────────────────────────────
 # 4.2 PATH MODE (5-Stage Journey)
@@ -52,30 +68,12 @@ elif mode == "path":
         st.progress(step / 5)
         st.info(f"📍 **Path Progress:** Stage {step} of 5 ({progress_pct:.0f}% complete)")
     
-    # Step routing
-    if step == 0:
-        from path.step0_calibration import run_step
-        run_step()
-    
-    elif step == 1:
-        from path.step1_survival import run_step
-        run_step()
-    
-    elif step == 2:
-        from path.step2_cash import run_step
-        run_step()
-    
-    elif step == 3:
-        from path.step3_unit_economics import run_step
-        run_step()
-    
-    elif step == 4:
-        from path.step4_sustainability import run_step
-        run_step()
-    
-    elif step == 5:
-        from path.step5_strategy import run_step
-        run_step()
+    # Step routing (timed: import / compute / render per stage)
+    if step in PATH_STEPS:
+        with telemetry.target("stage", PATH_STEPS[step]) as timing:
+            with timing.phase("import"):
+                run_step = importlib.import_module(f"path.{PATH_STEPS[step]}").run_step
+            run_step()
     
     else:
         st.warning("⚠️ Unknown step. Returning to calibration.")
@@ -93,8 +91,10 @@ elif mode == "library":
 # 4.4 ABOUT MODE
 # ───────────────────────────────────────────────────────────
 elif mode == "about":
-    from ui.about import show_about
-    show_about()
+    with telemetry.target("page", "about") as timing:
+        with timing.phase("import"):
+            from ui.about import show_about
+        show_about()
 
 # ───────────────────────────────────────────────────────────
 # 4.5 FALLBACK
@@ -107,6 +107,9 @@ else:
 # ═══════════════════════════════════════════════════════════
 # 5. FOOTER
 # ═══════════════════════════════════════════════════════════
+from ui.sidebar import render_metric_trace
+render_metric_trace()
+
 st.sidebar.divider()
 st.sidebar.caption("🧪 **Managers' Lab** v2.0.1")
 st.sidebar.caption("Shared Core • 365-Day Cycle • Built with ❤️")
@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+"""
+Benchmark suite for the engine's numeric kernels (see benchmarks/suite.py).
+
+    python -m benchmarks --help
+"""
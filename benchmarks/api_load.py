@@ -0,0 +1,189 @@
+# benchmarks/api_load.py
+"""
+Load test for the local HTTP API (core/api.py), stdlib only.
+
+Small clients post single scenarios (break-even, CLV, discount NPV, loan vs
+leasing) in a closed loop. The run has two phases: small clients alone, then
+the same clients while large clients post vectorized batches. Comparing the
+small-request latency of the two phases shows whether big jobs stall the
+event loop.
+
+    python -m benchmarks.api_load --serve                  # start a server on a free port, test, stop it
+    python -m benchmarks.api_load --url http://127.0.0.1:8765 --duration 20 --batch-rows 200000
+
+Exits non-zero when any request fails.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# One representative scenario per kernel (defaults of the tool UIs)
+SMALL_REQUESTS = [
+    ("/v1/break-even", {"price": 30.0, "variable_cost": 18.0, "volume": 12000, "fixed_cost": 90000}),
+    ("/v1/clv", {"purchases": 4, "margin_per_order": 35.0, "retention_years": 5, "discount": 8.0,
+                 "churn": 20.0, "realization": 0.9, "risk_p": 2.0, "cac": 120.0}),
+    ("/v1/discount-npv", {"current_sales": 1_000_000, "extra_sales": 150_000, "discount_trial": 0.02,
+                          "prc_clients_take_disc": 0.4, "days_curently_paying_clients_take_discount": 60,
+                          "days_curently_paying_clients_not_take_discount": 90,
+                          "new_days_payment_clients_take_disc": 10, "cogs": 600_000, "wacc": 0.1,
+                          "avg_days_pay_suppliers": 45}),
+    ("/v1/loan-leasing", {"loan_rate": 0.06, "wc_rate": 0.08, "years": 5, "tax_rate": 0.22, "when": 0,
+                          "value": 100_000, "loan_pct": 0.8, "lease_pct": 1.0, "exp_loan": 1_000,
+                          "exp_lease": 500, "residual": 3_000, "dep_years": 8}),
+]
+
+
+def batch_body(rows, seed=0):
+    """Columnar discount-NPV batch of `rows` scenarios (JSON bytes)."""
+    rng = np.random.default_rng(seed)
+    sales = rng.uniform(1e5, 1e7, rows)
+    columns = {
+        "current_sales": sales, "extra_sales": sales * rng.uniform(0, 0.3, rows),
+        "discount_trial": rng.uniform(0, 0.05, rows), "prc_clients_take_disc": rng.uniform(0, 1, rows),
+        "days_curently_paying_clients_take_discount": 60, "days_curently_paying_clients_not_take_discount": 90,
+        "new_days_payment_clients_take_disc": rng.uniform(0, 20, rows), "cogs": sales * 0.6,
+        "wacc": rng.uniform(0.02, 0.2, rows), "avg_days_pay_suppliers": 45,
+    }
+    return json.dumps({"columns": {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in columns.items()}}).encode()
+
+
+class Client(threading.Thread):
+    """Closed-loop client: posts its requests round-robin until `stop` is set, recording latencies."""
+
+    def __init__(self, url, requests, stop):
+        super().__init__(daemon=True)
+        self.url = urlsplit(url)
+        self.requests = requests
+        self.stop = stop
+        self.latencies = []
+        self.errors = []
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=120)
+        i = 0
+        while not self.stop.is_set():
+            path, body = self.requests[i % len(self.requests)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    self.errors.append(f"{path}: HTTP {response.status}")
+                    continue
+            except (OSError, http.client.HTTPException) as e:
+                self.errors.append(f"{path}: {e}")
+                conn.close()
+                conn = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=120)
+                continue
+            self.latencies.append(time.perf_counter() - start)
+        conn.close()
+
+
+def run_phase(url, duration, small_clients, large_clients, large_body):
+    """Run the clients for `duration` seconds; returns (small clients, large clients)."""
+    stop = threading.Event()
+    small = [Client(url, [(path, json.dumps(body).encode()) for path, body in SMALL_REQUESTS], stop)
+             for _ in range(small_clients)]
+    large = [Client(url, [("/v1/discount-npv/batch", large_body)], stop) for _ in range(large_clients)]
+    for client in small + large:
+        client.start()
+    time.sleep(duration)
+    stop.set()
+    for client in small + large:
+        client.join()
+    return small, large
+
+
+def summarize(label, clients, duration, rows=1):
+    latencies = np.array([t for c in clients for t in c.latencies]) * 1e3
+    errors = [e for c in clients for e in c.errors]
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        print(f"{label:<28}{latencies.size:>8,} req{latencies.size / duration:>9.1f} req/s{latencies.size * rows / duration:>13,.0f} rows/s"
+              f"   p50 {p50:7.2f}  p95 {p95:7.2f}  p99 {p99:7.2f}  max {latencies.max():7.2f} ms")
+    else:
+        print(f"{label:<28}       0 req")
+    for error in sorted(set(errors))[:5]:
+        print(f"  ! {error}")
+    return latencies, errors
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url, timeout=30.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"API at {url} did not become ready within {timeout:.0f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api_load", description="Load-test the local calculation API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="API base URL (ignored with --serve)")
+    parser.add_argument("--serve", action="store_true", help="start `python -m core.api` on a free local port for the run")
+    parser.add_argument("--workers", type=int, default=2, help="API worker processes with --serve")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent small-request clients")
+    parser.add_argument("--large-clients", type=int, default=2, help="concurrent batch clients in the second phase")
+    parser.add_argument("--batch-rows", type=int, default=100_000, help="scenarios per batch request")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.serve:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen([sys.executable, "-m", "core.api", "--port", str(port), "--workers", str(args.workers)],
+                                  cwd=root)
+    try:
+        _wait_ready(url)
+        large_body = batch_body(args.batch_rows)
+        print(f"API {url}: {args.clients} small clients, then + {args.large_clients} clients posting "
+              f"{args.batch_rows:,}-row batches ({len(large_body) / 1e6:.1f} MB); {args.duration:.0f} s per phase")
+
+        small, _ = run_phase(url, args.duration, args.clients, 0, large_body)
+        idle, idle_errors = summarize("small, idle", small, args.duration)
+        small, large = run_phase(url, args.duration, args.clients, args.large_clients, large_body)
+        loaded, small_errors = summarize("small, under batch load", small, args.duration)
+        _, large_errors = summarize("batch", large, args.duration, rows=args.batch_rows)
+
+        if idle.size and loaded.size:
+            ratio = np.percentile(loaded, 95) / np.percentile(idle, 95)
+            print(f"small-request p95 under batch load: {ratio:.2f}x idle")
+        failed = len(idle_errors) + len(small_errors) + len(large_errors)
+        if failed:
+            print(f"FAILED: {failed} requests failed")
+            return 1
+        return 0
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# benchmarks/formatting.py
+"""
+Column formatting and parsing (core/formatting.py) against the per-cell path.
+
+Each case formats or parses one column of n random values twice: cell by cell
+with the helpers the app used before (benchmarks/reference.py, or the
+`str.format` call a pandas Styler makes per cell), and as one vectorized call.
+Both outputs must agree on every row.
+
+    python -m benchmarks.formatting
+    python -m benchmarks.formatting --sizes 1000 100000 --only parse
+
+Exits non-zero when the outputs differ.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import reference
+from benchmarks.suite import SEED, best_time
+from core.formatting import format_frame, format_numbers, format_percent, parse_numbers
+
+SIZES = (100, 1_000, 10_000, 100_000)
+FRAME_FORMATS = {"Amount": "{:,.0f} €", "Price": "{:,.2f}", "Share": "{:.1%}", "Change": "{:+,.4f}"}
+
+
+def _amounts(rng, n):
+    """Magnitudes from cents to billions, both signs."""
+    return rng.choice([-1.0, 1.0], n) * 10.0 ** rng.uniform(-3, 9, n)
+
+
+def _frame(rng, n):
+    return pd.DataFrame({"Amount": _amounts(rng, n), "Price": rng.uniform(0, 5e3, n),
+                         "Share": rng.uniform(0, 1, n), "Change": rng.normal(0, 10, n)})
+
+
+def _styler_cells(df):
+    """What `df.style.format(FRAME_FORMATS)` runs: one `str.format` per cell."""
+    out = df.copy()
+    for column, spec in FRAME_FORMATS.items():
+        out[column] = [spec.format(v) for v in df[column].tolist()]
+    return out
+
+
+class Case:
+    """One comparison: `sample(rng, n)` draws the input, `per_cell` / `columnar` produce comparable outputs."""
+
+    def __init__(self, name, sample, per_cell, columnar):
+        self.name = name
+        self.sample = sample
+        self.per_cell = per_cell
+        self.columnar = columnar
+
+
+CASES = [
+    Case("format_number_gr", _amounts,
+         lambda x: [reference.format_number_gr(v) for v in x.tolist()],
+         lambda x: format_numbers(x, 2, locale="el_GR").tolist()),
+    Case("format_percentage_gr", lambda rng, n: rng.normal(0, 50, n),
+         lambda x: [reference.format_percentage_gr(v) for v in x.tolist()],
+         lambda x: format_percent(x, 2, locale="el_GR", ratio=False).tolist()),
+    Case("styler_format", _frame,
+         lambda df: _styler_cells(df).to_numpy().tolist(),
+         lambda df: format_frame(df, FRAME_FORMATS, locale="en_US").to_numpy().tolist()),
+    Case("parse_gr_number", lambda rng, n: format_numbers(_amounts(rng, n), 2, locale="el_GR").tolist(),
+         lambda s: [reference.parse_gr_number(v) for v in s],
+         lambda s: parse_numbers(s, locale="el_GR").tolist()),
+    Case("parse_number", lambda rng, n: format_numbers(_amounts(rng, n), 2, locale="en_US").tolist(),
+         lambda s: [reference.parse_number(v) for v in s],
+         lambda s: parse_numbers(s, locale="en_US", default=0.0).tolist()),
+]
+
+
+def run_case(case, n, rng):
+    """(per-cell seconds, columnar seconds, rows that differ) for one column of n values."""
+    data = case.sample(rng, n)
+    differ = sum(a != b for a, b in zip(case.per_cell(data), case.columnar(data)))
+    return best_time(lambda: case.per_cell(data)), best_time(lambda: case.columnar(data)), differ
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.formatting",
+                                     description="Compare column formatting / parsing with the per-cell path.")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="cases whose name contains any of these strings")
+    parser.add_argument("--sizes", nargs="+", type=int, help=f"rows per column (default {' '.join(map(str, SIZES))})")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.only or any(s in c.name for s in args.only)]
+    if not cases:
+        parser.error(f"no case matches {' '.join(args.only)}")
+
+    rng = np.random.default_rng(SEED)
+    failed = 0
+    print(f"{'case':<24}{'rows':>10}{'per cell':>13}{'columnar':>13}{'speedup':>10}  status")
+    for case in cases:
+        for n in args.sizes or SIZES:
+            cell, column, differ = run_case(case, n, rng)
+            failed += differ > 0
+            status = f"MISMATCH ({differ} rows differ)" if differ else "ok"
+            print(f"{case.name:<24}{n:>10,}{cell * 1e3:>10.2f} ms{column * 1e3:>10.2f} ms{cell / column:>9.1f}x  {status}",
+                  flush=True)
+    if failed:
+        print(f"FAILED: {failed} case / size pairs differ from the per-cell path")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# benchmarks/reference.py
+"""
+Reference formulas: the scalar, pure-Python implementations the tools
+shipped with before the engine was vectorized, kept verbatim (minus the
+Streamlit code around them). The suite evaluates them row by row on a sample
+of every batch and requires the engine to reproduce their numbers; the
+per-cell formatters at the end are the baseline of benchmarks/formatting.py.
+"""
+
+import numpy_financial as npf
+
+
+def get_clv_data(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac):
+    # Adjusted discount rate for risk
+    adj_disc = (discount / 100) + (risk_p / 100)
+    churn_rate = churn / 100
+    cum_npv = -cac
+    payback = None
+
+    # Yearly projection based on lifespan (retention_years)
+    for t in range(1, int(retention_years) + 1):
+        # Survival probability: (1 - churn)^t
+        survival = (1 - churn_rate) ** t
+        # Realized cash flow after risk and survival
+        annual_flow = (purchases * margin_per_order * realization) * survival
+        # Discounted to present value
+        discounted_flow = annual_flow / ((1 + adj_disc) ** t)
+
+        cum_npv += discounted_flow
+
+        if cum_npv >= 0 and payback is None:
+            payback = t
+
+    return cum_npv, payback
+
+
+def calculate_discount_npv(
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+):
+    prc_clients_not_take_disc = 1 - prc_clients_take_disc
+    avg_current_collection_days = (
+        prc_clients_take_disc * days_curently_paying_clients_take_discount +
+        prc_clients_not_take_disc * days_curently_paying_clients_not_take_discount
+    )
+    current_receivables = current_sales * avg_current_collection_days / 365
+
+    total_sales = current_sales + extra_sales
+    prcnt_new_policy = ((current_sales * prc_clients_take_disc) + extra_sales) / total_sales
+    prcnt_old_policy = 1 - prcnt_new_policy
+
+    new_avg_collection_period = (
+        prcnt_new_policy * new_days_payment_clients_take_disc +
+        prcnt_old_policy * days_curently_paying_clients_not_take_discount
+    )
+    new_receivables = total_sales * new_avg_collection_period / 365
+    free_capital = current_receivables - new_receivables
+
+    profit_from_extra_sales = extra_sales * (1 - cogs / current_sales)
+    profit_from_free_capital = free_capital * wacc
+    discount_cost = total_sales * prcnt_new_policy * discount_trial
+
+    i = wacc / 365
+
+    inflow = (
+        total_sales * prcnt_new_policy * (1 - discount_trial) /
+        ((1 + i) ** new_days_payment_clients_take_disc)
+    )
+    inflow += total_sales * prcnt_old_policy / ((1 + i) ** days_curently_paying_clients_not_take_discount)
+
+    outflow = (
+        (cogs / current_sales) * (extra_sales / current_sales) * current_sales /
+        ((1 + i) ** avg_days_pay_suppliers)
+    )
+    outflow += current_sales / ((1 + i) ** avg_current_collection_days)
+
+    npv = inflow - outflow
+
+    # Threshold & Optimum Calculations
+    max_discount = 1 - (
+        (1 + i) ** (new_days_payment_clients_take_disc - days_curently_paying_clients_not_take_discount) * (
+            (1 - 1 / prcnt_new_policy) + (
+                (1 + i) ** (days_curently_paying_clients_not_take_discount - avg_current_collection_days) +
+                (cogs / current_sales) * (extra_sales / current_sales) *
+                (1 + i) ** (days_curently_paying_clients_not_take_discount - avg_days_pay_suppliers)
+            ) / (prcnt_new_policy * (1 + extra_sales / current_sales))
+        )
+    )
+
+    optimum_discount = (1 - ((1 + i) ** (new_days_payment_clients_take_disc - avg_current_collection_days))) / 2
+
+    return {
+        "avg_current_collection_days": round(avg_current_collection_days, 2),
+        "current_receivables": round(current_receivables, 2),
+        "prcnt_new_policy": round(prcnt_new_policy, 4),
+        "new_avg_collection_period": round(new_avg_collection_period, 2),
+        "free_capital": round(free_capital, 2),
+        "profit_from_extra_sales": round(profit_from_extra_sales, 2),
+        "profit_from_free_capital": round(profit_from_free_capital, 2),
+        "discount_cost": round(discount_cost, 2),
+        "npv": round(npv, 2),
+        "max_discount": round(max_discount * 100, 2),
+        "optimum_discount": round(optimum_discount * 100, 2),
+    }
+
+
+def pmt(rate, nper, pv, fv=0, when=0):
+    return -npf.pmt(rate, nper, pv, fv, when)
+
+
+def run_calculations(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years):
+    months = years * 12
+
+    # --- LOAN ---
+    loan_inst = pmt(loan_rate / 12, months, value * loan_pct, 0, when)
+    wc_loan = value * (1 - loan_pct) + exp_loan
+    wc_inst = pmt(wc_rate / 12, months, wc_loan, 0, when)
+
+    loan_cash = (loan_inst + wc_inst) * months
+    loan_interest = loan_cash - value
+    loan_depr = (value + exp_loan) / dep_years * years
+    loan_tax = (loan_interest + loan_depr) * tax_rate
+    loan_final = value + loan_interest - loan_tax
+
+    # --- LEASING ---
+    lease_inst = pmt(loan_rate / 12, months, value * lease_pct, 0, when)
+    wc_lease = value * (1 - lease_pct) + exp_lease
+    wc_lease_inst = pmt(wc_rate / 12, months, wc_lease, 0, when)
+
+    lease_cash = (lease_inst + wc_lease_inst) * months
+    lease_interest = lease_cash - value
+    lease_depr = value + exp_lease + residual
+    lease_tax = ((wc_lease_inst * months - wc_lease) + lease_depr) * tax_rate
+    lease_final = value + lease_interest - lease_tax
+
+    return loan_final, lease_final, loan_cash, loan_interest, loan_depr, loan_tax, lease_cash, lease_interest, lease_depr, lease_tax
+
+
+def calculate_required_sales_increase(
+    suit_price, price_decrease_pct, profit_suit,
+    profit_shirt, profit_tie, profit_belt, profit_shoes,
+    p_shirt, p_tie, p_belt, p_shoes
+):
+    # Expected profit from complements per main unit sold
+    expected_complement_profit = (
+        p_shirt * profit_shirt +
+        p_tie * profit_tie +
+        p_belt * profit_belt +
+        p_shoes * profit_shoes
+    )
+
+    total_profit_per_main_unit = profit_suit + expected_complement_profit
+
+    try:
+        # Indifference point formula for total profit maintenance
+        required_increase = -price_decrease_pct / (
+            (total_profit_per_main_unit / suit_price) + price_decrease_pct
+        )
+        return required_increase * 100
+    except ZeroDivisionError:
+        return None
+
+
+def calculate_max_drop(old_price, price_inc_pct, profit_A, profit_B, profit_C, profit_D, pB, pC, pD):
+    # Weighted profit from customers who switch
+    weighted_sub_profit = (pB * profit_B + pC * profit_C + pD * profit_D)
+
+    numerator = -price_inc_pct
+    # Strategic Formula: Maintenance of total profit including substitution recovery
+    denominator = ((profit_A - weighted_sub_profit) / old_price) + price_inc_pct
+
+    if denominator == 0:
+        return 0.0
+    return (numerator / denominator) * 100
+
+
+def normalize(value, min_val, max_val):
+    if max_val - min_val == 0:
+        return 0
+    return (value - min_val) / (max_val - min_val)
+
+
+def calculate_pricing_power_score(margin, substitution, elasticity, concentration):
+
+    # Margin strength (higher = better)
+    margin_score = normalize(margin, 0, 0.8)
+
+    # Substitution exposure (lower = better)
+    substitution_score = 1 - normalize(substitution, 0, 1)
+
+    # Elasticity fragility (lower elasticity = stronger power)
+    elasticity_score = 1 - normalize(elasticity, 0, 3)
+
+    # Revenue concentration risk (lower = better)
+    concentration_score = 1 - normalize(concentration, 0, 1)
+
+    final_score = (
+        margin_score * 0.35 +
+        substitution_score * 0.25 +
+        elasticity_score * 0.25 +
+        concentration_score * 0.15
+    )
+
+    return round(final_score * 100, 1)
+
+
+def calculate_weighted_average(amounts, credit_days):
+    total_amount = sum(amounts)
+    if total_amount == 0:
+        return 0, 0.0
+    weighted_sum = sum(a * d for a, d in zip(amounts, credit_days))
+    weighted_avg = weighted_sum / total_amount
+    return total_amount, weighted_avg
+
+
+def calculate_turnover(avg_inv, usage_val):
+    if usage_val == 0:
+        return 0
+    # 365-day basis
+    return round((avg_inv * 365) / usage_val, 2)
+
+
+def analyze_resilience(profit, assets, current_assets, current_liabilities):
+    roa = (profit / assets) * 100 if assets > 0 else 0
+    current_ratio = current_assets / current_liabilities if current_liabilities > 0 else 0
+    return round(roa, 2), round(current_ratio, 2)
+
+
+# Per-cell number formatting (utils.py and the tools' private helpers)
+
+def format_number_gr(value, symbol=""):
+    """Μορφοποίηση αριθμού σε ελληνικό στυλ: κόμμα για δεκαδικά, τελεία για χιλιάδες"""
+    try:
+        formatted = f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"{formatted} {symbol}".strip()
+    except Exception:
+        return str(value)
+
+
+def parse_gr_number(x):
+    try:
+        if isinstance(x, (float, int)):
+            return x
+        return float(x.replace(".", "").replace(",", "."))
+    except:
+        return None
+
+
+def format_percentage_gr(value, decimals=2):
+    if value is None:
+        return "-"
+    sign = "-" if value < 0 else ""
+    abs_val = abs(value)
+    formatted = f"{abs_val:,.{decimals}f}".replace(",", "#").replace(".", ",").replace("#", ".")
+    return f"{sign}{formatted}%"
+
+
+def parse_number(x):
+    try:
+        return float(str(x).replace(",", ""))
+    except:
+        return 0.0
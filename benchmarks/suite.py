@@ -0,0 +1,419 @@
+# benchmarks/suite.py
+"""
+Benchmarks for the numeric kernels behind the tools, with regression gates.
+
+Every kernel is timed once per call at scalar size (the way the tools call it)
+and as one vectorized call over batches of 10^3 - 10^6 rows, with the memo
+layer bypassed so the timings are raw compute. Before timing, a random sample
+of each batch is re-evaluated row by row with the reference formulas in
+benchmarks/reference.py and must match. The throughputs (rows / s) are
+compared with a stored baseline; a kernel slower than the baseline by more
+than the tolerance fails the run.
+
+    python -m benchmarks                       # full suite, gate on benchmarks/baseline.json
+    python -m benchmarks --quick --only clv    # sizes up to 10^4, one kernel
+    python -m benchmarks --update-baseline     # record this machine's numbers
+
+The stored baseline is machine specific: record it on the machine that runs the gate.
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+
+import numpy as np
+
+from benchmarks import reference
+from core.engine.clv import clv_surface
+from core.engine.complements import calculate_required_sales_increase
+from core.engine.discount import calculate_discount_npv
+from core.engine.financing import run_calculations
+from core.engine.memo import uncached
+from core.engine.operations import calculate_turnover, calculate_weighted_average
+from core.engine.pricing import calculate_pricing_power_score
+from core.engine.stress import analyze_resilience
+from core.engine.substitution import calculate_max_drop
+from tools.clv_calculator import get_clv_data
+
+BATCH_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000)
+VERIFY_ROWS = 200           # sampled rows checked against the reference formulas per batch
+TOLERANCE = 0.50            # allowed throughput drop vs the baseline; shared machines swing by ~40%,
+                            # while a kernel falling back to Python loops loses 10x or more
+MIN_TIME = 0.2              # seconds of repeated calls per measurement
+RETRIES = 3                 # re-measurements before a throughput under the gate counts as a regression
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 7
+
+
+class Kernel:
+    """
+    One benchmarked kernel.
+    `sample(rng, n)` draws n rows of keyword inputs (arrays). `scalar(**row)` is the
+    call the tools make with one row of Python floats, `batch(**cols)` the vectorized
+    call, and `reference(**row)` the original scalar formula; all three return a tuple
+    of outputs in the same order. `decimals` gives the rounding of each output
+    (None: unrounded), which sets the comparison tolerance. With `aggregate`, a batch
+    is one portfolio of n lines and is checked against the reference as a whole.
+    """
+
+    def __init__(self, name, sample, scalar, batch, reference, decimals=None, aggregate=False):
+        self.name = name
+        self.sample = sample
+        self.scalar = scalar
+        self.batch = batch
+        self.reference = reference
+        self.decimals = decimals
+        self.aggregate = aggregate
+
+
+def _uniform(rng, n, lo, hi):
+    return rng.uniform(lo, hi, n)
+
+
+def _with_zeros(rng, values, share=0.02):
+    """Zero out a share of the rows so the guard branches (x / 0) are exercised too."""
+    values = values.copy()
+    values[rng.random(values.size) < share] = 0.0
+    return values
+
+
+def _row(cols, i):
+    return {key: (value[i].item() if isinstance(value, np.ndarray) else value) for key, value in cols.items()}
+
+
+# -----------------------------------
+# Kernels
+# -----------------------------------
+
+CLV_ARGS = ("purchases", "margin_per_order", "retention_years", "discount", "churn", "realization", "risk_p", "cac")
+DISCOUNT_ARGS = ("current_sales", "extra_sales", "discount_trial", "prc_clients_take_disc",
+                 "days_curently_paying_clients_take_discount", "days_curently_paying_clients_not_take_discount",
+                 "new_days_payment_clients_take_disc", "cogs", "wacc", "avg_days_pay_suppliers")
+
+
+def _clv_sample(rng, n):
+    return {
+        "purchases": _uniform(rng, n, 1, 24), "margin_per_order": _uniform(rng, n, 5, 200),
+        "retention_years": rng.integers(1, 16, n).astype(float), "discount": _uniform(rng, n, 0, 20),
+        "churn": _uniform(rng, n, 0, 60), "realization": _uniform(rng, n, 0.5, 1.0),
+        "risk_p": _uniform(rng, n, 0, 10), "cac": _uniform(rng, n, 0, 5000),
+    }
+
+
+def _clv_batch(**cols):
+    res = clv_surface(*(cols[k] for k in CLV_ARGS))
+    return res["npv"], res["payback_year"]
+
+
+def _clv_reference(**row):
+    npv, payback = reference.get_clv_data(**row)
+    return npv, payback or 0
+
+
+def _discount_sample(rng, n):
+    sales = _uniform(rng, n, 1e5, 1e7)
+    return {
+        "current_sales": sales, "extra_sales": sales * _uniform(rng, n, 0, 0.3),
+        "discount_trial": _uniform(rng, n, 0, 0.05), "prc_clients_take_disc": _uniform(rng, n, 0, 1),
+        "days_curently_paying_clients_take_discount": _uniform(rng, n, 20, 90),
+        "days_curently_paying_clients_not_take_discount": _uniform(rng, n, 30, 120),
+        "new_days_payment_clients_take_disc": _uniform(rng, n, 0, 20),
+        "cogs": sales * _uniform(rng, n, 0.3, 0.9), "wacc": _uniform(rng, n, 0.02, 0.2),
+        "avg_days_pay_suppliers": _uniform(rng, n, 0, 90),
+    }
+
+
+def _discount_batch(**cols):
+    return tuple(calculate_discount_npv(*(cols[k] for k in DISCOUNT_ARGS)).values())
+
+
+def _discount_reference(**row):
+    return tuple(reference.calculate_discount_npv(**row).values())
+
+
+def _financing_sample(rng, n):
+    return {
+        "loan_rate": _uniform(rng, n, 0.01, 0.12), "wc_rate": _uniform(rng, n, 0.01, 0.15),
+        "years": rng.integers(1, 11, n).astype(float), "tax_rate": _uniform(rng, n, 0, 0.35),
+        "when": rng.integers(0, 2, n), "value": _uniform(rng, n, 1e4, 1e6),
+        "loan_pct": _uniform(rng, n, 0.5, 1), "lease_pct": _uniform(rng, n, 0.8, 1),
+        "exp_loan": _uniform(rng, n, 0, 5e3), "exp_lease": _uniform(rng, n, 0, 5e3),
+        "residual": _uniform(rng, n, 0, 1e4), "dep_years": rng.integers(3, 11, n).astype(float),
+    }
+
+
+def _complements_sample(rng, n):
+    price = _uniform(rng, n, 50, 500)
+    cols = {
+        # Signed input: price increases too, and cuts deep enough to collapse the bundle margin
+        "suit_price": price, "price_decrease_pct": _uniform(rng, n, -0.9, 0.3), "profit_suit": price * _uniform(rng, n, 0.1, 0.6),
+        "profit_shirt": _uniform(rng, n, 0, 30), "profit_tie": _uniform(rng, n, 0, 20),
+        "profit_belt": _uniform(rng, n, 0, 20), "profit_shoes": _uniform(rng, n, 0, 60),
+        "p_shirt": _uniform(rng, n, 0, 1), "p_tie": _uniform(rng, n, 0, 1),
+        "p_belt": _uniform(rng, n, 0, 1), "p_shoes": _uniform(rng, n, 0, 1),
+    }
+    # Zero denominator: no margin at all and no price change
+    flat = rng.random(n) < 0.02
+    for key in ("price_decrease_pct", "profit_suit", "profit_shirt", "profit_tie", "profit_belt", "profit_shoes"):
+        cols[key][flat] = 0.0
+    return cols
+
+
+def _substitution_sample(rng, n):
+    share = rng.dirichlet(np.ones(4), n)  # B, C, D and leakage
+    cols = {
+        # Price cuts and substitutes richer than A, so the denominator also goes negative
+        "old_price": _uniform(rng, n, 0.5, 10), "price_inc_pct": _uniform(rng, n, -0.2, 0.5),
+        "profit_A": _uniform(rng, n, 0.05, 3), "profit_B": _uniform(rng, n, 0, 4), "profit_C": _uniform(rng, n, 0, 4),
+        "profit_D": _uniform(rng, n, 0, 2), "pB": share[:, 0], "pC": share[:, 1], "pD": share[:, 2],
+    }
+    # Zero denominator: A earns exactly what its substitutes recapture and keeps its price
+    even = rng.random(n) < 0.02
+    recaptured = cols["pB"] * cols["profit_B"] + cols["pC"] * cols["profit_C"] + cols["pD"] * cols["profit_D"]
+    cols["profit_A"][even] = recaptured[even]
+    cols["price_inc_pct"][even] = 0.0
+    return cols
+
+
+def _pricing_sample(rng, n):
+    return {"margin": _uniform(rng, n, 0.05, 0.9), "substitution": _uniform(rng, n, 0, 1),
+            "elasticity": _uniform(rng, n, 0.1, 3), "concentration": _uniform(rng, n, 0, 1)}
+
+
+def _receivables_sample(rng, n):
+    return {"amounts": _uniform(rng, n, 0, 5e4).round(2), "credit_days": rng.integers(0, 181, n).astype(float)}
+
+
+def _turnover_sample(rng, n):
+    return {"avg_inv": _uniform(rng, n, 0, 1e5), "usage_val": _with_zeros(rng, _uniform(rng, n, 0, 1e6))}
+
+
+def _resilience_sample(rng, n):
+    return {"profit": _uniform(rng, n, -1e5, 5e5), "assets": _with_zeros(rng, _uniform(rng, n, 1e4, 5e6)),
+            "current_assets": _uniform(rng, n, 0, 1e6), "current_liabilities": _with_zeros(rng, _uniform(rng, n, 1e3, 1e6))}
+
+
+def _as_tuple(result):
+    return result if isinstance(result, tuple) else (result,)
+
+
+def _outputs(func):
+    """`func` with its result as a tuple of outputs (single-output kernels return a bare value)."""
+    return lambda **kwargs: _as_tuple(func(**kwargs))
+
+
+def _clv_scalar(**row):
+    _, npv, payback = get_clv_data(*(row[k] for k in CLV_ARGS))
+    return npv, payback or 0
+
+
+KERNELS = [
+    Kernel("get_clv_data", _clv_sample, _clv_scalar, _clv_batch, _clv_reference),
+    Kernel("calculate_discount_npv", _discount_sample, _discount_batch, _discount_batch, _discount_reference,
+           decimals=(2, 2, 4, 2, 2, 2, 2, 2, 2, 2, 2)),
+    Kernel("run_calculations", _financing_sample, run_calculations, run_calculations, reference.run_calculations),
+    Kernel("calculate_required_sales_increase", _complements_sample, _outputs(calculate_required_sales_increase),
+           _outputs(calculate_required_sales_increase), _outputs(reference.calculate_required_sales_increase)),
+    Kernel("calculate_max_drop", _substitution_sample, _outputs(calculate_max_drop),
+           _outputs(calculate_max_drop), _outputs(reference.calculate_max_drop)),
+    Kernel("calculate_pricing_power_score", _pricing_sample, _outputs(calculate_pricing_power_score),
+           _outputs(calculate_pricing_power_score), _outputs(reference.calculate_pricing_power_score), decimals=(1,)),
+    Kernel("calculate_weighted_average", _receivables_sample, calculate_weighted_average,
+           calculate_weighted_average, reference.calculate_weighted_average, aggregate=True),
+    Kernel("calculate_turnover", _turnover_sample, _outputs(calculate_turnover),
+           _outputs(calculate_turnover), _outputs(reference.calculate_turnover), decimals=(2,)),
+    Kernel("analyze_resilience", _resilience_sample, analyze_resilience, analyze_resilience,
+           reference.analyze_resilience, decimals=(2, 2)),
+]
+
+
+# -----------------------------------
+# Verification & timing
+# -----------------------------------
+
+def _matches(actual, expected, decimals):
+    """Element-wise agreement: relative 1e-9, or one unit in the last rounded place."""
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray([np.nan if e is None else e for e in np.atleast_1d(expected)], dtype=float).reshape(actual.shape)
+    atol = 1e-9 if decimals is None else 10.0 ** -decimals * 1.001
+    return np.isclose(actual, expected, rtol=1e-9, atol=atol, equal_nan=True)
+
+
+def _count_mismatches(outputs, expected, decimals):
+    return sum(int(np.sum(~_matches(out, exp, d))) for out, exp, d in zip(outputs, expected, decimals))
+
+
+def verify(kernel, cols, rng):
+    """Compare the vectorized outputs with the reference formulas; returns the number of mismatching values."""
+    outputs = kernel.batch(**cols)
+    decimals = kernel.decimals or (None,) * len(outputs)
+    if kernel.aggregate:
+        return _count_mismatches(outputs, kernel.reference(**{k: v.tolist() for k, v in cols.items()}), decimals)
+
+    n = len(next(iter(cols.values())))
+    rows = rng.choice(n, size=min(n, VERIFY_ROWS), replace=False)
+    expected = list(zip(*(kernel.reference(**_row(cols, i)) for i in rows)))
+    return _count_mismatches([np.asarray(out)[rows] for out in outputs], expected, decimals)
+
+
+def best_time(call):
+    """Best wall time of one call over repeated runs (at least 3, for about MIN_TIME seconds)."""
+    timings, spent = [], 0.0
+    while len(timings) < 3 or spent < MIN_TIME:
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+        if len(timings) >= 1000:
+            break
+    return min(timings)
+
+
+def throughput(call, n, floor=0.0):
+    """
+    Rows / s of `call` over `n` rows. Interference on a shared machine only ever slows a
+    run down, so a result under `floor` is measured again (up to RETRIES times) and the best kept.
+    """
+    rate = n / best_time(call)
+    for _ in range(RETRIES):
+        if rate >= floor:
+            break
+        rate = max(rate, n / best_time(call))
+    return rate
+
+
+def run_kernel(kernel, sizes, rng, floors=None):
+    """
+    Throughput (rows / s), speedup over the reference formula evaluated row by row, and
+    reference mismatches per size; size 1 is the scalar call. `floors` maps sizes to the
+    throughput under which a measurement is repeated (see `throughput`).
+    """
+    floors = floors or {}
+    results = {}
+    with uncached():
+        row = _row(kernel.sample(rng, 1), 0)
+        if kernel.aggregate:
+            row = {k: [v] for k, v in row.items()}  # a one-line portfolio
+        expected = kernel.reference(**row)
+        mismatches = _count_mismatches(kernel.scalar(**row), expected, kernel.decimals or (None,) * len(expected))
+        reference_rate = 1 / best_time(lambda: kernel.reference(**row))
+        rate = throughput(lambda: kernel.scalar(**row), 1, floors.get(1, 0.0))
+        results[1] = {"seconds": 1 / rate, "throughput": rate, "speedup": rate / reference_rate, "mismatches": mismatches}
+
+        for n in sizes:
+            cols = kernel.sample(rng, n)
+            mismatches = verify(kernel, cols, rng)
+            rate = throughput(lambda: kernel.batch(**cols), n, floors.get(n, 0.0))
+            results[n] = {"seconds": n / rate, "throughput": rate, "speedup": rate / reference_rate, "mismatches": mismatches}
+    return results
+
+
+# -----------------------------------
+# Baseline gate
+# -----------------------------------
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, previous=None):
+    """Write the measured throughputs, keeping entries of kernels / sizes not run this time."""
+    throughput = {name: dict(entries) for name, entries in (previous or {}).get("throughput", {}).items()}
+    for name, sizes in results.items():
+        throughput.setdefault(name, {}).update({str(n): round(r["throughput"], 1) for n, r in sizes.items()})
+    baseline = {
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()} / NumPy {np.__version__}",
+        "recorded": time.strftime("%Y-%m-%d"),
+        "throughput": throughput,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def gate(results, baseline, tolerance=TOLERANCE):
+    """Rows of (kernel, size, result, baseline throughput, status); status is ok / new / SLOWER / MISMATCH."""
+    stored = baseline.get("throughput", {})
+    rows = []
+    for name, sizes in results.items():
+        for n, r in sizes.items():
+            base = stored.get(name, {}).get(str(n))
+            if r["mismatches"]:
+                status = "MISMATCH"
+            elif base is None:
+                status = "new"
+            elif r["throughput"] < base * (1 - tolerance):
+                status = "SLOWER"
+            else:
+                status = "ok"
+            rows.append((name, n, r, base, status))
+    return rows
+
+
+def _format_rate(rate):
+    for unit, scale in (("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if rate >= scale:
+            return f"{rate / scale:7.2f}{unit}"
+    return f"{rate:7.1f} "
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the numeric kernels and gate on a stored baseline.")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="kernels whose name contains any of these strings")
+    parser.add_argument("--sizes", nargs="+", type=int, help=f"batch sizes (default {' '.join(map(str, BATCH_SIZES))})")
+    parser.add_argument("--quick", action="store_true", help=f"batch sizes {' '.join(map(str, QUICK_SIZES))} only")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed throughput drop vs the baseline (share)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run's throughputs as the new baseline")
+    parser.add_argument("--json", metavar="PATH", help="also write the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else BATCH_SIZES)
+    kernels = [k for k in KERNELS if not args.only or any(s in k.name for s in args.only)]
+    if not kernels:
+        parser.error(f"no kernel matches {' '.join(args.only)}")
+
+    rng = np.random.default_rng(SEED)
+    results = {}
+    print(f"{'kernel':<36}{'rows':>10}{'time / call':>14}{'rows / s':>11}{'vs ref':>10}{'baseline':>11}  status")
+    baseline = load_baseline(args.baseline)
+    for kernel in kernels:
+        stored = {} if args.update_baseline else baseline.get("throughput", {}).get(kernel.name, {})
+        floors = {int(n): rate * (1 - args.tolerance) for n, rate in stored.items()}
+        results[kernel.name] = run_kernel(kernel, sizes, rng, floors)
+        for name, n, r, base, status in gate({kernel.name: results[kernel.name]}, baseline, args.tolerance):
+            shown = _format_rate(base) if base is not None else "        -"
+            note = f" ({r['mismatches']} values differ from the reference)" if r["mismatches"] else ""
+            print(f"{name:<36}{n:>10,}{r['seconds'] * 1e3:>11.3f} ms{_format_rate(r['throughput']):>11}"
+                  f"{r['speedup']:>9.1f}x{shown:>11}  {status}{note}", flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    rows = gate(results, baseline, args.tolerance)
+    mismatched = [r for r in rows if r[4] == "MISMATCH"]
+    slower = [r for r in rows if r[4] == "SLOWER"]
+    if args.update_baseline:
+        if mismatched:
+            print("Baseline not updated: results differ from the reference formulas.")
+            return 1
+        save_baseline(args.baseline, results, baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if baseline.get("machine"):
+        print(f"Baseline: {baseline['machine']} ({baseline.get('recorded', '?')})")
+    if mismatched or slower:
+        print(f"FAILED: {len(mismatched)} kernel / size pairs differ from the reference, "
+              f"{len(slower)} are more than {args.tolerance:.0%} slower than the baseline.")
+        return 1
+    print("OK")
+    return 0
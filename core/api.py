@@ -0,0 +1,277 @@
+# core/api.py
+"""
+Local HTTP API for the calculation engines (optional, ASGI).
+
+    pip install starlette uvicorn
+    python -m core.api --port 8765 --workers 4
+    uvicorn --factory core.api:create_app        # any ASGI server works
+
+Endpoints (JSON in, JSON out; parameter names follow the engine functions):
+
+    GET  /health
+    GET  /v1/kernels                      parameters of every kernel
+    POST /v1/{kernel}                     one scenario: {"price": 30, ...} (numbers only)
+    POST /v1/{kernel}/batch               {"scenarios": [{...}, ...]}  ->  {"results": [{...}, ...]}
+                                          {"columns": {"price": [...], "volume": 1000, ...}}
+                                                                     ->  {"results": {"profit": [...], ...}}
+
+Kernels: break-even, clv (tool inputs, rates in %), discount-npv, loan-leasing.
+A batch is evaluated as one vectorized call. Small requests (a short body
+that broadcasts to few rows) are handled on the event loop in a few
+milliseconds; larger ones are parsed, evaluated and serialized in a process
+pool, so a large batch never stalls small requests.
+Non-finite results (e.g. no break-even) are returned as null. orjson, when
+installed, speeds up JSON for large batches.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+try:
+    import orjson  # optional: 4-8x faster JSON for large batches
+except ImportError:
+    orjson = None
+
+from core.engine.break_even import break_even
+from core.engine.clv import clv_surface
+from core.engine.discount import calculate_discount_npv
+from core.engine.financing import run_calculations
+
+DEFAULT_HOST = "127.0.0.1"  # local only unless asked otherwise
+DEFAULT_PORT = 8765
+INLINE_BYTES = 32 * 1024      # bodies up to this size are parsed on the event loop ...
+INLINE_ROWS = 2_000           # ... and evaluated there when they broadcast to at most this many rows
+MAX_BODY_BYTES = 256 * 1024 * 1024
+MAX_ROWS = 1_000_000
+
+LOAN_LEASING_OUTPUTS = ("loan_final", "lease_final", "loan_cash", "loan_interest", "loan_depr", "loan_tax",
+                        "lease_cash", "lease_interest", "lease_depr", "lease_tax")
+
+# name -> (function, output names for tuple results; None when it returns a dict)
+KERNELS = {
+    "break-even": (break_even, None),
+    "clv": (clv_surface, None),
+    "discount-npv": (calculate_discount_npv, None),
+    "loan-leasing": (run_calculations, LOAN_LEASING_OUTPUTS),
+}
+PARAMETERS = {name: tuple(inspect.signature(func).parameters) for name, (func, _) in KERNELS.items()}
+
+
+class RequestError(ValueError):
+    """Client error, reported with an HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _require_starlette():
+    try:
+        from starlette.applications import Starlette
+        from starlette.responses import JSONResponse, Response
+        from starlette.routing import Route
+    except ImportError as e:
+        raise ImportError("The HTTP API requires starlette and an ASGI server (pip install starlette uvicorn).") from e
+    return Starlette, JSONResponse, Response, Route
+
+
+def _require_uvicorn():
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise ImportError("Serving the API requires uvicorn (pip install uvicorn), or run create_app() under any ASGI server.") from e
+    return uvicorn
+
+
+# -----------------------------------
+# Evaluation (runs inline or in a worker process)
+# -----------------------------------
+
+def _column(values, name):
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError(422, f"parameter {name!r} must be a number or an array of numbers") from None
+
+
+def _scenario_columns(kernel, payload, batch):
+    """Keyword arrays for the kernel call plus the response layout ("single", "records" or "columns")."""
+    params = PARAMETERS[kernel]
+    if not batch:
+        if not isinstance(payload, dict):
+            raise RequestError(422, "body must be a JSON object of parameters")
+        missing = [p for p in params if p not in payload]
+        if missing:
+            raise RequestError(422, f"missing parameters: {', '.join(missing)}")
+        cols = {p: _column(payload[p], p) for p in params}
+        if any(c.ndim for c in cols.values()):
+            raise RequestError(422, f"parameters must be numbers; send arrays to /v1/{kernel}/batch")
+        return cols, "single"
+
+    if isinstance(payload, dict) and isinstance(payload.get("scenarios"), list):
+        scenarios = payload["scenarios"]
+        if len(scenarios) > MAX_ROWS:
+            raise RequestError(413, f"at most {MAX_ROWS:,} scenarios per request")
+        for i, scenario in enumerate(scenarios):
+            missing = [p for p in params if not isinstance(scenario, dict) or p not in scenario]
+            if missing:
+                raise RequestError(422, f"scenario {i}: missing parameters: {', '.join(missing)}")
+        return {p: _column([s[p] for s in scenarios], p) for p in params}, "records"
+
+    if isinstance(payload, dict) and isinstance(payload.get("columns"), dict):
+        columns = payload["columns"]
+        missing = [p for p in params if p not in columns]
+        if missing:
+            raise RequestError(422, f"missing columns: {', '.join(missing)}")
+        cols = {p: _column(columns[p], p) for p in params}
+        if any(c.ndim > 1 for c in cols.values()):
+            raise RequestError(422, "columns must be numbers or flat arrays")
+        try:
+            rows = np.broadcast_shapes(*(c.shape for c in cols.values()))
+        except ValueError:
+            raise RequestError(422, "columns have different lengths") from None
+        if rows and rows[0] > MAX_ROWS:
+            raise RequestError(413, f"at most {MAX_ROWS:,} rows per request")
+        return cols, "columns"
+
+    raise RequestError(422, 'batch body must hold "scenarios" (a list of objects) or "columns" (an object of arrays)')
+
+
+def _plain(values):
+    """JSON-ready copy of a result array: floats / lists, non-finite values as None."""
+    values = np.asarray(values, dtype=float)
+    if np.isfinite(values).all():
+        return values.tolist()
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def _row_count(cols):
+    return (np.broadcast_shapes(*(c.shape for c in cols.values())) or (1,))[0]  # all-constant columns: one row
+
+
+def evaluate(kernel, payload, batch=False):
+    """Run `kernel` on a decoded JSON payload; returns the response object."""
+    return _evaluate_columns(kernel, *_scenario_columns(kernel, payload, batch))
+
+
+def _evaluate_columns(kernel, cols, layout):
+    func, outputs = KERNELS[kernel]
+    if kernel == "loan-leasing":
+        cols["when"] = cols["when"].astype(int)  # payment timing flag (0 = end, 1 = begin)
+    with np.errstate(all="ignore"):
+        result = func(**cols)
+    result = dict(zip(outputs, result)) if outputs else result
+
+    if layout == "single":
+        return {key: _plain(value) for key, value in result.items()}
+    rows = _row_count(cols)
+    columns = {key: _plain(np.broadcast_to(value, (rows,))) for key, value in result.items()}
+    if layout == "columns":
+        return {"rows": rows, "results": columns}
+    return {"rows": rows, "results": [dict(zip(columns, values)) for values in zip(*columns.values())]}
+
+
+def handle(kernel, body, batch=False, max_rows=None):
+    """
+    Decode, evaluate and encode one request; returns (status, JSON bytes). Picklable for the worker pool.
+    With `max_rows`, returns None instead of evaluating a request that broadcasts to more rows.
+    """
+    try:
+        payload = orjson.loads(body) if orjson else json.loads(body)
+    except ValueError:  # orjson.JSONDecodeError is a ValueError too
+        return 400, _encode({"error": "body is not valid JSON"})
+    try:
+        cols, layout = _scenario_columns(kernel, payload, batch)
+        if max_rows is not None and _row_count(cols) > max_rows:
+            return None
+        return 200, _encode(_evaluate_columns(kernel, cols, layout))
+    except RequestError as e:
+        return e.status, _encode({"error": str(e)})
+    except (TypeError, ValueError) as e:
+        return 422, _encode({"error": str(e)})
+
+
+def _encode(obj):
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+
+
+# -----------------------------------
+# ASGI application
+# -----------------------------------
+
+def create_app(workers=None):
+    """Starlette app; requests over INLINE_BYTES or INLINE_ROWS go to a pool of `workers` processes (default: CPU count)."""
+    Starlette, JSONResponse, Response, Route = _require_starlette()
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Spawned workers start clean (no copy of the server's threads or sockets)
+        state["pool"] = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        try:
+            yield
+        finally:
+            state["pool"].shutdown(cancel_futures=True)
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    async def kernels(request):
+        return JSONResponse({
+            name: {"parameters": list(PARAMETERS[name]), "single": f"/v1/{name}", "batch": f"/v1/{name}/batch"}
+            for name in KERNELS
+        })
+
+    async def run(request):
+        kernel = request.path_params["kernel"]
+        if kernel not in KERNELS:
+            return JSONResponse({"error": f"unknown kernel {kernel!r}; see /v1/kernels"}, status_code=404)
+        if int(request.headers.get("content-length") or 0) > MAX_BODY_BYTES:
+            return JSONResponse({"error": "request body too large"}, status_code=413)
+        body = await request.body()
+        batch = request.url.path.endswith("/batch")
+        # Small bodies are parsed here; only those that stay small once broadcast are evaluated here too
+        reply = handle(kernel, body, batch, max_rows=INLINE_ROWS) if len(body) <= INLINE_BYTES else None
+        if reply is not None:
+            status, content = reply
+        else:
+            status, content = await asyncio.get_running_loop().run_in_executor(state["pool"], handle, kernel, body, batch)
+        return Response(content, status_code=status, media_type="application/json")
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/v1/kernels", kernels),
+            Route("/v1/{kernel}", run, methods=["POST"]),
+            Route("/v1/{kernel}/batch", run, methods=["POST"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.api", description="Serve the calculation engines over local HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="bind address (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="processes for large requests (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    uvicorn = _require_uvicorn()
+    uvicorn.run(create_app(args.workers), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
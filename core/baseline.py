@@ -0,0 +1,131 @@
+# core/baseline.py
+"""
+Shared Core baseline: the five pillars every stage and tool projects onto.
+Kept free of streamlit so headless callers (batch runs, engines) share the same defaults.
+"""
+
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+BASELINE_DEFAULTS = {
+    # 1. Revenue Engine
+    "price": 30.0,
+    "volume": 10000,
+    # 2. Cost Structure
+    "variable_cost": 15.0,
+    "fixed_cost": 5000.0,
+    # 3. Time & Cash Pressure
+    "ar_days": 45,
+    "inventory_days": 60,
+    "payables_days": 30,
+    # 4. Capital & Financing
+    "debt": 20000.0,
+    "interest_rate": 0.05,
+    # 5. Durability
+    "retention_rate": 0.85,
+}
+
+BASELINE_KEYS = tuple(BASELINE_DEFAULTS)
+
+# Stage inputs saved with the pillars: the Stage 2 dead-stock share drives the
+# Stage 4/5 liquidity drain. Derived values come from core/metrics.py.
+STAGE_DEFAULTS = {
+    "dead_stock_pct": 0.10,
+}
+
+BASELINE_FIELDS = BASELINE_KEYS + tuple(STAGE_DEFAULTS)
+INTEGER_FIELDS = frozenset({"volume", "ar_days", "inventory_days", "payables_days"})
+# Pillars that are shares: perturbations and solver searches stay within these bounds
+BOUNDED_PARAMS = {"retention_rate": (0.0, 1.0)}
+
+_FIELD_INDEX = {name: i for i, name in enumerate(BASELINE_FIELDS)}
+_DEFAULT_VALUES = np.array([{**BASELINE_DEFAULTS, **STAGE_DEFAULTS}[k] for k in BASELINE_FIELDS], dtype=float)
+_MAGIC = b"MLB2"
+_LEGACY_MAGIC = b"MLB1"  # pillars + the former Stage 2 outputs (ccc, working_capital_req, liquidity_drain)
+_HEADER = struct.Struct("<4sH")
+
+
+class Baseline(Mapping):
+    """
+    Immutable baseline record backed by one float64 array (fixed field order).
+    Hashing, equality and serialization work on the raw bytes; change fields with
+    `replace(**changes)`, which returns a new record. Also a read-only Mapping,
+    so `baseline["price"]`, `dict(baseline)` and `evaluate_path(baseline)` work.
+    """
+
+    __slots__ = ("_values", "_hash")
+
+    def __init__(self, values=None, **fields):
+        arr = _DEFAULT_VALUES.copy() if values is None else np.array(values, dtype=float)
+        if arr.shape != _DEFAULT_VALUES.shape:
+            raise ValueError(f"Baseline expects {len(BASELINE_FIELDS)} values, got shape {arr.shape}")
+        for name, value in fields.items():
+            if name not in _FIELD_INDEX:
+                raise KeyError(f"Unknown baseline field: {name}")
+            arr[_FIELD_INDEX[name]] = value
+        arr.flags.writeable = False
+        self._values = arr
+        self._hash = None
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Build from any mapping; unknown keys are ignored, missing ones take the defaults."""
+        return cls(**{k: mapping[k] for k in BASELINE_FIELDS if k in mapping})
+
+    def replace(self, **changes):
+        return Baseline(self._values, **changes) if changes else self
+
+    def diff(self, other):
+        """{field: (self, other)} for every field that differs."""
+        changed = np.flatnonzero(self._values != other._values)
+        return {BASELINE_FIELDS[i]: (self[BASELINE_FIELDS[i]], other[BASELINE_FIELDS[i]]) for i in changed}
+
+    # --- Mapping protocol -------------------------------------------------
+    def __getitem__(self, name):
+        value = self._values[_FIELD_INDEX[name]]
+        return int(value) if name in INTEGER_FIELDS else float(value)
+
+    def __iter__(self):
+        return iter(BASELINE_FIELDS)
+
+    def __len__(self):
+        return len(BASELINE_FIELDS)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    # --- Identity ----------------------------------------------------------
+    def __eq__(self, other):
+        if isinstance(other, Baseline):
+            return self._values.tobytes() == other._values.tobytes()
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self._values.tobytes())
+        return self._hash
+
+    def __repr__(self):
+        return "Baseline(" + ", ".join(f"{k}={self[k]!r}" for k in BASELINE_FIELDS) + ")"
+
+    # --- Binary serialization ----------------------------------------------
+    def to_bytes(self):
+        return _HEADER.pack(_MAGIC, len(BASELINE_FIELDS)) + self._values.astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, count = _HEADER.unpack_from(data)
+        if magic == _LEGACY_MAGIC and count >= len(BASELINE_KEYS):
+            pillars = np.frombuffer(data, dtype="<f8", offset=_HEADER.size, count=len(BASELINE_KEYS))
+            return cls(np.concatenate([pillars, _DEFAULT_VALUES[len(BASELINE_KEYS):]]))
+        if magic != _MAGIC or count != len(BASELINE_FIELDS):
+            raise ValueError("Not a serialized Baseline (or written by an incompatible version)")
+        return cls(np.frombuffer(data, dtype="<f8", offset=_HEADER.size, count=count))
+
+    def __reduce__(self):
+        return Baseline.from_bytes, (self.to_bytes(),)
@@ -0,0 +1,38 @@
+# core/basket.py
+"""
+Basket (complement) table ingest for the cross-sell analysis.
+
+One row per complement attached to the core product: its attach probability
+and unit profit. Repeated complement names are merged (attach rates summed,
+unit profit averaged by attach rate), so raw basket exports can be loaded as-is.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, iter_table_chunks
+
+BASKET_COLUMNS = {"name": "complement", "attach": "attach_rate", "profit": "unit_profit"}
+
+
+def load_basket(source, name_col="complement", attach_col="attach_rate", profit_col="unit_profit",
+                attach_in_percent=False, chunksize=DEFAULT_CHUNKSIZE):
+    """Read a basket file into a DataFrame with Name, AttachRate (0-1), UnitProfit; unparseable rows are dropped."""
+    parts = []
+    for chunk in iter_table_chunks(source, chunksize, columns=list(dict.fromkeys([name_col, attach_col, profit_col]))):
+        parts.append(pd.DataFrame({
+            "Name": chunk[name_col].astype(str).to_numpy(),
+            "AttachRate": pd.to_numeric(chunk[attach_col], errors="coerce").to_numpy(dtype=float),
+            "UnitProfit": pd.to_numeric(chunk[profit_col], errors="coerce").to_numpy(dtype=float),
+        }))
+    if not parts:
+        return pd.DataFrame({"Name": [], "AttachRate": [], "UnitProfit": []})
+
+    df = pd.concat(parts, ignore_index=True).dropna()
+    if attach_in_percent:
+        df["AttachRate"] /= 100
+    df["Expected"] = df["AttachRate"] * df["UnitProfit"]
+    merged = df.groupby("Name", sort=False).agg(AttachRate=("AttachRate", "sum"), Expected=("Expected", "sum"))
+    merged["UnitProfit"] = np.divide(merged["Expected"], merged["AttachRate"],
+                                     out=np.zeros(len(merged)), where=merged["AttachRate"].to_numpy() > 0)
+    return merged.reset_index()[["Name", "AttachRate", "UnitProfit"]]
@@ -0,0 +1,167 @@
+# core/batch.py
+"""
+Batch mode: push a file of baselines through Stages 1-5.
+
+    python -m core.batch baselines.csv kpis.csv --chunksize 250000
+    python -m core.batch baselines.csv prices.csv --seek net_profit 0 price
+
+Input is streamed in chunks (CSV via pandas, Parquet via pyarrow) and each
+chunk is evaluated as NumPy arrays, so memory stays bounded by the chunk
+size regardless of file length. Missing baseline columns fall back to the
+Shared Core defaults.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core.baseline import BASELINE_DEFAULTS, BASELINE_KEYS
+from core.engine.goal_seek import goal_seek
+from core.engine.path import PATH_ASSUMPTIONS, evaluate_path
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def _is_parquet(source):
+    """`source` is a path or a named file object (e.g. a Streamlit upload)."""
+    name = getattr(source, "name", source)
+    return os.path.splitext(str(name))[1].lower() in (".parquet", ".pq")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow).") from e
+    return pa, pq
+
+
+def _baseline_columns(df):
+    return {
+        key: pd.to_numeric(df[key], errors="coerce").to_numpy(dtype=float) if key in df else BASELINE_DEFAULTS[key]
+        for key in BASELINE_KEYS
+    }
+
+
+def evaluate_baselines(df, **assumptions):
+    """Return `df` with every path KPI appended as a column (one vectorized pass)."""
+    kpis = pd.DataFrame(evaluate_path(_baseline_columns(df), **assumptions), index=df.index)
+    return pd.concat([df, kpis], axis=1)
+
+
+def goal_seek_baselines(df, kpi, target, param, method="newton", **assumptions):
+    """
+    Return `df` with the `param` value that brings `kpi` to `target` for every row, plus
+    convergence diagnostics. `target` is a number or the name of a column of `df`.
+    """
+    if isinstance(target, str):
+        target = pd.to_numeric(df[target], errors="coerce").to_numpy(dtype=float)
+    res = goal_seek(_baseline_columns(df), kpi, target, param, method=method, **assumptions)
+    shape = (len(df),)
+    solved = pd.DataFrame({
+        f"required_{param}": np.broadcast_to(res["root"], shape),
+        "converged": np.broadcast_to(res["converged"], shape),
+        "iterations": np.broadcast_to(res["iterations"], shape),
+        "residual": np.broadcast_to(res["residual"], shape),
+    }, index=df.index)
+    return pd.concat([df, solved], axis=1)
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def iter_table_chunks(source, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Yield DataFrames of at most `chunksize` rows (optionally only `columns`) from a CSV or Parquet path / file object."""
+    _rewind(source)
+    if _is_parquet(source):
+        _, pq = _require_pyarrow()
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, usecols=columns)
+
+
+def read_table(source, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """A whole CSV or Parquet table (optionally only `columns`) read chunk by chunk; empty tables keep `columns`."""
+    chunks = list(iter_table_chunks(source, chunksize, columns=columns))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+
+def table_columns(source):
+    """Column names of a CSV or Parquet path / file object, without reading the data."""
+    _rewind(source)
+    if _is_parquet(source):
+        _, pq = _require_pyarrow()
+        names = list(pq.ParquetFile(source).schema_arrow.names)
+    else:
+        names = list(pd.read_csv(source, nrows=0).columns)
+    _rewind(source)
+    return names
+
+
+def iter_baseline_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most `chunksize` rows from a CSV or Parquet file."""
+    yield from iter_table_chunks(path, chunksize)
+
+
+def run_batch(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, seek=None, **assumptions):
+    """
+    Stream `input_path` through the path and write the KPI table to `output_path`. Returns rows written.
+    With `seek=(kpi, target, param)` every row is goal-sought instead (see goal_seek_baselines).
+    """
+    rows = 0
+    writer = None
+    if _is_parquet(output_path):
+        pa, pq = _require_pyarrow()
+    try:
+        for chunk in iter_baseline_chunks(input_path, chunksize):
+            if seek is None:
+                result = evaluate_baselines(chunk, **assumptions)
+            else:
+                result = goal_seek_baselines(chunk, *seek, **assumptions)
+            if _is_parquet(output_path):
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            else:
+                result.to_csv(output_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.batch", description="Evaluate Stages 1-5 for a file of baselines.")
+    parser.add_argument("input", help="CSV or Parquet file with baseline columns")
+    parser.add_argument("output", help="CSV or Parquet file for the KPI table")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows evaluated per pass")
+    parser.add_argument("--seek", nargs=3, metavar=("KPI", "TARGET", "PARAM"),
+                        help="solve each row for the PARAM value that brings KPI to TARGET (a number or a column name)")
+    for key, value in PATH_ASSUMPTIONS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=type(value), default=value)
+    args = vars(parser.parse_args(argv))
+
+    input_path, output_path, chunksize, seek = args.pop("input"), args.pop("output"), args.pop("chunksize"), args.pop("seek")
+    if seek is not None:
+        kpi, target, param = seek
+        try:
+            target = float(target)
+        except ValueError:
+            pass  # column name
+        seek = (kpi, target, param)
+    rows = run_batch(input_path, output_path, chunksize, seek, **args)
+    print(f"{rows:,} baselines evaluated -> {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# core/bom.py
+"""
+Bill-of-materials ingest for the unit cost roll-up.
+
+Two tables, CSV or Parquet, streamed in chunks:
+  structure:  parent, child, quantity   (one row per component usage)
+  costs:      component, cost           (own cost: purchase price or conversion cost)
+Components without a cost row count 0 (pure assemblies); names are factorized
+once so the engine works on integer indices only.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, read_table
+from core.engine.bom import BillOfMaterials
+
+STRUCTURE_COLUMNS = {"parent": "parent", "child": "child", "quantity": "quantity"}
+COST_COLUMNS = {"name": "component", "cost": "cost"}
+
+
+def load_bom(structure_source, costs_source=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Build a BillOfMaterials from a structure table and an optional own-cost table."""
+    edges = read_table(structure_source, chunksize, columns=list(STRUCTURE_COLUMNS.values()))
+    parents = edges[STRUCTURE_COLUMNS["parent"]].astype(str)
+    children = edges[STRUCTURE_COLUMNS["child"]].astype(str)
+    quantity = pd.to_numeric(edges[STRUCTURE_COLUMNS["quantity"]], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    if costs_source is not None:
+        costs = read_table(costs_source, chunksize, columns=list(COST_COLUMNS.values()))
+        cost_names = costs[COST_COLUMNS["name"]].astype(str)
+        cost_values = pd.to_numeric(costs[COST_COLUMNS["cost"]], errors="coerce").fillna(0).to_numpy(dtype=float)
+    else:
+        cost_names, cost_values = pd.Series([], dtype=str), np.empty(0)
+
+    codes, names = pd.factorize(pd.concat([parents, children, cost_names], ignore_index=True))
+    n_edges = len(edges)
+    own_cost = np.zeros(names.size)
+    own_cost[codes[2 * n_edges:]] = cost_values  # last row wins for repeated components
+    return BillOfMaterials(np.asarray(names), own_cost, codes[:n_edges], codes[n_edges:2 * n_edges], quantity)
@@ -0,0 +1,86 @@
+# core/diversion.py
+"""
+Portfolio and diversion-matrix ingest for the substitution analysis.
+
+The product table holds one row per own product (price, unit profit and
+optionally volume, price increase, elasticity). The diversion matrix comes
+either in long form (one row per from -> to pair with its share, the practical
+format for 500+ SKUs where most pairs are zero) or wide form (a square table
+whose first column names the losing product and whose headers name the
+recapturing ones).
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import read_table
+
+PORTFOLIO_COLUMNS = {
+    "name": "product",
+    "price": "price",
+    "profit": "unit_profit",
+    "volume": "volume",
+    "increase": "price_increase",
+    "elasticity": "elasticity",
+}
+LONG_COLUMNS = ("from", "to", "share")
+
+
+def load_portfolio(source):
+    """
+    Read the product table into a DataFrame with Name, Price, UnitProfit, Volume and, when
+    present, PriceIncrease and Elasticity. Missing volumes default to 1 (per-unit view).
+    """
+    raw = read_table(source)
+    missing = [PORTFOLIO_COLUMNS[k] for k in ("name", "price", "profit") if PORTFOLIO_COLUMNS[k] not in raw]
+    if missing:
+        raise KeyError(f"missing column(s): {', '.join(missing)}")
+
+    def numeric(key, default=np.nan):
+        col = PORTFOLIO_COLUMNS[key]
+        return pd.to_numeric(raw[col], errors="coerce").to_numpy(dtype=float) if col in raw else np.full(len(raw), default)
+
+    df = pd.DataFrame({
+        "Name": raw[PORTFOLIO_COLUMNS["name"]].astype(str).to_numpy(),
+        "Price": numeric("price"),
+        "UnitProfit": numeric("profit"),
+        "Volume": numeric("volume", 1.0),
+    })
+    for key, label in (("increase", "PriceIncrease"), ("elasticity", "Elasticity")):
+        if PORTFOLIO_COLUMNS[key] in raw:
+            df[label] = numeric(key)
+    df = df.dropna(subset=["Price", "UnitProfit"])
+    if df["Name"].duplicated().any():
+        raise ValueError("product names must be unique")
+    return df.reset_index(drop=True)
+
+
+def load_diversion(source, names):
+    """Dense (N, N) diversion matrix ordered like `names`; pairs not listed are 0."""
+    raw = read_table(source)
+    index = pd.Index(names)
+    matrix = np.zeros((len(index), len(index)))
+
+    if all(col in raw for col in LONG_COLUMNS):
+        rows = index.get_indexer(raw["from"].astype(str))
+        cols = index.get_indexer(raw["to"].astype(str))
+        share = pd.to_numeric(raw["share"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        unknown = (rows < 0) | (cols < 0)
+        if unknown.any():
+            bad = raw.loc[unknown, ["from", "to"]].astype(str).to_numpy().ravel()
+            raise ValueError(f"unknown product(s) in diversion file: {', '.join(sorted(set(bad) - set(index))[:5])}")
+        np.add.at(matrix, (rows, cols), share)
+    else:
+        wide = raw.set_index(raw.columns[0])
+        wide.index = wide.index.astype(str)
+        wide.columns = wide.columns.astype(str)
+        unknown = (set(wide.index) | set(wide.columns)) - set(index)
+        if unknown:
+            raise ValueError(f"unknown product(s) in diversion file: {', '.join(sorted(unknown)[:5])}")
+        values = wide.apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float)
+        matrix[np.ix_(index.get_indexer(wide.index), index.get_indexer(wide.columns))] = values
+
+    np.fill_diagonal(matrix, 0.0)  # a product cannot recapture its own lost volume
+    if (matrix < 0).any():
+        raise ValueError("diversion shares must be non-negative")
+    return matrix
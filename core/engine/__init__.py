@@ -0,0 +1,7 @@
+# core/engine/__init__.py
+"""
+Headless calculation engine.
+Pure NumPy math behind the path stages and the tool library.
+Nothing in this package imports streamlit: every function takes plain
+scalars or arrays and broadcasts over them.
+"""
@@ -0,0 +1,30 @@
+# core/engine/arrays.py
+"""
+Array helpers shared by the engine modules.
+"""
+
+import numpy as np
+
+
+def as_array(x):
+    """Coerce any scalar / sequence / array input to a float ndarray."""
+    return np.asarray(x, dtype=float)
+
+
+def unwrap(x):
+    """Return 0-d results as NumPy scalars so scalar callers keep scalar semantics."""
+    x = np.asarray(x)
+    return x[()] if x.ndim == 0 else x
+
+
+def divide_positive(numerator, denominator, fill=0.0):
+    """Element-wise numerator / denominator, `fill` where the denominator is <= 0."""
+    num, den = np.broadcast_arrays(as_array(numerator), as_array(denominator))
+    out = np.full(num.shape, fill, dtype=float)
+    np.divide(num, den, out=out, where=den > 0)
+    return unwrap(out)
+
+
+def outer_grid(*axes):
+    """Lay 1-D axes along separate dimensions so they broadcast into a full grid."""
+    return np.ix_(*[np.asarray(a, dtype=float).ravel() for a in axes])
@@ -0,0 +1,56 @@
+# core/engine/break_even.py
+"""
+Stage 0/1: Margin structure and Break-Even
+Survival anchor math shared by the path and the pricing tools.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, divide_positive, unwrap
+from core.engine.memo import memoize
+
+
+def unit_contribution(price, variable_cost):
+    """Contribution per unit sold (€)."""
+    return unwrap(as_array(price) - as_array(variable_cost))
+
+
+def contribution_margin(price, variable_cost):
+    """Contribution margin as a share of price (0 when price <= 0)."""
+    return divide_positive(unit_contribution(price, variable_cost), price)
+
+
+def break_even_units(fixed_cost, price, variable_cost):
+    """Units needed to cover fixed costs (0 when the unit contribution is not positive)."""
+    return divide_positive(fixed_cost, unit_contribution(price, variable_cost))
+
+
+@memoize
+def break_even(price, variable_cost, volume, fixed_cost):
+    """Full break-even picture for one or many baselines."""
+    price = as_array(price)
+    volume = as_array(volume)
+    uc = unit_contribution(price, variable_cost)
+    be_units = break_even_units(fixed_cost, price, variable_cost)
+
+    return {
+        "revenue": unwrap(price * volume),
+        "unit_contribution": uc,
+        "profit": unwrap(uc * volume - as_array(fixed_cost)),
+        "be_units": be_units,
+        "be_revenue": unwrap(be_units * price),
+        "safety_margin": divide_positive(volume - be_units, volume) * 100,
+        "surplus_units": unwrap(volume - be_units),
+        "survival_margin": divide_positive(volume, be_units, fill=np.nan) - 1,
+    }
+
+
+def required_volume_increase(margin_pct, price_cut_pct):
+    """
+    Volume increase that keeps gross profit constant after a price cut.
+    Required Q Change = Price Cut % / (Margin % - Price Cut %); inf when the cut eats the margin.
+    """
+    margin_pct = as_array(margin_pct)
+    price_cut_pct = as_array(price_cut_pct)
+    headroom = margin_pct - price_cut_pct
+    return divide_positive(price_cut_pct, headroom, fill=np.inf)
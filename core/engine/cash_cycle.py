@@ -0,0 +1,109 @@
+# core/engine/cash_cycle.py
+"""
+Stage 2: Cash Conversion Cycle (CCC)
+Working capital tied up in inventory and receivables, net of supplier credit.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+from core.engine.memo import memoize
+
+DAYS_IN_YEAR = 365
+CARRYING_COST_PCT = 0.20
+
+
+def days_to_value(days, annual_amount):
+    """Capital locked by `days` of an annual flow (€)."""
+    return unwrap((as_array(days) / DAYS_IN_YEAR) * as_array(annual_amount))
+
+
+def cash_conversion_cycle(inventory_days, ar_days, payables_days):
+    """CCC in days: inventory + receivables - payables."""
+    return unwrap(as_array(inventory_days) + as_array(ar_days) - as_array(payables_days))
+
+
+@memoize
+def working_capital(price, volume, variable_cost, inventory_days, ar_days, payables_days,
+                    dead_stock_pct=0.0, carrying_cost_pct=CARRYING_COST_PCT):
+    """
+    Liquidity gap of the operating cycle.
+    `dead_stock_pct` is the non-moving share of inventory (0.10 = 10%) that must be
+    re-funded with fresh stock; it also inflates the carrying cost (liquidity drain).
+    """
+    price = as_array(price)
+    volume = as_array(volume)
+    dead_stock_pct = as_array(dead_stock_pct)
+
+    annual_cogs = volume * as_array(variable_cost)
+    inventory_value = days_to_value(inventory_days, annual_cogs)
+    ar_value = days_to_value(ar_days, price * volume)
+    ap_value = days_to_value(payables_days, annual_cogs)
+
+    base_wcr = inventory_value + ar_value - ap_value
+    dead_stock_funding = inventory_value * dead_stock_pct
+    liquidity_drain = inventory_value * (1 + dead_stock_pct) * as_array(carrying_cost_pct)
+
+    return {
+        "annual_cogs": unwrap(annual_cogs),
+        "inventory_value": inventory_value,
+        "ar_value": ar_value,
+        "ap_value": ap_value,
+        "ccc": cash_conversion_cycle(inventory_days, ar_days, payables_days),
+        "base_wcr": unwrap(base_wcr),
+        "dead_stock_funding": unwrap(dead_stock_funding),
+        "liquidity_gap": unwrap(base_wcr + dead_stock_funding),
+        "liquidity_drain": unwrap(liquidity_drain),
+        "daily_cash_release": unwrap(annual_cogs / DAYS_IN_YEAR),
+    }
+
+
+def _lag(flow, days):
+    """Delay a daily flow (..., H) by `days` (integer, broadcastable); nothing arrives before day 0."""
+    flow = as_array(flow)
+    days = np.rint(as_array(days)).astype(np.int64)[..., None]
+    idx = np.arange(flow.shape[-1]) - days
+    shape = np.broadcast_shapes(flow.shape, idx.shape)
+    out = np.take_along_axis(np.broadcast_to(flow, shape), np.broadcast_to(np.maximum(idx, 0), shape), axis=-1)
+    return np.where(idx >= 0, out, 0.0)
+
+
+def daily_cash_ledger(price, volume, variable_cost, inventory_days, ar_days, payables_days,
+                      fixed_cost=0.0, opening_cash=0.0, horizon=DAYS_IN_YEAR, seasonality=None):
+    """
+    Day-by-day cash ledger from launch (day 1 = first stock purchase; index i of a daily
+    series is day i + 1, and `min_day` is reported on the same 1-based scale).
+    Stock bought on day t is sold on t + inventory_days, collected ar_days after the sale
+    and paid to the supplier payables_days after the purchase. Fixed costs are paid daily.
+    `seasonality` is an optional (..., horizon) demand profile with mean 1.
+    Scalar or array inputs broadcast; daily series come back with a trailing `horizon` axis.
+    """
+    demand = as_array(volume)[..., None] / DAYS_IN_YEAR * np.ones(horizon)
+    if seasonality is not None:
+        demand = demand * as_array(seasonality)
+
+    price = as_array(price)[..., None]
+    unit_cost = as_array(variable_cost)[..., None]
+    sale_lag = as_array(inventory_days)
+
+    purchases = demand * unit_cost
+    payments = _lag(purchases, payables_days)
+    sales = _lag(demand, sale_lag) * price
+    collections = _lag(demand, sale_lag + as_array(ar_days)) * price
+    net_flow = collections - payments - as_array(fixed_cost)[..., None] / DAYS_IN_YEAR
+    balance = as_array(opening_cash)[..., None] + np.cumsum(net_flow, axis=-1)
+
+    min_balance = balance.min(axis=-1)
+    return {
+        "purchases": unwrap(purchases),
+        "sales": unwrap(sales),
+        "collections": unwrap(collections),
+        "payments": unwrap(payments),
+        "net_flow": unwrap(net_flow),
+        "balance": unwrap(balance),
+        "min_balance": unwrap(min_balance),
+        "min_day": unwrap(balance.argmin(axis=-1) + 1),
+        "peak_funding": unwrap(np.maximum(-min_balance, 0.0)),
+        "days_negative": unwrap((balance < 0).sum(axis=-1)),
+        "ending_balance": unwrap(balance[..., -1]),
+    }
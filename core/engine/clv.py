@@ -0,0 +1,133 @@
+# core/engine/clv.py
+"""
+Stage 3: Unit Economics & CLV
+Survival-weighted, discounted customer cash flows.
+
+With survival (1 - churn) and discount factor 1 / (1 + r), yearly flows form
+a geometric series with ratio g = (1 - churn) / (1 + r), so CLV, cumulative
+NPV and the payback year have closed forms that broadcast over whole grids of
+churn x discount rate x risk premium x horizon x margin.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, divide_positive, unwrap
+from core.engine.memo import memoize
+
+
+def retention_weighted_margin(price, variable_cost, purchases_per_year, retention_discount):
+    """
+    Annual margin per customer: first purchase at full price, repeats at a discount.
+    Returns (weighted_annual_margin, repeat_margin).
+    """
+    price = as_array(price)
+    variable_cost = as_array(variable_cost)
+    first_purchase_margin = price - variable_cost
+    repeat_margin = (price * (1 - as_array(retention_discount))) - variable_cost
+    weighted = first_purchase_margin + (repeat_margin * (as_array(purchases_per_year) - 1))
+    return unwrap(weighted), unwrap(repeat_margin)
+
+
+def discounted_flows(annual_flow, churn_rate, discount_rate, horizon, survival_lag=0):
+    """
+    Present value of each year's customer flow, shape (..., horizon).
+    Survival in year t is (1 - churn)^(t - survival_lag): lag 1 means the
+    whole cohort is still active during year 1.
+    """
+    years = np.arange(1, int(horizon) + 1)
+    flow = as_array(annual_flow)[..., None]
+    survival = (1 - as_array(churn_rate)[..., None]) ** (years - survival_lag)
+    return (flow * survival) / ((1 + as_array(discount_rate)[..., None]) ** years)
+
+
+def cumulative_npv(annual_flow, churn_rate, discount_rate, horizon, cac=0.0, survival_lag=0):
+    """Cumulative NPV per year net of acquisition cost, shape (..., horizon)."""
+    flows = discounted_flows(annual_flow, churn_rate, discount_rate, horizon, survival_lag)
+    return np.cumsum(flows, axis=-1) - as_array(cac)[..., None]
+
+
+def payback_year(cum_npv):
+    """First year (1-based) where cumulative NPV turns non-negative, 0 if never."""
+    reached = np.asarray(cum_npv) >= 0
+    first = np.argmax(reached, axis=-1) + 1
+    return unwrap(np.where(reached.any(axis=-1), first, 0))
+
+
+def ltv_cac(clv, cac):
+    """LTV / CAC ratio (0 when CAC is not positive)."""
+    return divide_positive(clv, cac)
+
+
+def payback_months(cac, annual_margin):
+    """Months of margin needed to recover CAC (0 when the margin is not positive)."""
+    return divide_positive(cac, annual_margin) * 12
+
+
+def _geometric_sum(ratio, n):
+    """Sum of ratio^k for k = 0 .. n-1, stable around ratio == 1."""
+    ratio, n = np.broadcast_arrays(as_array(ratio), as_array(n))
+    near_one = np.abs(ratio - 1) < 1e-9
+    safe = np.where(near_one, 0.5, ratio)
+    closed = (1 - safe ** n) / (1 - safe)
+    # First-order expansion n + n(n-1)/2 * (ratio - 1) where the closed form cancels
+    return np.where(near_one, n + n * (n - 1) / 2 * (ratio - 1), closed)
+
+
+@memoize
+def clv_grid(annual_flow, churn_rate, discount_rate, horizon, cac=0.0, risk_premium=0.0, survival_lag=0):
+    """
+    Closed-form CLV over broadcast grids (use arrays.outer_grid to build the axes).
+    The discount applied is discount_rate + risk_premium; `horizon` may be an array.
+    Returns gross CLV (PV of flows), NPV net of CAC, LTV/CAC and the payback
+    year (first year cumulative NPV >= 0, 0 if never within the horizon).
+    """
+    flow = as_array(annual_flow)
+    survival = 1 - as_array(churn_rate)
+    rate = as_array(discount_rate) + as_array(risk_premium)
+    horizon = np.floor(as_array(horizon))
+    cac = as_array(cac)
+
+    ratio = survival / (1 + rate)
+    # PV of the first year's flow; later years scale by ratio^(t-1)
+    first_year = flow * survival ** (1 - survival_lag) / (1 + rate)
+    clv = first_year * _geometric_sum(ratio, horizon)
+
+    return {
+        "clv": unwrap(clv),
+        "npv": unwrap(clv - cac),
+        "ltv_cac": ltv_cac(clv, cac),
+        "payback_year": _payback_year_closed(first_year, ratio, horizon, cac),
+    }
+
+
+def clv_surface(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac):
+    """`clv_grid` in the CLV tool's terms: order economics and rates in % (any broadcastable mix of scalars and grids)."""
+    # Realized cash flow after risk; survival probability (1 - churn)^t applied per year
+    annual_flow = np.multiply(np.multiply(purchases, margin_per_order), realization)
+    return clv_grid(annual_flow, np.divide(churn, 100), np.divide(discount, 100), retention_years,
+                    cac=cac, risk_premium=np.divide(risk_p, 100))
+
+
+def _payback_year_closed(first_year, ratio, horizon, cac):
+    """Smallest T with first_year * S(T) >= cac, where S(T) = sum of ratio^k, k < T."""
+    first_year, ratio, horizon, cac = np.broadcast_arrays(first_year, ratio, horizon, cac)
+    growing = first_year > 0
+    target = np.divide(cac, first_year, out=np.zeros(first_year.shape), where=growing)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near_one = np.abs(ratio - 1) < 1e-9
+        arg = 1 - target * (1 - ratio)
+        estimate = np.where(near_one, np.ceil(target), np.ceil(np.log(arg) / np.log(ratio)))
+    estimate = np.where(np.isfinite(estimate), np.maximum(estimate, 1), np.inf)
+
+    # One-step correction against floating error in the log inversion
+    capped = np.minimum(estimate, horizon + 1)
+    prev = np.maximum(capped - 1, 1)
+    capped = np.where((capped > 1) & (_geometric_sum(ratio, prev) >= target), prev, capped)
+    capped = np.where(_geometric_sum(ratio, capped) < target, capped + 1, capped)
+
+    # Non-positive flows never pay back beyond year 1
+    year_one_ok = first_year - cac >= 0
+    years = np.where(growing, capped, np.where(year_one_ok, 1, np.inf))
+    years = np.where((years <= horizon) & np.isfinite(years), years, 0)
+    return unwrap(years.astype(int))
@@ -0,0 +1,71 @@
+# core/engine/complements.py
+"""
+Complementary Products: volume needed to offset a price cut when each
+core unit also pulls cross-sell profit.
+Complements are vectors (attach probability and unit profit per item, last
+axis), and discounts broadcast, so hundreds of attached SKUs across a whole
+grid of discounts evaluate in one call.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+
+
+def expected_complement_profit(attach_rates, unit_profits):
+    """Expected cross-sell profit per core unit: sum over complements of attach rate x unit profit."""
+    return unwrap(np.sum(as_array(attach_rates) * as_array(unit_profits), axis=-1))
+
+
+def bundle_volume_increase(price, discount, core_profit, attach_rates, unit_profits):
+    """
+    Volume increase (%) that keeps total profit unchanged after cutting the core price by `discount`,
+    counting the expected complement profit of every extra core unit.
+    `discount` is the size of the cut as a fraction: 0.10 and -0.10 both mean a 10% cut (the sign is
+    dropped). NaN where the cut wipes out the whole bundle margin (no volume can offset it).
+    """
+    cut = np.abs(as_array(discount))
+    bundle_margin = as_array(core_profit) + as_array(expected_complement_profit(attach_rates, unit_profits))
+    # Indifference point: the margin lost on existing units equals the margin of the extra units
+    headroom = bundle_margin / as_array(price) - cut
+    out = np.full(np.broadcast(cut, headroom).shape, np.nan)
+    np.divide(cut, headroom, out=out, where=headroom > 0)
+    return unwrap(out * 100)
+
+
+def attach_rate_sensitivity(price, discount, core_profit, attach_rates, unit_profits):
+    """
+    Change in `bundle_volume_increase` (percentage points) per +1 percentage point
+    of each complement's attach rate, shape (..., K). Negative: a higher attach rate lowers the hurdle.
+    """
+    cut = np.abs(as_array(discount))
+    price = as_array(price)
+    unit_profits = as_array(unit_profits)
+    bundle_margin = as_array(core_profit) + as_array(expected_complement_profit(attach_rates, unit_profits))
+    headroom = as_array(bundle_margin / price - cut)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(headroom > 0, -cut / headroom ** 2, np.nan)
+    # d(required %)/d(attach_k) = slope x profit_k / price x 100; per percentage point: / 100
+    return unwrap(np.expand_dims(slope / price, -1) * unit_profits)
+
+
+def calculate_required_sales_increase(
+    suit_price, price_decrease_pct, profit_suit,
+    profit_shirt, profit_tie, profit_belt, profit_shoes,
+    p_shirt, p_tie, p_belt, p_shoes
+):
+    """
+    Four-complement indifference formula -d / (M/P + d), with `price_decrease_pct` = d signed
+    as entered (unlike `bundle_volume_increase`). Inputs broadcast (one element per scenario);
+    a zero denominator gives None for a scalar call and NaN in arrays.
+    """
+    items = np.broadcast_arrays(*map(as_array, (p_shirt, p_tie, p_belt, p_shoes,
+                                                profit_shirt, profit_tie, profit_belt, profit_shoes)))
+    bundle_margin = as_array(profit_suit) + as_array(expected_complement_profit(
+        np.stack(items[:4], axis=-1), np.stack(items[4:], axis=-1)))
+    cut = -as_array(price_decrease_pct)
+    denominator = bundle_margin / as_array(suit_price) - cut
+    out = np.full(np.broadcast(cut, denominator).shape, np.nan)
+    np.divide(cut, denominator, out=out, where=denominator != 0)
+    result = unwrap(out * 100)
+    return None if np.ndim(result) == 0 and np.isnan(result) else result
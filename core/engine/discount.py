@@ -0,0 +1,144 @@
+# core/engine/discount.py
+"""
+Cash Discount Policy: NPV of trading margin for faster collections.
+All inputs broadcast, so discount x take-up x payment days x WACC grids
+evaluate as one array expression (surface mode).
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, divide_positive, unwrap
+from core.engine.memo import memoize
+
+
+def discount_npv_surface(
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+):
+    """Unrounded policy KPIs over broadcast arrays (shares as fractions, discounts as fractions)."""
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc = map(
+        as_array, (current_sales, extra_sales, discount_trial, prc_clients_take_disc))
+    days_take, days_not_take, new_days, cogs, wacc, supplier_days = map(
+        as_array, (days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+                   new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prc_clients_not_take_disc = 1 - prc_clients_take_disc
+        avg_current_collection_days = (
+            prc_clients_take_disc * days_take +
+            prc_clients_not_take_disc * days_not_take
+        )
+        current_receivables = current_sales * avg_current_collection_days / 365
+
+        total_sales = current_sales + extra_sales
+        prcnt_new_policy = ((current_sales * prc_clients_take_disc) + extra_sales) / total_sales
+        prcnt_old_policy = 1 - prcnt_new_policy
+
+        new_avg_collection_period = (
+            prcnt_new_policy * new_days +
+            prcnt_old_policy * days_not_take
+        )
+        new_receivables = total_sales * new_avg_collection_period / 365
+        free_capital = current_receivables - new_receivables
+
+        cogs_ratio = cogs / current_sales
+        extra_ratio = extra_sales / current_sales
+        profit_from_extra_sales = extra_sales * (1 - cogs_ratio)
+        profit_from_free_capital = free_capital * wacc
+        discount_cost = total_sales * prcnt_new_policy * discount_trial
+
+        # Daily compounding at the cost of capital
+        growth = 1 + wacc / 365
+
+        inflow = (
+            total_sales * prcnt_new_policy * (1 - discount_trial) /
+            (growth ** new_days)
+        )
+        inflow = inflow + total_sales * prcnt_old_policy / (growth ** days_not_take)
+
+        outflow = (
+            cogs_ratio * extra_ratio * current_sales /
+            (growth ** supplier_days)
+        )
+        outflow = outflow + current_sales / (growth ** avg_current_collection_days)
+
+        npv = inflow - outflow
+
+        # Threshold & Optimum Calculations
+        max_discount = 1 - (
+            growth ** (new_days - days_not_take) * (
+                (1 - 1 / prcnt_new_policy) + (
+                    growth ** (days_not_take - avg_current_collection_days) +
+                    cogs_ratio * extra_ratio *
+                    growth ** (days_not_take - supplier_days)
+                ) / (prcnt_new_policy * (1 + extra_ratio))
+            )
+        )
+
+        optimum_discount = (1 - (growth ** (new_days - avg_current_collection_days))) / 2
+
+    return {
+        "avg_current_collection_days": unwrap(avg_current_collection_days),
+        "current_receivables": unwrap(current_receivables),
+        "prcnt_new_policy": unwrap(prcnt_new_policy),
+        "new_avg_collection_period": unwrap(new_avg_collection_period),
+        "free_capital": unwrap(free_capital),
+        "profit_from_extra_sales": unwrap(profit_from_extra_sales),
+        "profit_from_free_capital": unwrap(profit_from_free_capital),
+        "discount_cost": unwrap(discount_cost),
+        "npv": unwrap(npv),
+        "max_discount": unwrap(max_discount),
+        "optimum_discount": unwrap(optimum_discount),
+    }
+
+
+# Display precision of calculate_discount_npv (discount thresholds reported in %)
+_ROUNDING = {"prcnt_new_policy": 4}
+_PERCENT_KEYS = ("max_discount", "optimum_discount")
+
+
+@memoize
+def calculate_discount_npv(
+    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+):
+    res = discount_npv_surface(
+        current_sales, extra_sales, discount_trial, prc_clients_take_disc,
+        days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
+        new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
+    )
+    return {
+        key: unwrap(np.round(value * 100 if key in _PERCENT_KEYS else value, _ROUNDING.get(key, 2)))
+        for key, value in res.items()
+    }
+
+
+def allocate_discount_takers(segments, prc_clients_take_disc, allocation_mode="Proportional"):
+    """
+    Split the receivable segments into discount takers and non-takers.
+    `segments` is a list of {"pct": share, "dso": days}; takers are filled in
+    segment order ("Proportional"), slowest first or fastest first.
+    `prc_clients_take_disc` may be an array (take-up axis of a surface).
+    Returns the effective DSO of takers and of non-takers.
+    """
+    segments = list(segments)
+    if allocation_mode == "Slow Payers First":
+        segments.sort(key=lambda x: x["dso"], reverse=True)
+    elif allocation_mode == "Fast Payers First":
+        segments.sort(key=lambda x: x["dso"])
+
+    pct = as_array([seg["pct"] for seg in segments])
+    dso = as_array([seg["dso"] for seg in segments])
+    take_up = as_array(prc_clients_take_disc)
+
+    # Each segment absorbs takers until full, in order
+    filled_before = np.concatenate(([0.0], np.cumsum(pct)[:-1]))
+    take = np.clip(take_up[..., None] - filled_before, 0, pct)
+    weighted_take_dso = (take * dso).sum(axis=-1)
+    weighted_no_take_dso = ((pct - take) * dso).sum(axis=-1)
+
+    eff_take = divide_positive(weighted_take_dso, take_up)
+    eff_no_take = divide_positive(weighted_no_take_dso, 1 - take_up)
+    return eff_take, eff_no_take
@@ -0,0 +1,99 @@
+# core/engine/financing.py
+"""
+Loan vs Leasing: net financial burden of two financing structures.
+Every input broadcasts, so whole rate x duration x financing-% grids
+(see arrays.outer_grid) evaluate in one call.
+"""
+
+import numpy as np
+import numpy_financial as npf
+
+from core.engine.arrays import as_array, unwrap
+from core.engine.memo import memoize
+from core.engine.solver import bisect
+
+
+def pmt(rate, nper, pv, fv=0, when=0):
+    return -npf.pmt(rate, nper, pv, fv, when)
+
+
+# CALCULATION ENGINE (Original Formulas Preserved)
+@memoize
+def run_calculations(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years):
+    loan_rate, wc_rate, years, tax_rate, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years = map(
+        as_array, (loan_rate, wc_rate, years, tax_rate, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years))
+    when = np.asarray(when, dtype=int)
+    months = years * 12
+
+    # --- LOAN ---
+    loan_inst = pmt(loan_rate / 12, months, value * loan_pct, 0, when)
+    wc_loan = value * (1 - loan_pct) + exp_loan
+    wc_inst = pmt(wc_rate / 12, months, wc_loan, 0, when)
+
+    loan_cash = (loan_inst + wc_inst) * months
+    loan_interest = loan_cash - value
+    loan_depr = (value + exp_loan) / dep_years * years
+    loan_tax = (loan_interest + loan_depr) * tax_rate
+    loan_final = value + loan_interest - loan_tax
+
+    # --- LEASING ---
+    lease_inst = pmt(loan_rate / 12, months, value * lease_pct, 0, when)
+    wc_lease = value * (1 - lease_pct) + exp_lease
+    wc_lease_inst = pmt(wc_rate / 12, months, wc_lease, 0, when)
+
+    lease_cash = (lease_inst + wc_lease_inst) * months
+    lease_interest = lease_cash - value
+    lease_depr = value + exp_lease + residual
+    lease_tax = ((wc_lease_inst * months - wc_lease) + lease_depr) * tax_rate
+    lease_final = value + lease_interest - lease_tax
+
+    return tuple(unwrap(x) for x in (
+        loan_final, lease_final, loan_cash, loan_interest, loan_depr, loan_tax, lease_cash, lease_interest, lease_depr, lease_tax
+    ))
+
+
+@memoize
+def indifference_rate(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years,
+                      lo=0.0, hi=1.0, tol=1e-12):
+    """
+    Leasing rate at which the leasing burden equals the loan burden at `loan_rate`.
+    Solved by bracketed bisection on [lo, hi] for every deal at once; NaN where
+    the bracket holds no crossing. Returns (rate, converged).
+    """
+    args = (wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years)
+    loan_final = run_calculations(loan_rate, *args)[0]
+    return bisect(lambda r: run_calculations.__wrapped__(r, *args)[1] - loan_final, lo, hi, tol=tol)
+
+
+def indifference_residual(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years):
+    """
+    Residual value at which both options carry the same burden.
+    The leasing burden is affine in the residual (it only enters the tax shield),
+    so the crossing is solved exactly from two evaluations; NaN with a zero tax rate.
+    """
+    def gap(res):
+        loan_final, lease_final = run_calculations(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct,
+                                                   lease_pct, exp_loan, exp_lease, res, dep_years)[:2]
+        return as_array(lease_final - loan_final)
+
+    g0 = gap(0.0)
+    slope = gap(1.0) - g0
+    out = np.full(np.broadcast(g0, slope).shape, np.nan)
+    np.divide(-g0, slope, out=out, where=slope != 0)
+    return unwrap(out)
+
+
+@memoize
+def indifference_duration(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years,
+                          lo=1 / 12, hi=50.0, tol=1e-8):
+    """
+    Duration (years, fractional) at which both options carry the same burden.
+    Bracketed bisection on [lo, hi]; `years` is ignored. Returns (years, converged).
+    """
+    def gap(y):
+        # Solver iterates are never reused: skip the memo layer
+        loan_final, lease_final = run_calculations.__wrapped__(loan_rate, wc_rate, y, tax_rate, when, value, loan_pct,
+                                                               lease_pct, exp_loan, exp_lease, residual, dep_years)[:2]
+        return lease_final - loan_final
+
+    return bisect(gap, lo, hi, tol=tol)
@@ -0,0 +1,51 @@
+# core/engine/goal_seek.py
+"""
+Goal seek over the 5-Stage Path: "what must `param` be for `kpi` to hit `target`?"
+Baselines and targets may be arrays, so thousands of what-must-be-true questions
+are answered by one vectorized solve (see solver.solve).
+"""
+
+import numpy as np
+
+from core.baseline import BASELINE_KEYS, BOUNDED_PARAMS
+from core.engine.arrays import as_array
+from core.engine.memo import memoize, uncached
+from core.engine.path import evaluate_path
+from core.engine.solver import solve
+
+# Default search range as multiples of the baseline value (absolute for bounded params)
+DEFAULT_SPAN = (0.0, 10.0)
+
+
+def default_bracket(baseline, param):
+    """(lo, hi) search range for `param`: its bounds if it is a share, else 0 .. 10x the baseline value."""
+    if param in BOUNDED_PARAMS:
+        return BOUNDED_PARAMS[param]
+    value = np.abs(as_array(baseline[param]))
+    return DEFAULT_SPAN[0] * value, DEFAULT_SPAN[1] * np.maximum(value, 1.0)
+
+
+@memoize(maxsize=64)
+def goal_seek(baseline, kpi, target, param, lo=None, hi=None, method="newton", tol=1e-8, max_iter=100, **assumptions):
+    """
+    Value of baseline `param` at which path KPI `kpi` equals `target`, other inputs held.
+    `baseline` maps the core/baseline.py keys to scalars or arrays; `target`, `lo` and
+    `hi` broadcast against it. Keyword arguments override PATH_ASSUMPTIONS.
+    Returns the solver.solve diagnostics dict plus "kpi", "param" and "target".
+    """
+    if param not in BASELINE_KEYS:
+        raise KeyError(f"{param!r} is not a baseline parameter")
+    default_lo, default_hi = default_bracket(baseline, param)
+    lo = default_lo if lo is None else lo
+    hi = default_hi if hi is None else hi
+
+    columns = {key: as_array(baseline[key]) for key in BASELINE_KEYS}
+    target = as_array(target)
+
+    def gap(x):
+        return evaluate_path.__wrapped__({**columns, param: x}, **assumptions)[kpi] - target
+
+    # Solver iterates are never reused: keep them out of the stage caches
+    with uncached(), np.errstate(divide="ignore", invalid="ignore"):
+        result = solve(gap, lo, hi, method=method, tol=tol, max_iter=max_iter)
+    return {"kpi": kpi, "param": param, "target": target, **result}
@@ -0,0 +1,117 @@
+# core/engine/graph.py
+"""
+Declarative dependency graph for derived metrics.
+
+A GraphSpec lists the inputs (with defaults) and the derived nodes; each node
+is a plain function whose parameter names are the inputs / nodes it depends on.
+A DependencyGraph holds one set of values for a spec: changing an input drops
+only the nodes downstream of it, and nodes are recomputed lazily on first read,
+so everything else is served from memory. `recomputed` lists the nodes
+evaluated since the last `start_rerun()`.
+
+    spec = GraphSpec({"price": 30.0, "volume": 10000})
+
+    @spec.derived
+    def revenue(price, volume):
+        return price * volume
+
+    graph = DependencyGraph(spec)
+    graph["revenue"]; graph.set_inputs(price=32.0); graph["revenue"]
+"""
+
+import inspect
+
+
+class GraphSpec:
+    """Inputs with defaults plus derived nodes, defined in dependency order (so no cycles)."""
+
+    def __init__(self, inputs):
+        self.inputs = dict(inputs)
+        self.nodes = {}
+        self._dependents = {name: [] for name in self.inputs}
+        self._downstream = {}
+
+    def derived(self, func):
+        """Register `func` as a node named after it; its parameters name its dependencies."""
+        name = func.__name__
+        deps = tuple(inspect.signature(func).parameters)
+        if name in self._dependents:
+            raise ValueError(f"node {name!r} is already defined")
+        unknown = [d for d in deps if d not in self._dependents]
+        if unknown:
+            raise KeyError(f"node {name!r} depends on undefined {', '.join(unknown)}")
+        self.nodes[name] = (func, deps)
+        self._dependents[name] = []
+        for dep in deps:
+            self._dependents[dep].append(name)
+        self._downstream.clear()
+        return func
+
+    def downstream(self, name):
+        """Every node that (transitively) depends on `name`."""
+        if name not in self._downstream:
+            seen, stack = set(), list(self._dependents[name])
+            while stack:
+                node = stack.pop()
+                if node not in seen:
+                    seen.add(node)
+                    stack.extend(self._dependents[node])
+            self._downstream[name] = frozenset(seen)
+        return self._downstream[name]
+
+    def upstream(self, name):
+        """Inputs and nodes `name` depends on (transitively)."""
+        seen, stack = set(), list(self.nodes.get(name, (None, ()))[1])
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(self.nodes.get(dep, (None, ()))[1])
+        return seen
+
+
+class DependencyGraph:
+    """Current values of a GraphSpec: lazy, memoized, invalidated per changed input."""
+
+    def __init__(self, spec, **inputs):
+        self.spec = spec
+        self._inputs = dict(spec.inputs)
+        self._values = {}
+        self.recomputed = []
+        self.set_inputs(**inputs)
+
+    def set_inputs(self, **changes):
+        """Update inputs; nodes downstream of the ones that actually changed are dropped. Returns the changed names."""
+        changed = []
+        for name, value in changes.items():
+            if name not in self._inputs:
+                raise KeyError(f"unknown input {name!r}")
+            if self._inputs[name] != value:
+                self._inputs[name] = value
+                changed.append(name)
+        for name in changed:
+            for node in self.spec.downstream(name):
+                self._values.pop(node, None)
+        return changed
+
+    def __getitem__(self, name):
+        if name in self._inputs:
+            return self._inputs[name]
+        if name in self._values:
+            return self._values[name]
+        func, deps = self.spec.nodes[name]
+        value = func(*(self[dep] for dep in deps))
+        self._values[name] = value
+        self.recomputed.append(name)
+        return value
+
+    def get(self, *names):
+        """Values of several nodes / inputs as a dict."""
+        return {name: self[name] for name in names}
+
+    def is_cached(self, name):
+        return name in self._inputs or name in self._values
+
+    def start_rerun(self):
+        """Reset the `recomputed` log (call once at the top of every script run)."""
+        self.recomputed = []
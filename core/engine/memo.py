@@ -0,0 +1,182 @@
+# core/engine/memo.py
+"""
+Process-wide memoization for the pure engine calculations.
+Streamlit reruns the whole script on every interaction, so identical inputs are
+recomputed constantly; `memoize` keeps a bounded LRU with TTL per function and
+counts hits / misses / evictions for monitoring via `cache_stats()`.
+"""
+
+import copy
+import hashlib
+import inspect
+import math
+import threading
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+from core.baseline import Baseline
+from core.telemetry import track_compute
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 900.0          # seconds
+MAX_KEY_ARRAY_SIZE = 4096    # larger array inputs bypass the cache (batch / grid calls)
+
+_REGISTRY = {}
+_LOCAL = threading.local()
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes, np.generic, Baseline)  # hashable as-is
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _normalize(value):
+    """Hashable, type-stable key for an argument; raises _Uncacheable for unsupported inputs."""
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return "nan" if math.isnan(value) else value
+    if isinstance(value, (np.integer, np.bool_)):
+        return value.item()
+    if isinstance(value, _IMMUTABLE):
+        return value
+    if isinstance(value, types.FunctionType):
+        if "<" in value.__qualname__:  # lambdas / closures are re-created on every rerun
+            raise _Uncacheable
+        return ("function", value.__module__, value.__qualname__)
+    if isinstance(value, np.ndarray):
+        if value.ndim == 0:
+            return _normalize(value[()])
+        if value.size > MAX_KEY_ARRAY_SIZE or value.dtype.hasobject:
+            raise _Uncacheable
+        data = np.ascontiguousarray(value)
+        return ("ndarray", data.dtype.str, data.shape, hashlib.blake2b(data.tobytes(), digest_size=16).digest())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple(sorted((str(k), _normalize(v)) for k, v in value.items()))
+    raise _Uncacheable
+
+
+def _is_immutable(value):
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE)
+
+
+class MemoCache:
+    """Thread-safe LRU + TTL store with monitoring counters."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.bypasses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stamp, value = entry
+                if self.ttl is None or time.monotonic() - stamp <= self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "bypasses": self.bypasses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def memoize(func=None, *, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, copy_results=True):
+    """
+    Cache a pure function on its normalized, signature-bound arguments.
+    Mutable results (dicts, arrays, frames) are handed out as deep copies so callers
+    can never corrupt a cached value; pass `copy_results=False` for results that are
+    only ever read. Usable as `@memoize` or `@memoize(maxsize=..., ttl=...)`.
+    """
+    if func is None:
+        return lambda f: memoize(f, maxsize=maxsize, ttl=ttl, copy_results=copy_results)
+
+    signature = inspect.signature(func)
+    cache = MemoCache(maxsize, ttl)
+
+    @track_compute
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_LOCAL, "bypass", 0):
+            with cache._lock:
+                cache.bypasses += 1
+            return func(*args, **kwargs)
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = _normalize(tuple(bound.arguments.items()))
+        except (_Uncacheable, TypeError):
+            with cache._lock:
+                cache.bypasses += 1
+            return func(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if not found:
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+        return value if not copy_results or _is_immutable(value) else copy.deepcopy(value)
+
+    wrapper.__wrapped__ = func  # solvers call the raw function, skipping cache and timing
+    wrapper.cache = cache
+    wrapper.cache_clear = cache.clear
+    _REGISTRY[f"{func.__module__}.{func.__qualname__}"] = cache
+    return wrapper
+
+
+@contextmanager
+def uncached():
+    """Skip every memo cache on this thread inside the block (e.g. solver iterates that are never reused)."""
+    _LOCAL.bypass = getattr(_LOCAL, "bypass", 0) + 1
+    try:
+        yield
+    finally:
+        _LOCAL.bypass -= 1
+
+
+def cache_stats():
+    """Counters of every memoized function, keyed by qualified name."""
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+
+def clear_caches():
+    for cache in _REGISTRY.values():
+        cache.clear()
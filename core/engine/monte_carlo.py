@@ -0,0 +1,174 @@
+# core/engine/monte_carlo.py
+"""
+Stage 5: Monte Carlo Stress Test
+Seeded joint shocks to volume, price, costs and working-capital days,
+evaluated in fixed-size chunks. Each chunk is folded into a fixed-bin
+histogram (per-bin counts and sums), so memory stays flat whatever the
+draw count while loss probability, mean and CVaR sums remain exact and
+quantiles are resolved to one bin width.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array
+from core.engine.cash_cycle import working_capital
+from core.engine.memo import memoize
+
+# Annual volatility of each driver as a lognormal multiplier (mean 1)
+DEFAULT_VOLATILITY = {
+    "volume": 0.15,
+    "price": 0.05,
+    "variable_cost": 0.10,
+    "fixed_cost": 0.05,
+    "ar_days": 0.20,
+    "inventory_days": 0.20,
+    "payables_days": 0.10,
+}
+SHOCK_KEYS = tuple(DEFAULT_VOLATILITY)
+
+DEFAULT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+HISTOGRAM_BINS = 8192
+
+
+def stress_draws(baseline, multipliers, dead_stock_pct=None):
+    """
+    Stressed profit and liquidity gap for arrays of shock multipliers.
+    `multipliers` maps SHOCK_KEYS to arrays (missing keys = no shock). The annual
+    burn is the shocked fixed cost plus debt service (debt x interest_rate); the
+    inventory carrying cost of the stressed cycle is charged against profit.
+    `dead_stock_pct` defaults to the baseline's own share (0 if it has none).
+    """
+    if dead_stock_pct is None:
+        dead_stock_pct = baseline.get("dead_stock_pct", 0.0)
+    shocked = {key: as_array(baseline[key]) * as_array(multipliers.get(key, 1.0)) for key in SHOCK_KEYS}
+    wc = working_capital(shocked["price"], shocked["volume"], shocked["variable_cost"], shocked["inventory_days"],
+                         shocked["ar_days"], shocked["payables_days"], dead_stock_pct=dead_stock_pct)
+    debt_service = as_array(baseline.get("debt", 0.0)) * as_array(baseline.get("interest_rate", 0.0))
+    profit = ((shocked["price"] - shocked["variable_cost"]) * shocked["volume"]
+              - shocked["fixed_cost"] - debt_service - wc["liquidity_drain"])
+    return profit, wc["liquidity_gap"]
+
+
+def draw_multipliers(rng, n, volatility, correlation=None):
+    """Correlated lognormal multipliers with mean 1, one column per SHOCK_KEYS entry."""
+    sigma = as_array([volatility.get(key, 0.0) for key in SHOCK_KEYS])
+    z = rng.standard_normal((n, len(SHOCK_KEYS)))
+    if correlation is not None:
+        z = z @ np.linalg.cholesky(as_array(correlation)).T
+    m = np.exp(sigma * z - sigma ** 2 / 2)
+    return {key: m[:, i] for i, key in enumerate(SHOCK_KEYS)}
+
+
+class StreamingDistribution:
+    """Fixed-memory summary of a stream of samples (counts and sums per bin)."""
+
+    def __init__(self, lo, hi, bins=HISTOGRAM_BINS):
+        if not hi > lo:
+            lo, hi = lo - 1.0, hi + 1.0
+        self.lo, self.hi, self.bins = float(lo), float(hi), bins
+        self.width = (self.hi - self.lo) / bins
+        self.counts = np.zeros(bins)
+        self.sums = np.zeros(bins)
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.below_zero = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, x):
+        x = np.asarray(x, dtype=float).ravel()
+        idx = np.clip(((x - self.lo) / self.width).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(idx, minlength=self.bins)
+        self.sums += np.bincount(idx, weights=x, minlength=self.bins)
+        self.n += x.size
+        self.total += x.sum()
+        self.total_sq += np.square(x).sum()
+        self.below_zero += int((x < 0).sum())
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+
+    def _edges(self):
+        edges = self.lo + self.width * np.arange(self.bins + 1)
+        # Edge bins also hold the clamped outliers: stretch them to the observed extremes
+        edges[0], edges[-1] = min(edges[0], self.min), max(edges[-1], self.max)
+        return edges
+
+    def quantile(self, q):
+        """Quantile(s) for q in [0, 1], linearly interpolated inside the bin."""
+        q = as_array(q)
+        cum = np.cumsum(self.counts)
+        target = q * self.n
+        b = np.clip(np.searchsorted(cum, target, side="left"), 0, self.bins - 1)
+        before = np.where(b > 0, cum[b - 1], 0.0)
+        frac = np.divide(target - before, self.counts[b], out=np.zeros_like(target), where=self.counts[b] > 0)
+        edges = self._edges()
+        return edges[b] + np.clip(frac, 0, 1) * (edges[b + 1] - edges[b])
+
+    def tail_mean(self, q):
+        """Mean of the lowest q share of samples (expected shortfall region)."""
+        cum = np.cumsum(self.counts)
+        target = q * self.n
+        b = int(np.clip(np.searchsorted(cum, target, side="left"), 0, self.bins - 1))
+        before = cum[b - 1] if b > 0 else 0.0
+        take = target - before
+        partial = self.sums[b] * take / self.counts[b] if self.counts[b] > 0 else 0.0
+        return (self.sums[:b].sum() + partial) / target if target > 0 else np.nan
+
+    @property
+    def mean(self):
+        return self.total / self.n
+
+    @property
+    def std(self):
+        return np.sqrt(max(self.total_sq / self.n - self.mean ** 2, 0.0))
+
+
+@memoize(maxsize=32)
+def simulate_stress(baseline, draws=1_000_000, volatility=None, correlation=None, seed=0,
+                    chunk_size=250_000, confidence=0.95, percentiles=DEFAULT_PERCENTILES, dead_stock_pct=None):
+    """
+    Monte Carlo distribution of annual profit and liquidity gap for one baseline.
+    `correlation` is an optional len(SHOCK_KEYS) square matrix over the drivers;
+    `dead_stock_pct` overrides the baseline's Stage 2 share (see `stress_draws`).
+    Returns probability of loss, VaR / CVaR of profit at `confidence` (as positive
+    losses) and percentiles of both outcomes.
+    """
+    volatility = {**DEFAULT_VOLATILITY, **(volatility or {})}
+    rng = np.random.default_rng(seed)
+    chunk_size = max(1, min(int(chunk_size), int(draws)))
+
+    profit_dist = gap_dist = None
+    remaining = int(draws)
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        profit, gap = stress_draws(baseline, draw_multipliers(rng, n, volatility, correlation), dead_stock_pct)
+        if profit_dist is None:
+            # Histogram range from the first chunk, padded for unseen tails
+            profit_dist = _padded_distribution(profit)
+            gap_dist = _padded_distribution(gap)
+        profit_dist.add(profit)
+        gap_dist.add(gap)
+        remaining -= n
+
+    tail = 1 - confidence
+    var_level = profit_dist.quantile(tail)
+    q = as_array(percentiles) / 100
+    return {
+        "draws": profit_dist.n,
+        "prob_loss": profit_dist.below_zero / profit_dist.n,
+        "expected_profit": profit_dist.mean,
+        "profit_std": profit_dist.std,
+        "var": float(-var_level),
+        "cvar": float(-profit_dist.tail_mean(tail)),
+        "profit_percentiles": dict(zip(percentiles, profit_dist.quantile(q))),
+        "expected_gap": gap_dist.mean,
+        "gap_percentiles": dict(zip(percentiles, gap_dist.quantile(q))),
+        "profit_histogram": (profit_dist.counts, profit_dist._edges()),
+    }
+
+
+def _padded_distribution(sample):
+    lo, hi = float(np.min(sample)), float(np.max(sample))
+    pad = (hi - lo) or max(abs(lo), 1.0)
+    return StreamingDistribution(lo - pad, hi + pad)
@@ -0,0 +1,88 @@
+# core/engine/path.py
+"""
+The 5-Stage Path evaluated in one pass.
+Takes baseline columns (scalars or equal-length arrays) and returns every
+stage KPI as an array, so thousands of baselines cost one vectorized call.
+"""
+
+from core.baseline import STAGE_DEFAULTS
+from core.engine.arrays import as_array
+from core.engine.break_even import break_even, contribution_margin
+from core.engine.cash_cycle import working_capital
+from core.engine.clv import clv_grid, payback_months, retention_weighted_margin
+from core.engine.memo import memoize
+from core.engine.stress import stressed_profit
+from core.engine.sustainability import sustainability
+
+# Stage inputs that are not baseline pillars: the defaults of the path widgets
+PATH_ASSUMPTIONS = {
+    "dead_stock_pct": STAGE_DEFAULTS["dead_stock_pct"],  # Stage 2: non-moving share of inventory
+    "purchases_per_year": 4.0,    # Stage 3
+    "retention_discount": 0.05,
+    "cac": 150.0,
+    "clv_discount_rate": 0.10,
+    "clv_horizon": 5,
+    "sales_drop": 0.20,           # Stage 5 stress test
+    "cost_increase": 0.10,
+}
+
+
+@memoize
+def evaluate_path(baseline, **assumptions):
+    """
+    Stage 1-5 KPIs for one or many baselines.
+    `baseline` maps the core/baseline.py keys to scalars or arrays (a DataFrame works).
+    Debt service is taken as debt x interest_rate, and churn as 1 - retention_rate.
+    Keyword arguments override PATH_ASSUMPTIONS; a `dead_stock_pct` key in
+    `baseline` (a saved Baseline carries one) is used unless overridden.
+    """
+    a = {**PATH_ASSUMPTIONS, **assumptions}
+    if "dead_stock_pct" not in assumptions and "dead_stock_pct" in baseline:
+        a["dead_stock_pct"] = baseline["dead_stock_pct"]
+
+    price = as_array(baseline["price"])
+    volume = as_array(baseline["volume"])
+    vc = as_array(baseline["variable_cost"])
+    fc = as_array(baseline["fixed_cost"])
+    debt_service = as_array(baseline["debt"]) * as_array(baseline["interest_rate"])
+
+    # Stage 1: Break-Even
+    be = break_even(price, vc, volume, fc)
+
+    # Stage 2: Cash Conversion Cycle
+    wc = working_capital(price, volume, vc, baseline["inventory_days"], baseline["ar_days"],
+                         baseline["payables_days"], dead_stock_pct=a["dead_stock_pct"])
+
+    # Stage 3: Unit Economics & CLV
+    annual_margin, repeat_margin = retention_weighted_margin(price, vc, a["purchases_per_year"], a["retention_discount"])
+    churn = 1 - as_array(baseline["retention_rate"])
+    clv = clv_grid(annual_margin, churn, a["clv_discount_rate"], a["clv_horizon"], cac=a["cac"], survival_lag=1)
+
+    # Stage 4: Sustainability
+    sus = sustainability(price, vc, volume, fc, debt_service, wc["liquidity_drain"])
+
+    # Stage 5: Stress Test (own fixed costs + debt service as the annual burn)
+    stressed = stressed_profit(price, vc, volume, a["sales_drop"], a["cost_increase"],
+                               annual_burn=fc + debt_service, liquidity_drain=wc["liquidity_drain"])
+
+    return {
+        "revenue": be["revenue"],
+        "contribution_margin": contribution_margin(price, vc),
+        "be_units": be["be_units"],
+        "be_revenue": be["be_revenue"],
+        "safety_margin": be["safety_margin"],
+        "ccc": wc["ccc"],
+        "working_capital_req": wc["liquidity_gap"],
+        "dead_stock_funding": wc["dead_stock_funding"],
+        "liquidity_drain": wc["liquidity_drain"],
+        "annual_customer_margin": annual_margin,
+        "repeat_margin": repeat_margin,
+        "clv_npv": clv["clv"],
+        "ltv_cac": clv["ltv_cac"],
+        "clv_payback_year": clv["payback_year"],
+        "cac_payback_months": payback_months(a["cac"], annual_margin),
+        "ebit": sus["ebit"],
+        "structural_be_units": sus["be_units"],
+        "net_profit": sus["net_profit"],
+        "stressed_profit": stressed,
+    }
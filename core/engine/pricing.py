@@ -0,0 +1,90 @@
+# core/engine/pricing.py
+"""
+Pricing Power: structural score from margin, substitution, elasticity and concentration.
+Inputs broadcast, so a whole product catalog scores and classifies in one pass.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+from core.engine.memo import memoize
+from core.engine.operations import top_n
+
+# Score bands (lower edges of classes 1..3) and the class each band maps to
+POWER_BANDS = (30, 55, 75)
+POWER_CLASSES = (
+    ("Weak Pricing Power", "🔴"),
+    ("Defensive Structure", "🟠"),
+    ("Strong Position", "🟢"),
+    ("Dominant Pricing Power", "🏆"),
+)
+
+
+def normalize(value, min_val, max_val):
+    if max_val - min_val == 0:
+        return 0
+    return (value - min_val) / (max_val - min_val)
+
+
+@memoize
+def calculate_pricing_power_score(margin, substitution, elasticity, concentration):
+
+    # Margin strength (higher = better)
+    margin_score = normalize(margin, 0, 0.8)
+
+    # Substitution exposure (lower = better)
+    substitution_score = 1 - normalize(substitution, 0, 1)
+
+    # Elasticity fragility (lower elasticity = stronger power)
+    elasticity_score = 1 - normalize(elasticity, 0, 3)
+
+    # Revenue concentration risk (lower = better)
+    concentration_score = 1 - normalize(concentration, 0, 1)
+
+    final_score = (
+        margin_score * 0.35 +
+        substitution_score * 0.25 +
+        elasticity_score * 0.25 +
+        concentration_score * 0.15
+    )
+
+    return unwrap(np.round(as_array(final_score) * 100, 1))
+
+
+def power_class(score):
+    """Index into POWER_CLASSES for each score (array binning on POWER_BANDS); -1 for NaN."""
+    score = as_array(score)
+    return unwrap(np.where(np.isnan(score), -1, np.digitize(score, POWER_BANDS)))
+
+
+def classify_power(score):
+    return POWER_CLASSES[int(power_class(score))]
+
+
+def score_portfolio(margin, substitution, elasticity, concentration, weakest=20):
+    """
+    Pricing power of a whole catalog: one vectorized score per product, its class,
+    the class distribution and the `weakest` products (lowest scores first).
+    Products with a missing input score NaN and are left out of the counts.
+    """
+    scores = as_array(calculate_pricing_power_score(as_array(margin), as_array(substitution),
+                                                    as_array(elasticity), as_array(concentration))).ravel()
+    classes = as_array(power_class(scores)).astype(int).ravel()
+    valid = classes >= 0
+    counts = np.bincount(classes[valid], minlength=len(POWER_CLASSES))
+    ranked = np.flatnonzero(valid)
+    return {
+        "score": scores,
+        "class": classes,
+        "counts": counts,
+        "share": counts / max(int(valid.sum()), 1),
+        "mean": float(scores[valid].mean()) if valid.any() else np.nan,
+        "median": float(np.median(scores[valid])) if valid.any() else np.nan,
+        "weakest": ranked[top_n(-scores[valid], weakest)],
+    }
+
+
+def required_sales_increase(price_red_pct, contribution_margin):
+    if contribution_margin <= 0:
+        return 0.0
+    return (price_red_pct / contribution_margin) * 100
@@ -0,0 +1,77 @@
+# core/engine/qspm.py
+"""
+Quantitative Strategic Planning Matrix (QSPM)
+Weights (M factors) x attractiveness scores (M factors x N strategies).
+Totals are one weights @ scores product, so any number of strategies, factors
+and (sampled) weight vectors evaluate in a single call.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+from core.engine.memo import memoize
+
+DEFAULT_SAMPLES = 100_000
+DEFAULT_CONCENTRATION = 50.0   # Dirichlet concentration: higher = weights held closer to the user's
+
+
+def weighted_scores(weights, scores):
+    """Total Attractiveness Scores per factor and strategy, shape (M, N)."""
+    return unwrap(as_array(weights)[:, None] * as_array(scores))
+
+
+def qspm_totals(weights, scores):
+    """Sum of Total Attractiveness Scores per strategy, shape (N,) — or (K, N) for K weight vectors."""
+    return unwrap(as_array(weights) @ as_array(scores))
+
+
+def normalize_weights(weights):
+    """Weights rescaled to sum to 1 (negative weights count as 0)."""
+    w = np.clip(as_array(weights), 0.0, None)
+    total = w.sum()
+    if total <= 0:
+        raise ValueError("at least one factor weight must be positive")
+    return w / total
+
+
+def rank_order(weights, scores):
+    """Strategy indices from highest to lowest total (ties keep the input order)."""
+    return np.argsort(-as_array(qspm_totals(weights, scores)), kind="stable")
+
+
+@memoize(maxsize=32)
+def weight_robustness(weights, scores, samples=DEFAULT_SAMPLES, concentration=DEFAULT_CONCENTRATION, seed=42):
+    """
+    How often each strategy ranks first when the weights are uncertain.
+    Draws `samples` weight vectors from Dirichlet(concentration x normalized weights),
+    so the draws average to the user's weights and zero-weight factors stay at zero,
+    then scores all of them in one (samples, M) @ (M, N) product. `win_share` counts
+    outright wins only (draws with a tied lead are reported as `tie_share`); in
+    `rank_share` ties go to the earlier strategy.
+    Returns {"win_share": (N,), "tie_share", "rank_share": (N, N) [strategy, rank],
+    "mean": (N,), "p05": (N,), "p95": (N,), "samples"}.
+    """
+    w = normalize_weights(weights)
+    scores = as_array(scores)
+    n_strategies = scores.shape[1]
+
+    # Dirichlet draws as normalized gammas (vectorized, and shape 0 gives exact zeros)
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_gamma(concentration * w, size=(samples, w.size))
+    draws /= draws.sum(axis=1, keepdims=True)
+    totals = draws @ scores
+
+    order = np.argsort(-totals, axis=1, kind="stable")
+    rank_share = np.stack([np.bincount(order[:, r], minlength=n_strategies) for r in range(n_strategies)], axis=1) / samples
+    leaders = (np.max(totals, axis=1, keepdims=True) - totals <= 1e-12).sum(axis=1)
+    win_share = np.bincount(order[leaders == 1, 0], minlength=n_strategies) / samples
+    p05, p95 = np.percentile(totals, [5, 95], axis=0)
+    return {
+        "win_share": win_share,
+        "tie_share": float(np.mean(leaders > 1)),
+        "rank_share": rank_share,
+        "mean": totals.mean(axis=0),
+        "p05": p05,
+        "p95": p95,
+        "samples": samples,
+    }
@@ -0,0 +1,104 @@
+# core/engine/solver.py
+"""
+Vectorized root finding for threshold questions ("at what value does A equal B?").
+Every scenario in the batch is solved simultaneously: one function call per iteration
+(two for Newton, which adds a finite-difference slope).
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+
+
+def bisect(f, lo, hi, tol=1e-10, max_iter=200):
+    """
+    Bracketed bisection on f(x) = 0 for arrays of independent problems.
+    `f` must accept and return arrays broadcastable to lo/hi. Scenarios whose
+    bracket does not contain a sign change return NaN.
+    Returns (root, converged) arrays.
+    """
+    lo, hi = as_array(lo), as_array(hi)
+    # Scenario shape comes from f: scalar brackets broadcast against it
+    lo, hi, f_lo, f_hi = (x.copy() for x in np.broadcast_arrays(lo, hi, as_array(f(lo)), as_array(f(hi))))
+
+    bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+    root = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, np.nan))
+    active = bracketed & np.isnan(root)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        mid = (lo + hi) / 2
+        f_mid = np.broadcast_to(as_array(f(mid)), lo.shape)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(active & left, mid, lo)
+        f_lo = np.where(active & left, f_mid, f_lo)
+        hi = np.where(active & ~left, mid, hi)
+        active &= (hi - lo) > tol
+
+    root = np.where(np.isnan(root) & bracketed, (lo + hi) / 2, root)
+    converged = bracketed & ~active
+    return unwrap(root), unwrap(converged)
+
+
+def solve(f, lo, hi, x0=None, method="newton", tol=1e-10, ftol=0.0, max_iter=100, step=1e-7):
+    """
+    Safeguarded root finding on f(x) = 0 with per-scenario diagnostics.
+    method="newton" takes finite-difference Newton steps and falls back to
+    bisection whenever a step leaves the current bracket; method="bisect" always
+    halves. Every scenario keeps its own bracket, so the result is never worse
+    than plain bisection. Scenarios without a sign change in [lo, hi] return NaN.
+    Returns {"root", "converged", "bracketed", "iterations", "residual", "evaluations"}.
+    """
+    if method not in ("newton", "bisect"):
+        raise ValueError(f"unknown method {method!r}")
+    lo, hi = as_array(lo), as_array(hi)
+    lo, hi, f_lo, f_hi = (x.copy() for x in np.broadcast_arrays(lo, hi, as_array(f(lo)), as_array(f(hi))))
+    evaluations = 2
+
+    bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+    x = (lo + hi) / 2 if x0 is None else np.clip(np.broadcast_to(as_array(x0), lo.shape), np.minimum(lo, hi), np.maximum(lo, hi))
+    x = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, x))
+    active = bracketed & (f_lo != 0) & (f_hi != 0)
+    iterations = np.zeros(lo.shape, dtype=int)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        fx = np.broadcast_to(as_array(f(x)), lo.shape)
+        evaluations += 1
+        iterations += active
+        hit = np.abs(fx) <= ftol
+
+        left = np.sign(fx) == np.sign(f_lo)
+        lo = np.where(active & left, x, lo)
+        f_lo = np.where(active & left, fx, f_lo)
+        hi = np.where(active & ~left, x, hi)
+        mid = (lo + hi) / 2
+
+        if method == "newton":
+            h = step * np.maximum(np.abs(x), 1.0)
+            slope = (np.broadcast_to(as_array(f(x + h)), lo.shape) - fx) / h
+            evaluations += 1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                candidate = x - fx / slope
+            inside = np.isfinite(candidate) & ((candidate - lo) * (candidate - hi) < 0)
+            nxt = np.where(inside, candidate, mid)
+            small_step = inside & (np.abs(nxt - x) <= tol * np.maximum(np.abs(x), 1.0))
+        else:
+            nxt, small_step = mid, False
+
+        x = np.where(active & ~hit, nxt, x)
+        active &= ~(hit | small_step | (np.abs(hi - lo) <= tol))
+
+    root = np.where(bracketed, x, np.nan)
+    with np.errstate(all="ignore"):
+        residual = np.broadcast_to(as_array(f(root)), lo.shape)
+    return {
+        "root": unwrap(root),
+        "converged": unwrap(bracketed & ~active),
+        "bracketed": unwrap(bracketed),
+        "iterations": unwrap(iterations),
+        "residual": unwrap(residual),
+        "evaluations": evaluations + 1,
+    }
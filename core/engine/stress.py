@@ -0,0 +1,39 @@
+# core/engine/stress.py
+"""
+Stage 5: Stress Testing & Resilience
+Shock propagation into profit, liquidity runway and balance-sheet ratios.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, divide_positive, unwrap
+
+# Standard baseline used by Stage 5: 7.000 €/month fixed costs + 12.000 € debt service
+STANDARD_ANNUAL_BURN = (7000.0 * 12) + 12000.0
+
+
+def stressed_profit(price, variable_cost, volume, sales_drop, cost_increase,
+                    annual_burn=STANDARD_ANNUAL_BURN, liquidity_drain=0.0):
+    """Annual profit after a volume drop and a variable-cost increase (both as shares)."""
+    stressed_q = as_array(volume) * (1 - as_array(sales_drop))
+    stressed_vc = as_array(variable_cost) * (1 + as_array(cost_increase))
+    profit = ((as_array(price) - stressed_vc) * stressed_q) - as_array(annual_burn) - as_array(liquidity_drain)
+    return unwrap(profit)
+
+
+def survival_days(liquidity, fixed_cost):
+    """Days the business survives on `liquidity` if all inflows stop (inf with no burn)."""
+    daily_burn_rate = as_array(fixed_cost) / 365
+    return divide_positive(liquidity, daily_burn_rate, fill=np.inf)
+
+
+def analyze_resilience(profit, assets, current_assets, current_liabilities):
+    """Return on assets (%) and current ratio, rounded to 2 decimals."""
+    roa = divide_positive(profit, assets) * 100
+    current_ratio = divide_positive(current_assets, current_liabilities)
+    return unwrap(np.round(roa, 2)), unwrap(np.round(current_ratio, 2))
+
+
+def shocked_current_ratio(current_assets, current_liabilities, shock_pct):
+    """Current ratio after a sudden cash shock on current assets (shock as a share)."""
+    return divide_positive(as_array(current_assets) * (1 - as_array(shock_pct)), current_liabilities)
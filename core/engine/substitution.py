@@ -0,0 +1,66 @@
+# core/engine/substitution.py
+"""
+Substitution: volume drop a price increase can absorb when part of the lost
+demand is recaptured by the company's own substitutes.
+The matrix form takes a whole portfolio with an N x N diversion matrix, so
+every product (and every price scenario) is evaluated in one pass.
+"""
+
+import numpy as np
+
+from core.engine.arrays import as_array, unwrap
+
+
+def calculate_max_drop(old_price, price_inc_pct, profit_A, profit_B, profit_C, profit_D, pB, pC, pD):
+    """Max tolerable volume drop (%) for product A; inputs broadcast (one element per scenario), 0 where undefined."""
+    old_price, price_inc_pct, profit_A, profit_B, profit_C, profit_D, pB, pC, pD = map(
+        as_array, (old_price, price_inc_pct, profit_A, profit_B, profit_C, profit_D, pB, pC, pD))
+    # Weighted profit from customers who switch
+    weighted_sub_profit = (pB * profit_B + pC * profit_C + pD * profit_D)
+
+    numerator = -price_inc_pct
+    # Strategic Formula: Maintenance of total profit including substitution recovery
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = ((profit_A - weighted_sub_profit) / old_price) + price_inc_pct
+
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=np.isfinite(denominator) & (denominator != 0))
+    return unwrap(out * 100)
+
+
+def diversion_leakage(diversion):
+    """Share of each product's lost volume that leaves the portfolio: 1 - row sum of the diversion matrix."""
+    return unwrap(1.0 - as_array(diversion).sum(axis=-1))
+
+
+def max_drop_matrix(price, profit, price_increase, diversion):
+    """
+    Maximum tolerable volume drop (%, negative) for every own product at once.
+    `diversion[i, j]` is the share of product i's lost volume recaptured by own product j
+    (rows sum to at most 1; the rest leaks to competitors). `price_increase` is a vector of
+    fractional increases, shape (N,), or a stack of scenarios, shape (S, N); recaptured
+    customers earn the destination's margin after its own increase. Generalizes
+    `calculate_max_drop` (one product with three substitutes, only A repriced) to
+    w_i = sum_j D_ij (m_j + r_j p_j), drop_i = r_i p_i / (m_i + r_i p_i - w_i).
+    Products whose recapture matches or beats their own new margin can lose all volume (-100).
+    """
+    price, profit, increase, diversion = map(as_array, (price, profit, price_increase, diversion))
+    gain = increase * price
+    new_margin = profit + gain
+    headroom = new_margin - new_margin @ diversion.T
+    drop = np.ones(np.broadcast(gain, headroom).shape)
+    np.divide(gain, headroom, out=drop, where=headroom > 0)
+    return unwrap(-np.minimum(drop, 1.0) * 100)
+
+
+def portfolio_profit_change(price, profit, volume, price_increase, volume_drop, diversion):
+    """
+    Portfolio profit change when every product i is repriced by `price_increase[i]` and loses
+    `volume_drop[i]` (fraction) of its volume, with the lost volume redistributed through the
+    diversion matrix. Returns (total change, new volume per product); leading scenario axes broadcast.
+    """
+    price, profit, volume, increase, drop, diversion = map(as_array, (price, profit, volume, price_increase, volume_drop, diversion))
+    lost = drop * volume
+    new_volume = volume - lost + lost @ diversion
+    change = np.sum((profit + increase * price) * new_volume - profit * volume, axis=-1)
+    return unwrap(change), unwrap(new_volume)
@@ -0,0 +1,51 @@
+# core/engine/sustainability.py
+"""
+Stage 4: Sustainability & Structural Break-Even
+Annual obligations, debt service and the slow-stock penalty.
+"""
+
+from core.engine.arrays import as_array, divide_positive, unwrap
+from core.engine.memo import memoize
+
+
+@memoize
+def operating_summary(price, volume, variable_cost, fixed_cost, debt, interest_rate):
+    """Revenue, EBIT, post-interest profit and contribution margin of a baseline."""
+    price = as_array(price)
+    volume = as_array(volume)
+    unit_margin = price - as_array(variable_cost)
+    ebit = (unit_margin * volume) - as_array(fixed_cost)
+
+    return {
+        "revenue": unwrap(price * volume),
+        "ebit": unwrap(ebit),
+        "net_profit": unwrap(ebit - (as_array(debt) * as_array(interest_rate))),
+        "margin": divide_positive(unit_margin, price),
+    }
+
+
+@memoize
+def sustainability(price, variable_cost, volume, fixed_costs, debt_service, liquidity_drain=0.0):
+    """
+    Structural break-even including debt service.
+    `fixed_costs` are annual operating obligations excluding debt;
+    `liquidity_drain` is the annual inventory carrying cost from Stage 2.
+    """
+    price = as_array(price)
+    volume = as_array(volume)
+    debt_service = as_array(debt_service)
+    unit_margin = price - as_array(variable_cost)
+
+    ebit = (unit_margin * volume) - as_array(fixed_costs)
+    total_obligations = as_array(fixed_costs) + debt_service
+    be_units = divide_positive(total_obligations, unit_margin)
+
+    return {
+        "unit_margin": unwrap(unit_margin),
+        "annual_revenue": unwrap(price * volume),
+        "ebit": unwrap(ebit),
+        "total_obligations": unwrap(total_obligations),
+        "be_units": be_units,
+        "units_above_break_even": unwrap(volume - be_units),
+        "net_profit": unwrap(ebit - debt_service - as_array(liquidity_drain)),
+    }
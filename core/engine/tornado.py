@@ -0,0 +1,46 @@
+# core/engine/tornado.py
+"""
+Tornado sensitivity: every baseline parameter moved down / up by the same
+percentage, every path KPI evaluated for all perturbations in one batch.
+"""
+
+import numpy as np
+
+from core.baseline import BASELINE_KEYS, BOUNDED_PARAMS
+from core.engine.memo import memoize
+from core.engine.path import evaluate_path
+
+
+@memoize(maxsize=64)
+def tornado(baseline, pct=0.10, params=BASELINE_KEYS, **assumptions):
+    """
+    Path KPIs with each of `params` scaled by (1 - pct) and (1 + pct), the rest at base.
+    Row 0 is the base case, rows 2i+1 / 2i+2 the low / high case of params[i]; the
+    2P+1 rows go through `evaluate_path` as one array batch.
+    Returns {"params", "pct", "base": {kpi: value}, "low": {kpi: (P,)}, "high": {kpi: (P,)}}.
+    """
+    params = tuple(params)
+    rows = 2 * len(params) + 1
+    columns = {key: np.full(rows, float(baseline[key])) for key in BASELINE_KEYS}
+    for i, key in enumerate(params):
+        columns[key][2 * i + 1] *= 1 - pct
+        columns[key][2 * i + 2] *= 1 + pct
+        if key in BOUNDED_PARAMS:
+            np.clip(columns[key], *BOUNDED_PARAMS[key], out=columns[key])
+
+    kpis = {k: np.broadcast_to(v, (rows,)) for k, v in evaluate_path.__wrapped__(columns, **assumptions).items()}
+    return {
+        "params": params,
+        "pct": pct,
+        "base": {k: v[0] for k, v in kpis.items()},
+        "low": {k: v[1::2].copy() for k, v in kpis.items()},
+        "high": {k: v[2::2].copy() for k, v in kpis.items()},
+    }
+
+
+def rank_by_swing(result, kpi):
+    """Parameter order (largest |high - low| first) and the swings for `kpi`."""
+    swing = np.abs(result["high"][kpi] - result["low"][kpi])
+    swing = np.where(np.isfinite(swing), swing, np.inf)
+    order = np.argsort(-swing, kind="stable")
+    return order, swing[order]
@@ -0,0 +1,372 @@
+# core/formatting.py
+"""
+Locale-aware number formatting and parsing for whole columns.
+
+Symbols and patterns come from babel (CLDR) and are resolved once per locale
+(`number_format`, cached). A column is formatted in one pass of NumPy
+arithmetic: every value is rounded to an integer of its last shown digit and
+its characters are written straight into a code-point matrix, which is then
+viewed as a string array. No Python formatting runs per cell, except for
+values that land on an exact rounding tie or exceed 2**53 (digits no longer
+exact), which are formatted with Python so the output always matches
+`f"{x:,.2f}"` digit for digit (NaN shows `na_rep`, infinities the
+locale's "∞").
+
+    format_numbers(df["Amount"], 2, locale="el_GR")      ->  ["1.234,50", ...]
+    format_percent(shares, 1)                            ->  ["12.5%", ...]
+    format_currency(costs, "EUR", 0, locale="de_DE")     ->  ["1.235 €", ...]
+    parse_numbers(["1.234,50", "-7"], locale="el_GR")    ->  [1234.5, -7.0]
+    format_frame(df, {"Amount": "{:,.0f} €", "Share": "{:.1%}"})   # display copy of df
+
+Scalars in, scalars out. MANAGERS_LAB_LOCALE sets the default locale.
+"""
+
+import math
+import numbers
+import os
+import re
+from functools import cached_property, lru_cache
+
+import numpy as np
+import pandas as pd
+from babel import Locale
+from babel import numbers as babel_numbers
+
+DEFAULT_LOCALE = os.environ.get("MANAGERS_LAB_LOCALE", "en_US")
+EXACT_LIMIT = 2.0 ** 53       # scaled magnitudes above this are formatted per cell
+MAX_DIGITS = 16               # integer digits below EXACT_LIMIT
+CHUNK_ROWS = 8192             # rows per code-point matrix (kept cache-sized)
+_POW10 = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+_OTHER, _IGNORED, _DIGIT, _POINT, _MINUS = range(5)      # character kinds for parsing
+_SPEC = re.compile(r"^(?P<prefix>[^{}]*)\{:(?P<sign>\+)?(?P<grouping>,)?\.(?P<decimals>\d+)(?P<type>[f%])\}(?P<suffix>[^{}]*)$")
+
+
+class Pattern:
+    """One compiled layout: affixes, decimals and where the group separators go."""
+
+    __slots__ = ("decimals", "scale", "prefix", "suffix", "decimal", "group", "grouping", "slots", "widths")
+
+    def __init__(self, decimals, scale, prefix, suffix, decimal, group, grouping):
+        self.decimals = decimals
+        self.scale = scale
+        self.prefix = prefix                # (positive, negative)
+        self.suffix = suffix
+        self.decimal = decimal if decimals else ""
+        self.group = group
+        self.grouping = grouping
+        # Integer part from the right: -1 is a digit slot, anything else a separator code point
+        primary, secondary = grouping or (0, 0)
+        slots, widths = [], []
+        for k in range(MAX_DIGITS):
+            if primary and k and (k == primary or (k > primary and (k - primary) % secondary == 0)):
+                slots.extend(ord(c) for c in reversed(group))
+            slots.append(-1)
+            widths.append(len(slots))
+        self.slots = slots
+        self.widths = np.array(widths)      # characters of an integer part with k + 1 digits
+
+    def render(self, value):
+        """Per-cell path (ties, huge values): Python's correctly rounded digits in this layout."""
+        whole, _, fraction = format(abs(value) * self.scale, f".{self.decimals}f").partition(".")
+        if self.grouping:
+            whole = _regroup(whole, self.group, *self.grouping)
+        negative = math.copysign(1.0, value) < 0
+        return self.prefix[negative] + whole + self.decimal + fraction + self.suffix[negative]
+
+
+def _regroup(digits, group, primary, secondary):
+    if len(digits) <= primary:
+        return digits
+    head, groups = digits[:-primary], [digits[-primary:]]
+    while len(head) > secondary:
+        head, groups = head[:-secondary], [head[-secondary:]] + groups
+    return group.join([head] + groups)
+
+
+class NumberFormat:
+    """Symbols and patterns of one locale, resolved once (see `number_format`)."""
+
+    def __init__(self, locale):
+        cldr = Locale.parse(locale)
+        self.locale = str(cldr)
+        symbols = cldr.number_symbols["latn"]           # digits are always written as 0-9
+        self.decimal = symbols["decimal"]
+        self.group = symbols["group"]
+        self.minus = symbols["minusSign"]
+        self.plus = symbols["plusSign"]
+        self.percent = symbols["percentSign"]
+        self.infinity = symbols["infinity"]
+        self.styles = {"decimal": cldr.decimal_formats[None], "percent": cldr.percent_formats[None],
+                       "currency": cldr.currency_formats["standard"]}
+        self._patterns = {}
+
+    def __repr__(self):
+        return f"NumberFormat({self.locale!r})"
+
+    def pattern(self, style="decimal", decimals=2, grouping=True, sign=False, currency=None, prefix="", suffix="",
+                ratio=True):
+        """Compiled `Pattern` for a CLDR style ("decimal", "percent", "currency"), built once per arguments.
+
+        `prefix` / `suffix` are literal text around the locale's own affixes
+        (the "€" of a Styler-style "{:,.0f} €" spec); `sign` shows "+" on positives;
+        `ratio=False` takes percent values as already multiplied by 100.
+        """
+        key = (style, decimals, grouping, sign, currency, prefix, suffix, ratio)
+        if key not in self._patterns:
+            cldr = self.styles[style]
+            symbol = babel_numbers.get_currency_symbol(currency, self.locale) if currency else ""
+
+            def affix(text):
+                return text.replace("-", self.minus).replace("%", self.percent).replace("¤", symbol).replace("'", "")
+
+            pos_prefix, neg_prefix = affix(cldr.prefix[0]), affix(cldr.prefix[1])
+            pos_suffix, neg_suffix = affix(cldr.suffix[0]), affix(cldr.suffix[1])
+            if (neg_prefix, neg_suffix) == (pos_prefix, pos_suffix):
+                neg_prefix = self.minus + pos_prefix    # no explicit negative subpattern
+            if sign:
+                pos_prefix = self.plus + pos_prefix
+            groups = cldr.grouping if grouping and cldr.grouping[0] < 1000 else None
+            self._patterns[key] = Pattern(
+                decimals, 100.0 if style == "percent" and ratio else 1.0,
+                (prefix + pos_prefix, prefix + neg_prefix), (pos_suffix + suffix, neg_suffix + suffix),
+                self.decimal, self.group, groups,
+            )
+        return self._patterns[key]
+
+    # -----------------------------------
+    # Formatting
+    # -----------------------------------
+
+    def format(self, values, pattern, na_rep="-"):
+        """Format `values` (scalar or array-like) with a compiled pattern; NaN/None -> `na_rep`."""
+        if isinstance(values, pd.Series):
+            values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        array = np.asarray(values, dtype=float)
+        if array.ndim == 0:
+            return str(self._format_flat(array.reshape(1), pattern, na_rep)[0])
+        flat = array.ravel()
+        if flat.size <= CHUNK_ROWS:
+            return self._format_flat(flat, pattern, na_rep).reshape(array.shape)
+        chunks = [self._format_flat(flat[i:i + CHUNK_ROWS], pattern, na_rep) for i in range(0, flat.size, CHUNK_ROWS)]
+        return np.concatenate(chunks).reshape(array.shape)
+
+    def _format_flat(self, flat, pattern, na_rep):
+        n = flat.size
+        if n == 0:
+            return np.array([], dtype=str)
+        with np.errstate(invalid="ignore", over="ignore"):
+            scaled = np.abs(flat * pattern.scale) * 10.0 ** pattern.decimals
+            fast = np.isfinite(scaled) & (scaled < EXACT_LIMIT)
+            scaled = np.where(fast, scaled, 0.0)
+            # |x| * 10**d carries a rounding error of one ulp: within it of .5, only exact decimal rounding decides
+            tie = fast & (np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(scaled))
+        q = np.rint(scaled).astype(np.int64)
+        unit = _POW10[pattern.decimals] if pattern.decimals < MAX_DIGITS else 10 ** pattern.decimals
+        whole, fraction = np.divmod(q, unit)
+        negative = np.signbit(flat)
+
+        prefix_len = np.array([len(a) for a in pattern.prefix])[negative.astype(int)]
+        suffix_len = np.array([len(a) for a in pattern.suffix])[negative.astype(int)]
+        digits = np.maximum(np.searchsorted(_POW10, whole, side="right"), 1)
+        int_width = pattern.widths[digits - 1]
+        tail = len(pattern.decimal) + pattern.decimals
+        length = prefix_len + int_width + tail + suffix_len
+        width = int(length.max())
+
+        rows = np.arange(n)
+        junk = width                                   # scratch column for rows a step does not apply to
+        buf = np.zeros((n, width + 1), dtype=np.uint32)
+        cursor = length.copy()
+
+        def put(codes, active=None):
+            nonlocal cursor
+            if active is None:
+                cursor = cursor - 1
+                buf[rows, cursor] = codes
+            else:
+                cursor = np.where(active, cursor - 1, cursor)
+                buf[rows, np.where(active, cursor, junk)] = codes
+
+        self._put_affix(put, pattern.suffix, negative, suffix_len)
+        for _ in range(pattern.decimals):
+            fraction, digit = np.divmod(fraction, 10)
+            put(digit + 48)
+        for char in reversed(pattern.decimal):
+            put(ord(char))
+        for slot in pattern.slots[: int(int_width.max())]:
+            active = cursor > prefix_len
+            if slot == -1:
+                whole, digit = np.divmod(whole, 10)
+                put(digit + 48, active)
+            else:
+                put(slot, active)
+        self._put_affix(put, pattern.prefix, negative, prefix_len)
+
+        out = np.ascontiguousarray(buf[:, :width]).view(f"U{width}")[:, 0]
+        missing = np.isnan(flat)
+        slow = np.flatnonzero((~fast & ~missing) | tie)
+        if slow.size:
+            out = out.astype(object)
+            for i in slow.tolist():
+                value = float(flat[i])
+                if math.isinf(value):
+                    out[i] = pattern.prefix[value < 0] + self.infinity + pattern.suffix[value < 0]
+                else:
+                    out[i] = pattern.render(value)
+            out = out.astype(str)
+        if missing.any():
+            out = np.where(missing, na_rep, out)
+        return out
+
+    @staticmethod
+    def _put_affix(put, affix, negative, lengths):
+        positive, neg = affix
+        if positive == neg:
+            for char in reversed(positive):
+                put(ord(char))
+            return
+        for j in range(int(lengths.max())):
+            codes = np.where(negative, ord(neg[-1 - j]) if j < len(neg) else 0,
+                             ord(positive[-1 - j]) if j < len(positive) else 0)
+            put(codes, lengths > j)
+
+    # -----------------------------------
+    # Parsing
+    # -----------------------------------
+
+    def parse(self, values, default=np.nan):
+        """Parse locale-formatted text (scalar or array-like) to floats; numbers pass through, junk -> `default`.
+
+        Group separators, spaces, currency and percent signs are ignored
+        ("12,5%" -> 12.5 under el_GR). Plain digit strings are read straight
+        from the code-point matrix; anything else (exponents, "nan") goes
+        through `float()` per cell.
+        """
+        array = np.asarray(values.to_numpy() if isinstance(values, pd.Series) else values)
+        if array.dtype.kind in "biuf":
+            return array.astype(float) if array.ndim else float(array)
+        flat = array.ravel()
+        parsed = np.full(flat.size, np.nan)
+        if flat.dtype == object:
+            numeric = np.fromiter((isinstance(v, numbers.Real) for v in flat), dtype=bool, count=flat.size)
+            parsed[numeric] = flat[numeric].astype(float)
+            text = np.where(numeric, "", flat).astype(str)
+        else:
+            numeric = np.zeros(flat.size, dtype=bool)
+            text = flat.astype(str)
+
+        width = text.dtype.itemsize // 4
+        fast = np.zeros(flat.size, dtype=bool)
+        if width:
+            # Column by column (Horner): the mantissa of at most 15 digits is exact in a float, and one
+            # division by 10**k then rounds correctly, like float()
+            codes = np.ascontiguousarray(text).view(np.uint32).reshape(-1, width).T.copy()
+            np.minimum(codes, len(self._char_kinds) - 1, out=codes)
+            kinds = self._char_kinds[codes]
+            mantissa = np.zeros(flat.size)
+            count, fraction_digits, points, minus = (np.zeros(flat.size, dtype=np.int16) for _ in range(4))
+            fast = ~numeric
+            for kind, code in zip(kinds, codes):
+                is_digit = kind == _DIGIT
+                mantissa = np.where(is_digit, mantissa * 10 + (code.astype(float) - 48), mantissa)
+                count += is_digit
+                fraction_digits += is_digit & (points > 0)
+                points += kind == _POINT
+                minus += kind == _MINUS
+                fast &= kind != _OTHER
+            fast &= (points <= 1) & (minus <= 1) & (count >= 1) & (count < MAX_DIGITS)
+            value = mantissa / 10.0 ** fraction_digits
+            parsed[fast] = np.where(minus > 0, -value, value)[fast]
+
+        for i in np.flatnonzero(~fast & ~numeric).tolist():
+            parsed[i] = self._parse_one(str(text[i]), default)
+        return parsed.reshape(array.shape) if array.ndim else float(parsed[0])
+
+    @cached_property
+    def _ignored(self):
+        """Characters that carry no value: group separators, spaces, currency / percent signs, plus."""
+        return frozenset("".join(_affix_chars(self) | {self.group, self.plus, " \t\xa0\u202f+"})) - {self.decimal}
+
+    @cached_property
+    def _char_kinds(self):
+        """Lookup table: code point (BMP) -> digit / decimal point / minus / ignored / other."""
+        table = np.full(0x10000, _OTHER, dtype=np.uint8)
+        table[0] = _IGNORED                                  # padding of shorter strings
+        table[[ord(c) for c in self._ignored]] = _IGNORED
+        table[[ord(c) for c in self.minus + "-\u2212"]] = _MINUS
+        table[48:58] = _DIGIT
+        if len(self.decimal) == 1:
+            table[ord(self.decimal)] = _POINT
+        return table
+
+    def _parse_one(self, text, default):
+        cleaned = "".join(c for c in text if c not in self._ignored)
+        for minus in {self.minus, "\u2212"} - {"-"}:
+            cleaned = cleaned.replace(minus, "-")
+        if self.decimal != ".":
+            cleaned = cleaned.replace(self.decimal, ".")
+        try:
+            return float(cleaned)
+        except ValueError:
+            return default
+
+
+def _affix_chars(symbols):
+    chars = set(symbols.percent) | set("%€$£¤")
+    for pattern in symbols.styles.values():
+        for affix in (*pattern.prefix, *pattern.suffix):
+            chars |= set(affix) - set("-+'")
+    return chars - set("0123456789") - set(symbols.decimal) - set(symbols.minus)
+
+
+@lru_cache(maxsize=None)
+def number_format(locale=None):
+    """`NumberFormat` of `locale` (default MANAGERS_LAB_LOCALE / en_US), built once per process."""
+    return NumberFormat(locale or DEFAULT_LOCALE)
+
+
+def format_numbers(values, decimals=2, locale=None, grouping=True, sign=False, na_rep="-"):
+    """Plain numbers: 1234.5 -> "1,234.50" (en_US) / "1.234,50" (el_GR)."""
+    fmt = number_format(locale)
+    return fmt.format(values, fmt.pattern("decimal", decimals, grouping, sign), na_rep)
+
+
+def format_percent(values, decimals=1, locale=None, ratio=True, na_rep="-"):
+    """Percentages in the locale's pattern; `ratio=False` for values already in percent (12.5 -> "12.5%")."""
+    fmt = number_format(locale)
+    return fmt.format(values, fmt.pattern("percent", decimals, ratio=ratio), na_rep)
+
+
+def format_currency(values, currency="EUR", decimals=2, locale=None, na_rep="-"):
+    """Amounts with the currency symbol placed by the locale: "€1,234.50" (en_US) / "1.234,50 €" (el_GR)."""
+    fmt = number_format(locale)
+    return fmt.format(values, fmt.pattern("currency", decimals, currency=currency), na_rep)
+
+
+def parse_numbers(values, locale=None, default=np.nan):
+    """Inverse of the formatters: "1.234,50 €" -> 1234.5 under el_GR; unparsable text -> `default`."""
+    return number_format(locale).parse(values, default)
+
+
+@lru_cache(maxsize=256)
+def _parse_spec(spec):
+    match = _SPEC.match(spec)
+    if match is None:
+        raise ValueError(f"unsupported format spec {spec!r}; expected e.g. '{{:,.2f}}', '{{:.1%}}' or '{{:,.0f}} €'")
+    return {"style": "percent" if match["type"] == "%" else "decimal", "decimals": int(match["decimals"]),
+            "grouping": bool(match["grouping"]), "sign": bool(match["sign"]),
+            "prefix": match["prefix"], "suffix": match["suffix"]}
+
+
+def format_frame(df, formats, locale=None, na_rep="-"):
+    """Display copy of `df` with the `formats` columns ({column: "{:,.2f}"-style spec}) as locale strings.
+
+    A drop-in for `df.style.format(formats)` on large tables: each column is
+    formatted in one vectorized pass instead of one Python call per cell.
+    """
+    out = df.copy()
+    fmt = number_format(locale)
+    for column, spec in formats.items():
+        if column in out:
+            out[column] = fmt.format(out[column], fmt.pattern(**_parse_spec(spec)), na_rep)
+    return out
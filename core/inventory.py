@@ -0,0 +1,33 @@
+# core/inventory.py
+"""
+SKU catalog ingest for the inventory turnover analysis.
+
+CSV or Parquet catalogs (100k-1M SKUs) are streamed in chunks and kept only as
+three compact columns (name, average inventory, usage), which is all the
+vectorized turnover / ABC engine needs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, iter_table_chunks
+
+SKU_COLUMNS = {"name": "sku", "inventory": "avg_inventory", "usage": "usage"}
+
+
+def load_sku_table(source, name_col="sku", inventory_col="avg_inventory", usage_col="usage",
+                   chunksize=DEFAULT_CHUNKSIZE):
+    """Read a SKU catalog into a DataFrame with Name, AvgInventory, Usage; unparseable numbers count as 0."""
+    names, inventory, usage = [], [], []
+    for chunk in iter_table_chunks(source, chunksize, columns=list(dict.fromkeys([name_col, inventory_col, usage_col]))):
+        names.append(chunk[name_col].astype(str).to_numpy())
+        inventory.append(pd.to_numeric(chunk[inventory_col], errors="coerce").fillna(0).to_numpy(dtype=float))
+        usage.append(pd.to_numeric(chunk[usage_col], errors="coerce").fillna(0).to_numpy(dtype=float))
+
+    if not names:
+        return pd.DataFrame({"Name": [], "AvgInventory": [], "Usage": []})
+    return pd.DataFrame({
+        "Name": np.concatenate(names),
+        "AvgInventory": np.concatenate(inventory),
+        "Usage": np.concatenate(usage),
+    })
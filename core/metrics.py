@@ -0,0 +1,88 @@
+# core/metrics.py
+"""
+Derived metrics of the Shared Core as one dependency graph.
+
+Inputs are the baseline fields (pillars plus the Stage 2 dead-stock share); every
+stage and the Control Center read derived values (revenue, EBIT, CCC,
+liquidity gap, ...) from here instead of recomputing them or copying them
+between pages. A price change recomputes revenue / margin / working capital
+but never the CCC, which only depends on the three day counts.
+"""
+
+from core.baseline import BASELINE_DEFAULTS, BASELINE_FIELDS, STAGE_DEFAULTS
+from core.engine.break_even import break_even_units, contribution_margin as margin_ratio
+from core.engine.cash_cycle import cash_conversion_cycle, working_capital as working_capital_breakdown
+from core.engine.graph import DependencyGraph, GraphSpec
+
+METRIC_INPUTS = {**BASELINE_DEFAULTS, **STAGE_DEFAULTS}
+METRICS = GraphSpec(METRIC_INPUTS)
+
+
+# --- Stage 1 / Control Center: revenue & margins ---------------------------
+@METRICS.derived
+def revenue(price, volume):
+    return price * volume
+
+
+@METRICS.derived
+def unit_margin(price, variable_cost):
+    return price - variable_cost
+
+
+@METRICS.derived
+def contribution_margin(price, variable_cost):
+    return margin_ratio(price, variable_cost)
+
+
+@METRICS.derived
+def be_units(fixed_cost, price, variable_cost):
+    return break_even_units(fixed_cost, price, variable_cost)
+
+
+@METRICS.derived
+def debt_service(debt, interest_rate):
+    return debt * interest_rate
+
+
+@METRICS.derived
+def ebit(unit_margin, volume, fixed_cost):
+    return unit_margin * volume - fixed_cost
+
+
+@METRICS.derived
+def net_profit(ebit, debt_service):
+    """Post-interest profit (before the Stage 2 inventory carrying cost)."""
+    return ebit - debt_service
+
+
+# --- Stage 2: cash conversion cycle ------------------------------------------
+@METRICS.derived
+def ccc(inventory_days, ar_days, payables_days):
+    return cash_conversion_cycle(inventory_days, ar_days, payables_days)
+
+
+@METRICS.derived
+def working_capital(price, volume, variable_cost, inventory_days, ar_days, payables_days, dead_stock_pct):
+    return working_capital_breakdown(price, volume, variable_cost, inventory_days, ar_days, payables_days,
+                                     dead_stock_pct=dead_stock_pct)
+
+
+@METRICS.derived
+def working_capital_req(working_capital):
+    return working_capital["liquidity_gap"]
+
+
+@METRICS.derived
+def dead_stock_funding(working_capital):
+    return working_capital["dead_stock_funding"]
+
+
+@METRICS.derived
+def liquidity_drain(working_capital):
+    return working_capital["liquidity_drain"]
+
+
+def metric_graph(baseline=None, **inputs):
+    """A fresh graph over METRICS, seeded from a Baseline / mapping and extra inputs."""
+    seed = {k: baseline[k] for k in BASELINE_FIELDS} if baseline is not None else {}
+    return DependencyGraph(METRICS, **seed, **inputs)
@@ -0,0 +1,39 @@
+# core/pricing_catalog.py
+"""
+Product catalog ingest for the portfolio pricing power analysis.
+
+CSV or Parquet catalogs are streamed in chunks and kept only as the five
+columns the vectorized scorer needs (name, margin, substitution, elasticity,
+concentration). Unparseable numbers are kept as NaN so the scorer can report
+them instead of silently scoring them as zero.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, iter_table_chunks
+
+PRODUCT_COLUMNS = {
+    "name": "product",
+    "margin": "margin",
+    "substitution": "substitution",
+    "elasticity": "elasticity",
+    "concentration": "concentration",
+}
+DRIVERS = ("margin", "substitution", "elasticity", "concentration")
+
+
+def load_product_table(source, name_col="product", margin_col="margin", substitution_col="substitution",
+                       elasticity_col="elasticity", concentration_col="concentration", chunksize=DEFAULT_CHUNKSIZE):
+    """Read a product catalog into a DataFrame with Name, Margin, Substitution, Elasticity, Concentration."""
+    value_cols = (margin_col, substitution_col, elasticity_col, concentration_col)
+    names, values = [], {col: [] for col in DRIVERS}
+    for chunk in iter_table_chunks(source, chunksize, columns=list(dict.fromkeys((name_col,) + value_cols))):
+        names.append(chunk[name_col].astype(str).to_numpy())
+        for key, col in zip(DRIVERS, value_cols):
+            values[key].append(pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=float))
+
+    frame = {"Name": np.concatenate(names) if names else np.array([], dtype=str)}
+    for key in DRIVERS:
+        frame[key.title()] = np.concatenate(values[key]) if names else np.array([], dtype=float)
+    return pd.DataFrame(frame)
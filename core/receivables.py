@@ -0,0 +1,65 @@
+# core/receivables.py
+"""
+Receivables ledger ingest for the credit days analysis.
+
+Invoice-level ledgers (CSV or Parquet, any length) are streamed in chunks and
+reduced to one row per segment: open amount, amount x days and invoice count.
+Only the running per-segment totals are kept, so memory is bounded by the
+number of segments, not the number of invoice lines.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, iter_table_chunks
+from core.engine.operations import calculate_weighted_average
+
+LEDGER_COLUMNS = {"segment": "segment", "amount": "amount", "days": "days"}
+
+
+def aggregate_chunk(chunk, segment_col, amount_col, days_col):
+    """Per-segment [amount, amount_days, invoices] totals of one ledger chunk; unparseable rows are dropped."""
+    amount = pd.to_numeric(chunk[amount_col], errors="coerce").to_numpy(dtype=float)
+    days = pd.to_numeric(chunk[days_col], errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(amount) & np.isfinite(days)
+    frame = pd.DataFrame({
+        "segment": chunk[segment_col].astype(str).to_numpy()[valid],
+        "amount": amount[valid],
+        "amount_days": amount[valid] * days[valid],
+        "invoices": 1,
+    })
+    return frame.groupby("segment", sort=False).sum()
+
+
+def aggregate_receivables(chunks, segment_col="segment", amount_col="amount", days_col="days"):
+    """
+    Fold an iterable of ledger DataFrames into per-segment exposure.
+    Returns a DataFrame indexed by segment with Amount, Days (amount-weighted) and Invoices.
+    """
+    totals = None
+    for chunk in chunks:
+        part = aggregate_chunk(chunk, segment_col, amount_col, days_col)
+        totals = part if totals is None else totals.add(part, fill_value=0)
+
+    if totals is None:
+        totals = pd.DataFrame(columns=["amount", "amount_days", "invoices"], dtype=float)
+    amount = totals["amount"].to_numpy(dtype=float)
+    days = np.divide(totals["amount_days"].to_numpy(dtype=float), amount,
+                     out=np.zeros(len(totals)), where=amount != 0)
+    return pd.DataFrame({
+        "Amount": amount,
+        "Days": days,
+        "Invoices": totals["invoices"].to_numpy(dtype=np.int64),
+    }, index=totals.index.rename("Category"))
+
+
+def ingest_receivables(source, segment_col="segment", amount_col="amount", days_col="days",
+                       chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream a CSV / Parquet receivables ledger (path or file object).
+    Returns (segments, total_amount, weighted_avg_days).
+    """
+    chunks = iter_table_chunks(source, chunksize, columns=[segment_col, amount_col, days_col])
+    segments = aggregate_receivables(chunks, segment_col, amount_col, days_col)
+    total_amount, weighted_avg = calculate_weighted_average(segments["Amount"].to_numpy(), segments["Days"].to_numpy())
+    return segments, total_amount, weighted_avg
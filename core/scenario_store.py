@@ -0,0 +1,217 @@
+# core/scenario_store.py
+"""
+Embedded scenario store (SQLite, no external server).
+
+Named scenarios hold a serialized Baseline plus the KPIs computed from it, so
+baselines survive restarts and can be shared by every analyst on the server.
+Connections come from a small pool (WAL mode, one connection per borrower) so
+Streamlit's per-session threads never share a connection concurrently.
+
+    store = get_store()
+    store.save("Q3 price test", baseline, analyst="maria", kpis=evaluate_path(baseline))
+    store.load("Q3 price test")          # -> Baseline
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from core.baseline import Baseline
+
+DEFAULT_DB_PATH = os.environ.get(
+    "MANAGERS_LAB_DB", os.path.join(os.path.expanduser("~"), ".managers_lab", "scenarios.db")
+)
+POOL_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT    NOT NULL UNIQUE,
+    analyst     TEXT    NOT NULL DEFAULT '',
+    tags        TEXT    NOT NULL DEFAULT '',
+    created_at  REAL    NOT NULL,
+    updated_at  REAL    NOT NULL,
+    baseline    BLOB    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_scenarios_analyst ON scenarios (analyst, updated_at);
+CREATE INDEX IF NOT EXISTS ix_scenarios_updated ON scenarios (updated_at);
+
+CREATE TABLE IF NOT EXISTS kpis (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    name        TEXT    NOT NULL,
+    value       REAL,
+    PRIMARY KEY (scenario_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_kpis_name_value ON kpis (name, value);
+"""
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections; each borrower gets exclusive use of one."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(None)  # connections are opened lazily
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            if conn is None:
+                conn = self._connect()
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+
+class ScenarioStore:
+    """Named baselines + KPIs with batched writes and indexed lookups."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, pool_size=POOL_SIZE):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    # --- Writes ------------------------------------------------------------
+    def save_many(self, records):
+        """
+        Upsert many scenarios in one transaction.
+        `records`: iterable of dicts with name, baseline and optional analyst, tags, kpis.
+        Returns the number of scenarios written.
+        """
+        now = time.time()
+        rows, kpi_rows = [], []
+        for rec in records:
+            baseline = rec["baseline"]
+            if not isinstance(baseline, Baseline):
+                baseline = Baseline.from_mapping(baseline)
+            tags = rec.get("tags", ())
+            rows.append((rec["name"], rec.get("analyst", ""), tags if isinstance(tags, str) else ",".join(tags),
+                         now, now, baseline.to_bytes()))
+            kpi_rows.extend((rec["name"], k, float(v)) for k, v in (rec.get("kpis") or {}).items())
+
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO scenarios (name, analyst, tags, created_at, updated_at, baseline) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET analyst=excluded.analyst, tags=excluded.tags, "
+                "updated_at=excluded.updated_at, baseline=excluded.baseline",
+                rows,
+            )
+            conn.executemany(
+                "DELETE FROM kpis WHERE scenario_id = (SELECT id FROM scenarios WHERE name = ?)",
+                [(r[0],) for r in rows],
+            )
+            conn.executemany(
+                "INSERT INTO kpis (scenario_id, name, value) SELECT id, ?, ? FROM scenarios WHERE name = ?",
+                [(k, v, name) for name, k, v in kpi_rows],
+            )
+        return len(rows)
+
+    def save(self, name, baseline, analyst="", tags=(), kpis=None):
+        return self.save_many([{"name": name, "baseline": baseline, "analyst": analyst, "tags": tags, "kpis": kpis}])
+
+    def delete(self, name):
+        with self.pool.transaction() as conn:
+            return conn.execute("DELETE FROM scenarios WHERE name = ?", (name,)).rowcount
+
+    # --- Reads -------------------------------------------------------------
+    def load(self, name):
+        """Baseline of scenario `name` (KeyError if unknown)."""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT baseline FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return Baseline.from_bytes(row[0])
+
+    def load_many(self, names=None):
+        """{name: Baseline} for `names` (all scenarios if None)."""
+        with self.pool.connection() as conn:
+            if names is None:
+                rows = conn.execute("SELECT name, baseline FROM scenarios").fetchall()
+            else:
+                names = list(names)
+                marks = ",".join("?" * len(names))
+                rows = conn.execute(f"SELECT name, baseline FROM scenarios WHERE name IN ({marks})", names).fetchall()
+        return {name: Baseline.from_bytes(blob) for name, blob in rows}
+
+    def kpis(self, name):
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT k.name, k.value FROM kpis k JOIN scenarios s ON s.id = k.scenario_id WHERE s.name = ?", (name,)
+            ).fetchall()
+        return dict(rows)
+
+    def list(self, analyst=None, kpi=None, min_value=None, max_value=None, limit=500):
+        """
+        Scenario summaries, most recently updated first.
+        Optional filters: `analyst`, and a KPI range (`kpi` with `min_value` / `max_value`).
+        """
+        sql = "SELECT s.name, s.analyst, s.tags, s.updated_at FROM scenarios s"
+        where, params = [], []
+        if kpi is not None:
+            sql += " JOIN kpis k ON k.scenario_id = s.id AND k.name = ?"
+            params.append(kpi)
+            if min_value is not None:
+                where.append("k.value >= ?")
+                params.append(min_value)
+            if max_value is not None:
+                where.append("k.value <= ?")
+                params.append(max_value)
+        if analyst is not None:
+            where.append("s.analyst = ?")
+            params.append(analyst)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY s.updated_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [{"name": n, "analyst": a, "tags": t, "updated_at": u} for n, a, t, u in rows]
+
+    def close(self):
+        self.pool.close()
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store(path=None):
+    """Process-wide store (shared by every session), opened on first use."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or (path is not None and path != _STORE.pool.path):
+            _STORE = ScenarioStore(path or DEFAULT_DB_PATH)
+        return _STORE
@@ -1,5 +1,8 @@
 import streamlit as st
 
+from core.baseline import BASELINE_FIELDS, Baseline
+from core.metrics import metric_graph
+
 def initialize_system_state():
     """Initializes the 5 pillars of the system + UI State."""
 
@@ -9,22 +12,34 @@ def initialize_system_state():
     if 'baseline_locked' not in st.session_state: st.session_state.baseline_locked = False
     if 'selected_tool' not in st.session_state: st.session_state.selected_tool = None
 
-    # 1. Revenue Engine
-    if 'price' not in st.session_state: st.session_state.price = 30.0
-    if 'volume' not in st.session_state: st.session_state.volume = 10000
+    # 1-5. Revenue, Costs, Cash Timing, Capital, Durability (one record, see core/baseline.py)
+    if 'baseline' not in st.session_state: st.session_state.baseline = Baseline()
 
-    # 2. Cost Structure
-    if 'variable_cost' not in st.session_state: st.session_state.variable_cost = 15.0
-    if 'fixed_cost' not in st.session_state: st.session_state.fixed_cost = 5000.0
+    # Derived metrics (see core/metrics.py); the recompute log restarts with every script run
+    if 'metrics' not in st.session_state: st.session_state.metrics = metric_graph(st.session_state.baseline)
+    st.session_state.metrics.start_rerun()
 
-    # 3. Time & Cash Pressure
-    if 'ar_days' not in st.session_state: st.session_state.ar_days = 45
-    if 'inventory_days' not in st.session_state: st.session_state.inventory_days = 60
-    if 'payables_days' not in st.session_state: st.session_state.payables_days = 30
+def get_baseline():
+    """The session's current Baseline record."""
+    if 'baseline' not in st.session_state:
+        st.session_state.baseline = Baseline()
+    return st.session_state.baseline
 
-    # 4. Capital & Financing
-    if 'debt' not in st.session_state: st.session_state.debt = 20000.0
-    if 'interest_rate' not in st.session_state: st.session_state.interest_rate = 0.05
+def update_baseline(**changes):
+    """Replace the session baseline with a copy carrying `changes`; returns the current record."""
+    base = get_baseline()
+    new = base.replace(**changes)
+    if new != base:
+        st.session_state.baseline = new
+    return st.session_state.baseline
 
-    # 5. Durability
-    if 'retention_rate' not in st.session_state: st.session_state.retention_rate = 0.85
+def get_metrics():
+    """The session's derived-metric graph, synced with the current baseline (only changed fields invalidate)."""
+    if 'metrics' not in st.session_state:
+        st.session_state.metrics = metric_graph(get_baseline())
+    graph = st.session_state.metrics
+    base = get_baseline()
+    if st.session_state.get('metrics_baseline') is not base:
+        graph.set_inputs(**{k: base[k] for k in BASELINE_FIELDS})
+        st.session_state.metrics_baseline = base
+    return graph
@@ -0,0 +1,264 @@
+# core/telemetry.py
+"""
+Per-rerun timing for stages, tools and pages (stdlib only, no external server).
+
+Every routed target (a Structured Path stage, a library tool, a page) runs
+inside `target(kind, name)`, which splits its wall time into three phases:
+
+  import   module import (mostly on the first rerun of a session)
+  compute  time inside memoized engine calls (`core.engine.memo.memoize`
+           reports here through `track_compute`, outermost call only)
+  render   the rest: widgets, charts and inline arithmetic
+
+Finished targets are handed to a background writer thread (the rerun only
+pays for a queue put), which appends one JSON line per target to a
+size-rotated log and keeps process-wide counters that are written (throttled)
+as a Prometheus text exposition file, e.g. for node_exporter's textfile collector.
+
+    with telemetry.target("tool", "goal_seek") as t:
+        with t.phase("import"):
+            module = __import__("tools.goal_seek", fromlist=["show_goal_seek"])
+        module.show_goal_seek()
+
+Configuration (environment): MANAGERS_LAB_TELEMETRY=0 switches recording off,
+MANAGERS_LAB_TELEMETRY_DIR moves the output directory.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+ENABLED = os.environ.get("MANAGERS_LAB_TELEMETRY", "1").strip().lower() not in ("0", "false", "off", "")
+TELEMETRY_DIR = os.environ.get(
+    "MANAGERS_LAB_TELEMETRY_DIR", os.path.join(os.path.expanduser("~"), ".managers_lab", "telemetry")
+)
+LOG_FILE = "reruns.jsonl"
+PROM_FILE = "managers_lab.prom"
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+PROM_INTERVAL = 10.0          # seconds between exposition file rewrites
+PHASES = ("import", "compute", "render")
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # rerun seconds
+
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+_TOTALS = {}                  # (kind, name) -> {"count", "sum", "buckets", phase seconds}
+_QUEUE = queue.SimpleQueue()
+_STATE = {"logger": None, "writer": None, "last_export": 0.0, "dirty": False}
+
+
+class Target:
+    """Timing of one stage / tool / page during one rerun."""
+
+    __slots__ = ("kind", "name", "started", "import_s", "compute_s", "compute_calls", "computing")
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.started = time.perf_counter()
+        self.import_s = self.compute_s = 0.0
+        self.compute_calls = 0
+        self.computing = False
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as `import` (the only explicitly timed phase; compute is collected by hooks)."""
+        if name != "import":
+            raise ValueError(f"unknown phase {name!r}; compute is tracked by `track_compute`, render is the remainder")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.import_s += time.perf_counter() - start
+
+    def record(self, outcome):
+        total = time.perf_counter() - self.started
+        return {
+            "ts": round(time.time(), 3),
+            "kind": self.kind,
+            "name": self.name,
+            "outcome": outcome,
+            "total_ms": round(total * 1000, 3),
+            "import_ms": round(self.import_s * 1000, 3),
+            "compute_ms": round(self.compute_s * 1000, 3),
+            "render_ms": round(max(total - self.import_s - self.compute_s, 0.0) * 1000, 3),
+            "compute_calls": self.compute_calls,
+        }
+
+
+class _Disabled:
+    """Stand-in yielded when recording is off, so call sites need no branches."""
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+
+@contextmanager
+def target(kind, name):
+    """Record one rerun of a stage / tool / page; nested targets are folded into the outer one."""
+    if not ENABLED or getattr(_LOCAL, "target", None) is not None:
+        yield _Disabled()
+        return
+    current = _LOCAL.target = Target(kind, name)
+    outcome = "ok"
+    try:
+        yield current
+    except BaseException as e:
+        # st.rerun() / st.stop() raise to unwind the script; record them by name too
+        outcome = type(e).__name__
+        raise
+    finally:
+        _LOCAL.target = None
+        _publish(current.record(outcome))
+
+
+def track_compute(func):
+    """Add the wall time of `func` to the active target's compute phase (outermost call only)."""
+    @wraps(func)
+    def timed(*args, **kwargs):
+        current = getattr(_LOCAL, "target", None)
+        if current is None or current.computing:
+            return func(*args, **kwargs)
+        current.computing = True
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current.compute_s += time.perf_counter() - start
+            current.compute_calls += 1
+            current.computing = False
+    return timed
+
+
+# -----------------------------------
+# Sinks
+# -----------------------------------
+
+def _logger():
+    if _STATE["logger"] is None:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(TELEMETRY_DIR, LOG_FILE),
+                                      maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("managers_lab.telemetry")
+        logger.handlers[:] = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        _STATE["logger"] = logger
+    return _STATE["logger"]
+
+
+def _publish(record):
+    _QUEUE.put(record)
+    if _STATE["writer"] is None:
+        with _LOCK:
+            if _STATE["writer"] is None:
+                _STATE["writer"] = threading.Thread(target=_run_writer, name="telemetry-writer", daemon=True)
+                _STATE["writer"].start()
+
+
+def _run_writer():
+    while True:
+        _write(_QUEUE.get())
+
+
+def _write(record):
+    key = (record["kind"], record["name"])
+    total_s = record["total_ms"] / 1000
+    with _LOCK:
+        entry = _TOTALS.setdefault(key, {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS),
+                                         **{phase: 0.0 for phase in PHASES}})
+        entry["count"] += 1
+        entry["sum"] += total_s
+        for i, bound in enumerate(BUCKETS):
+            if total_s <= bound:
+                entry["buckets"][i] += 1
+        for phase in PHASES:
+            entry[phase] += record[f"{phase}_ms"] / 1000
+        _STATE["dirty"] = True
+        export = time.monotonic() - _STATE["last_export"] >= PROM_INTERVAL
+    try:
+        _logger().info(json.dumps(record, separators=(",", ":")))
+        if export:
+            _export()
+    except OSError:
+        pass  # telemetry must never break the app (read-only home, full disk, ...)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def exposition():
+    """Current counters in the Prometheus text exposition format."""
+    with _LOCK:
+        totals = {key: {**entry, "buckets": list(entry["buckets"])} for key, entry in sorted(_TOTALS.items())}
+    lines = [
+        "# HELP managers_lab_rerun_seconds Wall time of one rerun of a stage / tool / page.",
+        "# TYPE managers_lab_rerun_seconds histogram",
+    ]
+    for (kind, name), entry in totals.items():
+        labels = f'kind="{_label(kind)}",name="{_label(name)}"'
+        for bound, count in zip(BUCKETS, entry["buckets"]):
+            lines.append(f'managers_lab_rerun_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'managers_lab_rerun_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+        lines.append(f"managers_lab_rerun_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+        lines.append(f"managers_lab_rerun_seconds_count{{{labels}}} {entry['count']}")
+    lines += [
+        "# HELP managers_lab_rerun_phase_seconds_total Rerun time spent per phase (import, compute, render).",
+        "# TYPE managers_lab_rerun_phase_seconds_total counter",
+    ]
+    for (kind, name), entry in totals.items():
+        for phase in PHASES:
+            lines.append(f'managers_lab_rerun_phase_seconds_total{{kind="{_label(kind)}",name="{_label(name)}",'
+                         f'phase="{phase}"}} {entry[phase]:.6f}')
+    return "\n".join(lines) + "\n"
+
+
+def flush():
+    """Write out queued records and rewrite the exposition file now."""
+    while True:
+        try:
+            record = _QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        _write(record)
+    _export()
+
+
+def _export():
+    """Rewrite the exposition file atomically, so a scraper never reads half a file."""
+    with _LOCK:
+        if not _STATE["dirty"]:
+            return
+        _STATE["dirty"] = False
+        _STATE["last_export"] = time.monotonic()
+    os.makedirs(TELEMETRY_DIR, exist_ok=True)
+    path = os.path.join(TELEMETRY_DIR, PROM_FILE)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(exposition())
+    os.replace(tmp, path)
+
+
+def reset():
+    """Drop the in-process counters (the files on disk are left alone)."""
+    with _LOCK:
+        _TOTALS.clear()
+        _STATE["dirty"] = False
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush()
+    except OSError:
+        pass
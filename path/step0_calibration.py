@@ -1,27 +1,29 @@
 import streamlit as st
 
+from core.engine.break_even import contribution_margin
+from core.system_state import get_baseline, update_baseline
+
 def run_step():
     st.header("⚙️ Stage 0: System Calibration")
     st.caption("Establish the core economic parameters of the enterprise.")
+    base = get_baseline()
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Revenue Structure")
-        st.session_state.price = st.number_input("Price per Unit (€)", min_value=0.0, value=float(st.session_state.price))
-        st.session_state.volume = st.number_input("Annual Volume (Units)", min_value=0, value=int(st.session_state.volume))
+        p = st.number_input("Price per Unit (€)", min_value=0.0, value=float(base.price))
+        q = st.number_input("Annual Volume (Units)", min_value=0, value=int(base.volume))
         
-        revenue = st.session_state.price * st.session_state.volume
+        revenue = p * q
         st.metric("Annual Revenue", f"{revenue:,.0f} €")
 
     with col2:
         st.subheader("Cost Structure")
-        st.session_state.variable_cost = st.number_input("Variable Cost per Unit (€)", min_value=0.0, value=float(st.session_state.variable_cost))
-        st.session_state.fixed_cost = st.number_input("Annual Fixed Costs (€)", min_value=0.0, value=float(st.session_state.fixed_cost))
+        vc = st.number_input("Variable Cost per Unit (€)", min_value=0.0, value=float(base.variable_cost))
+        fc = st.number_input("Annual Fixed Costs (€)", min_value=0.0, value=float(base.fixed_cost))
 
-        p = st.session_state.price
-        vc = st.session_state.variable_cost
-        margin = (p - vc) / p if p > 0 else 0
+        margin = contribution_margin(p, vc)
 
         if p <= 0:
             st.error("❌ Price must be greater than zero.")
@@ -38,14 +40,17 @@ def run_step():
     with st.expander("Configure Working Capital Cycle", expanded=False):
         st.caption("Standard industry defaults applied (45/60/30 days). Adjust for precision.")
         c1, c2, c3 = st.columns(3)
-        st.session_state.ar_days = c1.number_input("Receivables Days", value=int(st.session_state.ar_days))
-        st.session_state.inventory_days = c2.number_input("Inventory Days", value=int(st.session_state.inventory_days))
-        st.session_state.payables_days = c3.number_input("Payables Days", value=int(st.session_state.payables_days))
+        ar_days = c1.number_input("Receivables Days", value=int(base.ar_days))
+        inv_days = c2.number_input("Inventory Days", value=int(base.inventory_days))
+        ap_days = c3.number_input("Payables Days", value=int(base.payables_days))
+
+    base = update_baseline(price=p, volume=q, variable_cost=vc, fixed_cost=fc,
+                           ar_days=ar_days, inventory_days=inv_days, payables_days=ap_days)
 
     st.divider()
 
     if st.button("Lock Baseline & Continue ➡️", use_container_width=True, type="primary"):
-        if st.session_state.price > st.session_state.variable_cost:
+        if base.price > base.variable_cost:
             st.session_state.baseline_locked = True
             st.session_state.flow_step = 1
             st.session_state.mode = "path"
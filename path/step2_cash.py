@@ -1,15 +1,19 @@
 import streamlit as st
 
+from core.engine.cash_cycle import days_to_value
+from core.system_state import get_baseline, get_metrics, update_baseline
+from ui.cash_ledger import show_cash_ledger
+
 def run_step():
     st.header("💰 Stage 2: Cash Conversion Cycle (CCC)")
     st.info("Measures the time (in days) it takes to convert investments in inventory into cash flows from sales.")
 
     # 1. SYNC WITH SHARED CORE
-    q = st.session_state.get('volume', 1000)
-    vc = st.session_state.get('variable_cost', 12.0)
-    price = st.session_state.get('price', 20.0)
+    base = get_baseline()
+    q = base.volume
+    vc = base.variable_cost
+    price = base.price
     annual_cogs = q * vc 
-    days_in_year = 365 
 
     st.write(f"**🔗 Global Baseline Linked:** Annual COGS: {annual_cogs:,.2f} €")
 
@@ -20,43 +24,38 @@ def run_step():
     
     with col1:
         st.subheader("📦 Inventory")
-        inv_days = st.number_input("Inventory Days", min_value=0, value=st.session_state.get('inventory_days', 60))
-        
-        # Base inventory value
-        base_inventory_value = (inv_days / days_in_year) * annual_cogs
+        inv_days = st.number_input("Inventory Days", min_value=0, value=base.inventory_days)
         
         # Dead Stock Logic
-        dead_stock_pct = st.slider("Dead Stock / Non-Moving (%)", 0, 50, 10)
-        carrying_cost_pct = 0.20 
-        
-        effective_inventory_value = base_inventory_value * (1 + dead_stock_pct/100)
-        liquidity_drain = effective_inventory_value * carrying_cost_pct
+        dead_stock_pct = st.slider("Dead Stock / Non-Moving (%)", 0, 50, round(base.dead_stock_pct * 100))
         
-        st.caption(f"Storage/Finance Cost: {liquidity_drain:,.2f} €/year")
-
     with col2:
         st.subheader("💳 Receivables")
-        ar_days = st.number_input("Accounts Receivable Days", min_value=0, value=st.session_state.get('ar_days', 45))
-        ar_value = (ar_days / days_in_year) * (price * q)
-        st.caption(f"Owed by Clients: {ar_value:,.2f} €")
+        ar_days = st.number_input("Accounts Receivable Days", min_value=0, value=base.ar_days)
+        st.caption(f"Owed by Clients: {days_to_value(ar_days, price * q):,.2f} €")
 
     with col3:
         st.subheader("🤝 Payables")
-        ap_days = st.number_input("Accounts Payable Days", min_value=0, value=st.session_state.get('payables_days', 30))
-        ap_value = (ap_days / days_in_year) * annual_cogs
-        st.caption(f"Owed to Suppliers: {ap_value:,.2f} €")
+        ap_days = st.number_input("Accounts Payable Days", min_value=0, value=base.payables_days)
+        st.caption(f"Owed to Suppliers: {days_to_value(ap_days, annual_cogs):,.2f} €")
+
+    # Save to session state: the derived cycle metrics follow through the metric graph
+    update_baseline(inventory_days=inv_days, ar_days=ar_days, payables_days=ap_days, dead_stock_pct=dead_stock_pct / 100)
 
     # 3. CALCULATIONS (Fixed Logic)
-    ccc = inv_days + ar_days - ap_days
-    
-    # Base Working Capital (The standard cycle)
-    base_wcr = base_inventory_value + ar_value - ap_value
+    metrics = get_metrics()
+    wc = metrics["working_capital"]
+    ccc = metrics["ccc"]
+    liquidity_drain = metrics["liquidity_drain"]
     
     # New Capital Required (Funding for new stock because old stock is dead)
-    new_capital_needed = base_inventory_value * (dead_stock_pct / 100)
+    new_capital_needed = wc["dead_stock_funding"]
     
     # Final Liquidity Gap
-    total_liquidity_gap = base_wcr + new_capital_needed
+    total_liquidity_gap = wc["liquidity_gap"]
+
+    with col1:
+        st.caption(f"Storage/Finance Cost: {liquidity_drain:,.2f} €/year")
 
     st.divider()
 
@@ -65,7 +64,7 @@ def run_step():
     
     with res1:
         color = "red" if ccc > 90 else "orange" if ccc > 60 else "green"
-        st.metric("Cash Cycle", f"{ccc} Days", delta=f"{ccc} days delay", delta_color="inverse")
+        st.metric("Cash Cycle", f"{ccc:.0f} Days", delta=f"{ccc:.0f} days delay", delta_color="inverse")
         st.markdown(f"Status: :{color}[{'High Risk' if ccc > 90 else 'Healthy'}]")
 
     with res2:
@@ -76,12 +75,10 @@ def run_step():
         st.metric("Total Liquidity Gap", f"{total_liquidity_gap:,.2f} €")
         st.caption("Total financing requirement")
 
-    # Save to session state
-    st.session_state.inventory_days = inv_days
-    st.session_state.ar_days = ar_days
-    st.session_state.payables_days = ap_days
-    st.session_state.working_capital_req = total_liquidity_gap
-    st.session_state.liquidity_drain = liquidity_drain
+    st.divider()
+
+    # 4b. DAILY CASH LEDGER
+    show_cash_ledger(price, q, vc, inv_days, ar_days, ap_days, fixed_cost=base.fixed_cost)
 
     st.divider()
     
@@ -2,14 +2,29 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 
+from core.engine.clv import clv_grid, cumulative_npv, payback_months, retention_weighted_margin
+from core.system_state import get_baseline
+from ui import charts
+
+def npv_timeline_figure(cum_npv):
+    df = pd.DataFrame({"Year": range(1, len(cum_npv) + 1), "Cumulative_NPV": cum_npv})
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['Year'], y=df['Cumulative_NPV'], 
+                             name='Net Value per Customer', 
+                             line=dict(color='#00CC96', width=4)))
+    fig.add_hline(y=0, line_dash="dot", line_color="white")
+    fig.update_layout(title="NPV Timeline (Including Retention Discounts)", 
+                      xaxis_title="Years", yaxis_title="Net Value (€)", template="plotly_dark")
+    return fig
+
 def run_step():
     st.header("📊 Stage 3: Unit Economics & CLV Analysis")
     st.info("Calculating Lifetime Value with dynamic retention margins.")
 
     # 1. DYNAMIC SYNC
-    p = st.session_state.get('price', 100.0)
-    vc = st.session_state.get('variable_cost', 60.0)
-    initial_margin = p - vc
+    base = get_baseline()
+    p = base.price
+    vc = base.variable_cost
     
     # 2. INPUTS: CUSTOMER BEHAVIOR
     col1, col2 = st.columns(2)
@@ -29,27 +44,15 @@ def run_step():
         horizon = st.slider("Analysis Horizon (Years)", 1, 10, 5)
 
     # 3. CALCULATIONS (Cold Logic)
-    # The margin for the very first purchase
-    first_purchase_margin = initial_margin
-    # The margin for all subsequent purchases
-    repeat_margin = (p * (1 - retention_discount/100)) - vc
-    
     # Annual margin calculation: 1st purchase at full price (if t=1), rest at discount
     # For simplification in an annual model, we weigh the margins:
-    weighted_annual_margin = first_purchase_margin + (repeat_margin * (purch_per_year - 1))
+    weighted_annual_margin, repeat_margin = retention_weighted_margin(p, vc, purch_per_year, retention_discount / 100)
     
     discount_rate = 0.10
-    total_clv_npv = 0
-    data = []
-    
-    for t in range(1, horizon + 1):
-        survival = (1 - (churn_rate/100)) ** (t-1)
-        # We use the weighted annual margin (accounting for retention discounts)
-        flow = (weighted_annual_margin * survival) / ((1 + discount_rate) ** t)
-        total_clv_npv += flow
-        data.append({"Year": t, "Cumulative_NPV": total_clv_npv - cac})
-
-    ltv_cac_ratio = total_clv_npv / cac if cac > 0 else 0
+    # Survival lags one year: the whole cohort buys during year 1
+    clv = clv_grid(weighted_annual_margin, churn_rate / 100, discount_rate, horizon, cac=cac, survival_lag=1)
+    total_clv_npv = clv["clv"]
+    ltv_cac_ratio = clv["ltv_cac"]
 
     # 4. RESULTS
     st.divider()
@@ -58,20 +61,12 @@ def run_step():
     c2.metric("LTV / CAC Ratio", f"{ltv_cac_ratio:.2f}x")
     
     # Payback estimate
-    payback_months = (cac / weighted_annual_margin) * 12 if weighted_annual_margin > 0 else 0
-    c3.metric("CAC Payback", f"{payback_months:.1f} Months")
+    c3.metric("CAC Payback", f"{payback_months(cac, weighted_annual_margin):.1f} Months")
 
     # 5. VISUALIZATION
     
-    df = pd.DataFrame(data)
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['Year'], y=df['Cumulative_NPV'], 
-                             name='Net Value per Customer', 
-                             line=dict(color='#00CC96', width=4)))
-    fig.add_hline(y=0, line_dash="dot", line_color="white")
-    fig.update_layout(title="NPV Timeline (Including Retention Discounts)", 
-                      xaxis_title="Years", yaxis_title="Net Value (€)", template="plotly_dark")
-    st.plotly_chart(fig, use_container_width=True)
+    cum_npv = cumulative_npv(weighted_annual_margin, churn_rate / 100, discount_rate, horizon, cac=cac, survival_lag=1)
+    charts.plotly_chart(npv_timeline_figure, cum_npv)
 
     # 6. STRATEGIC SIGNAL
     if repeat_margin <= 0:
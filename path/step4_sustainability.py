@@ -1,21 +1,25 @@
 import streamlit as st
 import pandas as pd
 
+from core.engine.sustainability import sustainability
+from core.system_state import get_baseline, get_metrics
+
 def run_step():
     st.header("🏢 Stage 4: Sustainability & Structural Break-Even")
     st.info("Annual analysis of fixed costs, debt, and inventory carrying costs.")
 
     # 1. DYNAMIC SYNC WITH STAGE 0 & STAGE 2
     # Fetching annual data to maintain consistency with Stage 1
-    p = st.session_state.get('price', 100.0)
-    vc = st.session_state.get('variable_cost', 60.0)
-    q_annual = st.session_state.get('volume', 1000.0)
+    base = get_baseline()
+    p = base.price
+    vc = base.variable_cost
+    q_annual = base.volume
     
     # Inventory carrying cost (Annual) from Stage 2
-    liquidity_drain_annual = st.session_state.get('liquidity_drain', 0.0)
+    metrics = get_metrics()
+    liquidity_drain_annual = metrics["liquidity_drain"]
     
-    unit_margin = p - vc
-    annual_revenue = p * q_annual
+    unit_margin = metrics["unit_margin"]
 
     st.write(f"**🔗 Linked to Global Data:** Annual Volume: {q_annual:,.0f} units | Unit Margin: {unit_margin:,.2f} €")
 
@@ -32,19 +36,13 @@ def run_step():
 
     # 3. CALCULATIONS (All Annual)
     total_fixed_costs = annual_rent + annual_salaries + annual_admin
-    ebit = (unit_margin * q_annual) - total_fixed_costs
-    
-    # Total obligations include fixed costs + debt repayment
-    total_annual_obligations = total_fixed_costs + annual_loan
     
-    # Break-Even Point in Units (Annual)
-    if unit_margin > 0:
-        be_units_annual = total_annual_obligations / unit_margin
-    else:
-        be_units_annual = 0
-
-    # Final Net Profit after inventory "Slow-Stock Penalty"
-    final_net_profit = ebit - annual_loan - liquidity_drain_annual
+    # Total obligations include fixed costs + debt repayment;
+    # Final Net Profit is taken after the inventory "Slow-Stock Penalty"
+    res = sustainability(p, vc, q_annual, total_fixed_costs, annual_loan, liquidity_drain_annual)
+    ebit = res["ebit"]
+    be_units_annual = res["be_units"]
+    final_net_profit = res["net_profit"]
 
     # 4. RESULTS DISPLAY
     st.divider()
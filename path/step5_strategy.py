@@ -1,14 +1,81 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
+
+from core.engine.monte_carlo import DEFAULT_VOLATILITY, SHOCK_KEYS, simulate_stress
+from core.engine.qspm import qspm_totals, weighted_scores
+from core.engine.stress import STANDARD_ANNUAL_BURN, stressed_profit
+from core.system_state import get_baseline, get_metrics
+from ui import charts
+from ui.qspm_robustness import show_weight_robustness
+
+SHOCK_LABELS = {
+    "volume": "Sales Volume", "price": "Price", "variable_cost": "Variable Cost", "fixed_cost": "Fixed Costs",
+    "ar_days": "Receivables Days", "inventory_days": "Inventory Days", "payables_days": "Payables Days",
+}
+
+def profit_histogram_figure(centers, probabilities, draws):
+    fig = go.Figure(go.Bar(x=centers, y=probabilities, marker_color="#636EFA", name="Profit"))
+    fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="Loss Threshold")
+    fig.update_layout(title=f"Distribution of Annual Profit ({draws:,} draws)", xaxis_title="Annual Profit (€)",
+                      yaxis_title="Probability", template="plotly_dark", bargap=0)
+    return fig
+
+def show_monte_carlo():
+    st.subheader("🎲 Monte Carlo Stress Test")
+    st.caption("Joint random shocks to every driver of the baseline. Annual burn = baseline fixed costs + debt service.")
+
+    with st.expander("⚙️ Shock Volatility (annual, 1σ)", expanded=False):
+        cols = st.columns(4)
+        volatility = {
+            key: cols[i % 4].slider(SHOCK_LABELS[key], 0, 50, int(DEFAULT_VOLATILITY[key] * 100), key=f"mc_vol_{key}") / 100
+            for i, key in enumerate(SHOCK_KEYS)
+        }
+        rho = st.slider("Volume ↔ Price Correlation", -0.9, 0.9, -0.3, 0.1,
+                        help="Negative: price increases coincide with volume losses.")
+
+    c1, c2 = st.columns(2)
+    draws = c1.selectbox("Number of Draws", [10_000, 100_000, 1_000_000, 2_000_000], index=2, format_func=lambda n: f"{n:,}")
+    seed = c2.number_input("Random Seed", min_value=0, value=42, step=1)
+
+    if not st.button("🎲 Run Simulation", use_container_width=True):
+        return
+
+    correlation = np.eye(len(SHOCK_KEYS))
+    iv, ip = SHOCK_KEYS.index("volume"), SHOCK_KEYS.index("price")
+    correlation[iv, ip] = correlation[ip, iv] = rho
+
+    res = simulate_stress(get_baseline(), draws=draws, volatility=volatility, correlation=correlation, seed=int(seed))
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Probability of Loss", f"{res['prob_loss']:.2%}")
+    m2.metric("Expected Profit", f"{res['expected_profit']:,.0f} €")
+    m3.metric("95% Profit Floor (VaR)", f"{-res['var']:,.0f} €")
+    m4.metric("Mean of Worst 5% (CVaR)", f"{-res['cvar']:,.0f} €")
+
+    st.table(pd.DataFrame({
+        "Percentile": [f"P{p}" for p in res["profit_percentiles"]],
+        "Annual Profit (€)": [f"{v:,.0f}" for v in res["profit_percentiles"].values()],
+        "Liquidity Gap (€)": [f"{v:,.0f}" for v in res["gap_percentiles"].values()],
+    }))
+
+    # Coarsen the streaming histogram for display
+    counts, edges = res["profit_histogram"]
+    step = len(counts) // 128
+    counts, edges = counts.reshape(128, step).sum(axis=1), edges[::step]
+    centers = (edges[:-1] + edges[1:]) / 2
+    charts.plotly_chart(profit_histogram_figure, centers, counts / counts.sum(), res["draws"])
 
 def run_step():
     st.header("🏁 Stage 5: Strategic Stress Test & Interactive QSPM")
     
     # 1. CORE DATA SYNC
-    p = st.session_state.get('price', 0.0)
-    vc = st.session_state.get('variable_cost', 0.0)
-    q = st.session_state.get('volume', 0.0)
-    liquidity_drain_annual = st.session_state.get('liquidity_drain', 0.0)
+    base = get_baseline()
+    p = base.price
+    vc = base.variable_cost
+    q = base.volume
+    liquidity_drain_annual = get_metrics()["liquidity_drain"]
     
     # 2. STRESS TEST (Analytical Resilience)
     st.subheader("🛠️ Model Stress Testing")
@@ -19,16 +86,19 @@ def run_step():
         inc_costs = st.slider("Increase in Variable Costs (%)", 0, 30, 10)
     
     # Annual Calculation including the Slow-Stock Penalty
-    total_annual_burn = (7000.0 * 12) + 12000.0 # Standard Baseline
-    stressed_q = q * (1 - drop_sales/100)
-    stressed_vc = vc * (1 + inc_costs/100)
-    stressed_profit = ((p - stressed_vc) * stressed_q) - total_annual_burn - liquidity_drain_annual
+    profit = stressed_profit(p, vc, q, drop_sales / 100, inc_costs / 100,
+                             annual_burn=STANDARD_ANNUAL_BURN, liquidity_drain=liquidity_drain_annual)
     
-    st.metric("Stress-Tested Annual Profit", f"{stressed_profit:,.2f} €", delta_color="inverse")
+    st.metric("Stress-Tested Annual Profit", f"{profit:,.2f} €", delta_color="inverse")
     st.caption(f"Includes -{liquidity_drain_annual:,.2f} € penalty for slow-moving inventory.")
 
     st.divider()
 
+    # 2b. MONTE CARLO STRESS TEST (Distribution of outcomes)
+    show_monte_carlo()
+
+    st.divider()
+
     # 3. INTERACTIVE QSPM
     st.subheader("🎯 Custom QSPM: Strategic Selection")
     st.write("Define your weights and rate the attractiveness of each strategy.")
@@ -72,23 +142,22 @@ def run_step():
         ("Brand Equity", w_brand, 3, 2)
     ]
 
-    qspm_list = []
-    for f, w, as_a, as_b in factors:
-        qspm_list.append({
-            "Key Factor": f,
-            "Weight": w,
-            "Scale (AS)": as_a, "Scale (TAS)": w * as_a,
-            "Efficiency (AS)": as_b, "Efficiency (TAS)": w * as_b
-        })
+    weights = [w for _, w, _, _ in factors]
+    scores = [[as_a, as_b] for _, _, as_a, as_b in factors]
+    tas = weighted_scores(weights, scores)
 
-    df_qspm = pd.DataFrame(qspm_list)
+    df_qspm = pd.DataFrame({
+        "Key Factor": [f for f, _, _, _ in factors],
+        "Weight": weights,
+        "Scale (AS)": [s[0] for s in scores], "Scale (TAS)": tas[:, 0],
+        "Efficiency (AS)": [s[1] for s in scores], "Efficiency (TAS)": tas[:, 1]
+    })
     st.table(df_qspm)
 
     
 
     # 4. FINAL VERDICT
-    total_tas_a = df_qspm["Scale (TAS)"].sum()
-    total_tas_b = df_qspm["Efficiency (TAS)"].sum()
+    total_tas_a, total_tas_b = qspm_totals(weights, scores)
     
     st.divider()
     res_a, res_b = st.columns(2)
@@ -100,6 +169,9 @@ def run_step():
     else:
         st.warning("⚖️ **The QSPM favors EFFICIENCY.** Risk mitigation and stock rotation should be your focus.")
 
+    with st.expander("🎲 How robust is this verdict to the weights?"):
+        show_weight_robustness(weights, scores, ["Scaling", "Efficiency"], key="step5_qspm")
+
     if st.button("🔄 Restart Lab Analysis", use_container_width=True):
         st.session_state.flow_step = 0
         st.rerun()
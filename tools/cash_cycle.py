@@ -6,6 +6,10 @@ Measures working capital efficiency and liquidity gap
 
 import streamlit as st
 
+from core.engine.cash_cycle import days_to_value, working_capital
+from core.system_state import get_baseline, update_baseline
+from ui.cash_ledger import show_cash_ledger
+
 
 def run_step():
     """Stage 2: Cash Conversion Cycle Analysis"""
@@ -16,12 +20,12 @@ def run_step():
     # ═══════════════════════════════════════════════════════════
     # 1. SYNC WITH SHARED CORE
     # ═══════════════════════════════════════════════════════════
-    q = st.session_state.get('volume', 1000)
-    vc = st.session_state.get('variable_cost', 12.0)
-    p = st.session_state.get('price', 20.0)
+    base = get_baseline()
+    q = base.volume
+    vc = base.variable_cost
+    p = base.price
     
     annual_cogs = q * vc 
-    days_in_year = 365
     
     st.write(f"**Global Baseline:** Annual COGS: {annual_cogs:,.2f} €")
     st.divider()
@@ -36,10 +40,10 @@ def run_step():
         inv_days = st.number_input(
             "Inventory Days", 
             min_value=0, 
-            value=st.session_state.get('inventory_days', 60),
+            value=base.inventory_days,
             help="Average days products sit in stock"
         )
-        inventory_value = (inv_days / days_in_year) * annual_cogs
+        inventory_value = days_to_value(inv_days, annual_cogs)
         st.caption(f"Stock Value: {inventory_value:,.2f} €")
     
     with col2:
@@ -47,10 +51,10 @@ def run_step():
         ar_days = st.number_input(
             "Accounts Receivable Days", 
             min_value=0, 
-            value=st.session_state.get('ar_days', 45),
+            value=base.ar_days,
             help="Average days to collect payment from customers"
         )
-        ar_value = (ar_days / days_in_year) * (p * q)
+        ar_value = days_to_value(ar_days, p * q)
         st.caption(f"Owed by Clients: {ar_value:,.2f} €")
     
     with col3:
@@ -58,17 +62,18 @@ def run_step():
         ap_days = st.number_input(
             "Accounts Payable Days", 
             min_value=0, 
-            value=st.session_state.get('payables_days', 30),
+            value=base.payables_days,
             help="Average days you take to pay suppliers"
         )
-        ap_value = (ap_days / days_in_year) * annual_cogs
+        ap_value = days_to_value(ap_days, annual_cogs)
         st.caption(f"Owed to Suppliers: {ap_value:,.2f} €")
     
     # ═══════════════════════════════════════════════════════════
     # 3. CALCULATIONS
     # ═══════════════════════════════════════════════════════════
-    ccc = inv_days + ar_days - ap_days
-    working_capital_req = inventory_value + ar_value - ap_value
+    wc = working_capital(p, q, vc, inv_days, ar_days, ap_days)
+    ccc = wc["ccc"]
+    working_capital_req = wc["liquidity_gap"]
     
     # ═══════════════════════════════════════════════════════════
     # 4. RESULTS & SYNC
@@ -82,8 +87,8 @@ def run_step():
         
         st.metric(
             "Cash Conversion Cycle", 
-            f"{ccc} Days", 
-            delta=f"{ccc} days delay", 
+            f"{ccc:.0f} Days", 
+            delta=f"{ccc:.0f} days delay", 
             delta_color="inverse"
         )
         st.markdown(f"Status: :{color}[{status}]")
@@ -92,22 +97,24 @@ def run_step():
         st.metric("Liquidity Gap (€)", f"{working_capital_req:,.2f} €")
         
         # Save to session state
-        st.session_state.inventory_days = inv_days
-        st.session_state.ar_days = ar_days
-        st.session_state.payables_days = ap_days
-        st.session_state.ccc = ccc
-        st.session_state.working_capital_req = working_capital_req
+        update_baseline(inventory_days=inv_days, ar_days=ar_days, payables_days=ap_days)
     
     st.divider()
     
     # ═══════════════════════════════════════════════════════════
     # 5. COLD INSIGHT
     # ═══════════════════════════════════════════════════════════
-    daily_cash_release = annual_cogs / 365
+    daily_cash_release = wc["daily_cash_release"]
     st.info(f"💡 **Cold Insight:** Every day you reduce the CCC, you release ~{daily_cash_release:,.2f} € in cash.")
     
     # ═══════════════════════════════════════════════════════════
-    # 6. NAVIGATION
+    # 6. DAILY CASH LEDGER
+    # ═══════════════════════════════════════════════════════════
+    st.divider()
+    show_cash_ledger(p, q, vc, inv_days, ar_days, ap_days, fixed_cost=base.fixed_cost)
+    
+    # ═══════════════════════════════════════════════════════════
+    # 7. NAVIGATION
     # ═══════════════════════════════════════════════════════════
     st.divider()
     nav1, nav2 = st.columns(2)
@@ -1,12 +1,16 @@
 import streamlit as st
 
+from core.engine.stress import survival_days
+from core.system_state import get_baseline
+
 def show_cash_fragility_index():
     st.header("🛡️ Cash Fragility Index")
     st.info("Stress Test: How many days can the business survive if all inflows (collections) stop today?")
 
     # 1. READ FROM CORE (Shared Data)
     # Χρειαζόμαστε τα Fixed Costs για να ξέρουμε τα καθημερινά έξοδα
-    fixed_costs_annual = st.session_state.get('fixed_cost', 0.0)
+    base = get_baseline()
+    fixed_costs_annual = base.fixed_cost
     daily_burn_rate = fixed_costs_annual / 365
 
     st.write(f"**Baseline Fixed Costs:** {fixed_costs_annual:,.2f} €/year")
@@ -24,10 +28,7 @@ def show_cash_fragility_index():
     total_liquidity = current_cash + unused_credit_lines
 
     # 3. CALCULATIONS
-    if daily_burn_rate > 0:
-        days_to_zero = total_liquidity / daily_burn_rate
-    else:
-        days_to_zero = float('inf')
+    days_to_zero = survival_days(total_liquidity, fixed_costs_annual)
 
     # 4. RESULTS
     st.subheader("Survival Runway")
@@ -1,39 +1,64 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from core.engine.arrays import outer_grid
+from core.engine.clv import clv_surface, cumulative_npv
+from core.engine.memo import memoize
+from core.system_state import get_baseline
+
+@memoize
 def get_clv_data(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac):
-    # Adjusted discount rate for risk
+    res = clv_surface(purchases, margin_per_order, retention_years, discount, churn, realization, risk_p, cac)
+    payback = int(res["payback_year"]) or None
+
+    # Yearly timeline for the projection chart
     adj_disc = (discount / 100) + (risk_p / 100)
-    churn_rate = churn / 100
-    cum_npv = -cac
-    data = []
-    payback = None
-    
-    # Yearly projection based on lifespan (retention_years)
-    for t in range(1, int(retention_years) + 1):
-        # Survival probability: (1 - churn)^t
-        survival = (1 - churn_rate) ** t
-        # Realized cash flow after risk and survival
-        annual_flow = (purchases * margin_per_order * realization) * survival
-        # Discounted to present value
-        discounted_flow = annual_flow / ((1 + adj_disc) ** t)
-        
-        cum_npv += discounted_flow
-        data.append({"Year": t, "Cumulative_NPV": cum_npv})
-        
-        if cum_npv >= 0 and payback is None:
-            payback = t
-            
-    return pd.DataFrame(data), cum_npv, payback
+    cum_npv = cumulative_npv(purchases * margin_per_order * realization, churn / 100, adj_disc, retention_years, cac=cac)
+    df = pd.DataFrame({"Year": range(1, len(cum_npv) + 1), "Cumulative_NPV": cum_npv})
+    return df, res["npv"], payback
+
+def show_clv_surface(purch, margin, horizon, disc, churn, real, risk_p, cac):
+    """Sensitivity surface: any two CLV drivers swept at once, the rest held at the scenario."""
+    axes = {
+        "Annual Churn (%)": ("churn", np.arange(0, 51, 2)),
+        "Base Discount Rate (%)": ("disc", np.arange(0, 31, 1)),
+        "Customer Risk Premium (%)": ("risk_p", np.arange(0, 16, 1)),
+        "Analysis Horizon (Years)": ("horizon", np.arange(1, 16)),
+        "Margin / Order (€)": ("margin", np.linspace(0.25, 2.0, 15) * margin),
+    }
+    metrics = {"NPV CLV (€)": "npv", "LTV / CAC (x)": "ltv_cac", "Payback Year": "payback_year"}
+
+    c1, c2, c3 = st.columns(3)
+    x_label = c1.selectbox("X Axis", list(axes), index=0)
+    y_label = c2.selectbox("Y Axis", [a for a in axes if a != x_label], index=0)
+    metric = c3.selectbox("Metric", list(metrics))
+
+    params = {"purch": purch, "margin": margin, "horizon": horizon, "disc": disc,
+              "churn": churn, "real": real, "risk_p": risk_p, "cac": cac}
+    (x_key, x_vals), (y_key, y_vals) = axes[x_label], axes[y_label]
+    params[y_key], params[x_key] = outer_grid(y_vals, x_vals)
+
+    res = clv_surface(params["purch"], params["margin"], params["horizon"], params["disc"],
+                          params["churn"], params["real"], params["risk_p"], params["cac"])
+    z = np.broadcast_to(res[metrics[metric]], (len(y_vals), len(x_vals)))
+
+    fig = go.Figure(go.Heatmap(x=x_vals, y=y_vals, z=z, colorscale="RdYlGn", colorbar=dict(title=metric)))
+    if metrics[metric] == "npv":
+        fig.add_trace(go.Contour(x=x_vals, y=y_vals, z=z, contours=dict(start=0, end=0, coloring="none"),
+                                 line=dict(color="white", width=2), showscale=False, name="Break-even"))
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label, height=500, template="plotly_dark")
+    st.plotly_chart(fig, use_container_width=True)
 
 def show_clv_calculator():
     st.header("👥 Executive CLV Simulator")
     st.info("Advanced Customer Lifetime Value modeling: Syncing Unit Economics with Risk-Adjusted NPV.")
 
     # 1. SYNC WITH SHARED CORE (The "Cold" Baseline)
-    p = st.session_state.get('price', 100.0)
-    vc = st.session_state.get('variable_cost', 60.0)
+    base = get_baseline()
+    p = base.price
+    vc = base.variable_cost
     unit_margin = p - vc
     
     st.write(f"**🔗 Core Baseline Linked:** Margin/Unit: **{unit_margin:,.2f} €** (Price: {p}€ | VC: {vc}€)")
@@ -114,3 +139,9 @@ def show_clv_calculator():
     
     fig.update_layout(xaxis_title="Years", yaxis_title="Cumulative NPV (€)", height=450, template="plotly_dark")
     st.plotly_chart(fig, use_container_width=True)
+
+    # 8. SENSITIVITY SURFACE
+    st.divider()
+    st.subheader("🗺️ Sensitivity Surface (Scenario B)")
+    st.caption("Every cell is a full risk-adjusted CLV evaluation; payback year 0 means the customer never pays back within the horizon.")
+    show_clv_surface(purch_b, margin_b, horizon, disc, churn_b, real, risk_p, cac_b)
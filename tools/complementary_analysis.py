@@ -1,45 +1,77 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
+
+from core.basket import BASKET_COLUMNS, load_basket
+from core.batch import table_columns
+from core.engine.complements import attach_rate_sensitivity, bundle_volume_increase, expected_complement_profit
+from core.engine.operations import top_n
+from core.formatting import format_numbers, format_percent, parse_numbers
+from ui import charts
+from ui.uploads import pick_column
+
+DISCOUNT_GRID = np.round(np.arange(0.01, 0.405, 0.01), 2)
+TOP_COMPLEMENTS = 15
 
 # -----------------------
 # Utilities
 # -----------------------
 
-def parse_number(number_str):
-    try:
-        return float(str(number_str).replace(",", ""))
-    except:
-        return 0.0
-
-def format_percentage(number, decimals=2):
-    return f"{number:.{decimals}f}%"
+def required_growth_figure(discounts, with_cross_sell, core_only, current):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=discounts * 100, y=with_cross_sell, name="With Cross-Sell", line=dict(color="#00CC96", width=3)))
+    fig.add_trace(go.Scatter(x=discounts * 100, y=core_only, name="Core Product Only", line=dict(color="#EF553B", dash="dot")))
+    fig.add_vline(x=current * 100, line_dash="dot", line_color="white")
+    fig.update_layout(xaxis_title="Discount (%)", yaxis_title="Required Volume Growth (%)", height=400, template="plotly_dark")
+    return fig
 
 # -----------------------
-# Core Calculation
+# Complement Inputs
 # -----------------------
 
-def calculate_required_sales_increase(
-    suit_price, price_decrease_pct, profit_suit,
-    profit_shirt, profit_tie, profit_belt, profit_shoes,
-    p_shirt, p_tie, p_belt, p_shoes
-):
-    # Expected profit from complements per main unit sold
-    expected_complement_profit = (
-        p_shirt * profit_shirt +
-        p_tie * profit_tie +
-        p_belt * profit_belt +
-        p_shoes * profit_shoes
-    )
-
-    total_profit_per_main_unit = profit_suit + expected_complement_profit
+def classic_complements():
+    st.subheader("Complementary Profits (€)")
+    prof_shirt = st.number_input("Profit: Shirt", value=13.0)
+    prof_tie = st.number_input("Profit: Tie", value=11.0)
+    prof_belt = st.number_input("Profit: Belt", value=11.0)
+    prof_shoes = st.number_input("Profit: Shoes", value=45.0)
+
+    st.divider()
+    st.subheader("Attach Rates (Probabilities)")
+    prob_shirt = st.slider("Shirt Attach Rate (%)", 0, 100, 90) / 100
+    prob_tie = st.slider("Tie Attach Rate (%)", 0, 100, 70) / 100
+    prob_belt = st.slider("Belt Attach Rate (%)", 0, 100, 10) / 100
+    prob_shoes = st.slider("Shoes Attach Rate (%)", 0, 100, 5) / 100
+
+    return pd.DataFrame({
+        "Name": ["Shirt", "Tie", "Belt", "Shoes"],
+        "AttachRate": [prob_shirt, prob_tie, prob_belt, prob_shoes],
+        "UnitProfit": [prof_shirt, prof_tie, prof_belt, prof_shoes],
+    })
+
+def basket_file():
+    st.subheader("Basket File")
+    st.caption("One row per attached complement: name, attach rate and unit profit.")
+    upload = st.file_uploader("Basket file", type=["csv", "parquet", "pq"])
+    if upload is None:
+        return None
+
+    try:
+        columns = table_columns(upload)
+    except (ImportError, ValueError) as e:
+        st.error(f"⚠️ Cannot read file: {e}")
+        return None
+
+    name_col = pick_column(st, "Complement Column", columns, BASKET_COLUMNS["name"], 0)
+    attach_col = pick_column(st, "Attach Rate Column", columns, BASKET_COLUMNS["attach"], 1)
+    profit_col = pick_column(st, "Unit Profit Column", columns, BASKET_COLUMNS["profit"], 2)
+    in_percent = st.checkbox("Attach rates are in % (0-100)", value=False)
 
     try:
-        # Indifference point formula for total profit maintenance
-        required_increase = -price_decrease_pct / (
-            (total_profit_per_main_unit / suit_price) + price_decrease_pct
-        )
-        return required_increase * 100
-    except ZeroDivisionError:
+        return load_basket(upload, name_col, attach_col, profit_col, attach_in_percent=in_percent)
+    except (ImportError, ValueError, KeyError) as e:
+        st.error(f"⚠️ Cannot process basket: {e}")
         return None
 
 # -----------------------
@@ -53,40 +85,32 @@ def show_complementary_analysis():
     # SIDEBAR: All Financial Inputs
     with st.sidebar:
         st.subheader("Core Product (Main)")
-        s_price = st.text_input("Main Unit Price (€)", "200.00")
-        s_profit = st.text_input("Main Unit Profit (€)", "60.00")
+        s_price = st.text_input("Main Unit Price (€)", format_numbers(200.0))
+        s_profit = st.text_input("Main Unit Profit (€)", format_numbers(60.0))
         s_discount = st.slider("Proposed Discount (%)", 0.0, 40.0, 10.0) / 100
 
         st.divider()
-        st.subheader("Complementary Profits (€)")
-        prof_shirt = st.number_input("Profit: Shirt", value=13.0)
-        prof_tie = st.number_input("Profit: Tie", value=11.0)
-        prof_belt = st.number_input("Profit: Belt", value=11.0)
-        prof_shoes = st.number_input("Profit: Shoes", value=45.0)
-
-        st.divider()
-        st.subheader("Attach Rates (Probabilities)")
-        prob_shirt = st.slider("Shirt Attach Rate (%)", 0, 100, 90) / 100
-        prob_tie = st.slider("Tie Attach Rate (%)", 0, 100, 70) / 100
-        prob_belt = st.slider("Belt Attach Rate (%)", 0, 100, 10) / 100
-        prob_shoes = st.slider("Shoes Attach Rate (%)", 0, 100, 5) / 100
+        input_mode = st.radio("Complements", ["Classic Bundle (4 items)", "Basket File (CSV / Parquet)"])
+        basket = classic_complements() if input_mode.startswith("Classic") else basket_file()
 
         run = st.button("Run Impact Analysis")
 
     # MAIN SCREEN: Results
     if run:
+        if basket is None or basket.empty:
+            st.error("⚠️ Load a basket file with at least one complement first.")
+            return
+
         # Data Parsing
-        price = parse_number(s_price)
-        profit_base = parse_number(s_profit)
+        price = parse_numbers(s_price, default=0.0)
+        profit_base = parse_numbers(s_profit, default=0.0)
         discount = -abs(s_discount)
+        attach = basket["AttachRate"].to_numpy()
+        profits = basket["UnitProfit"].to_numpy()
 
-        result = calculate_required_sales_increase(
-            price, discount, profit_base,
-            prof_shirt, prof_tie, prof_belt, prof_shoes,
-            prob_shirt, prob_tie, prob_belt, prob_shoes
-        )
+        result = bundle_volume_increase(price, discount, profit_base, attach, profits)
 
-        if result is None or result < 0:
+        if np.isnan(result):
             st.error("🔴 Strategic Deficit: The proposed discount collapses the margin beyond recovery.")
             return
 
@@ -94,11 +118,10 @@ def show_complementary_analysis():
         st.subheader("📊 Strategic Indifference Point")
         c1, c2, c3 = st.columns(3)
         
-        expected_cross_sell = (prob_shirt * prof_shirt + prob_tie * prof_tie + 
-                               prob_belt * prof_belt + prob_shoes * prof_shoes)
+        expected_cross_sell = expected_complement_profit(attach, profits)
         
-        c1.metric("Required Volume Growth", format_percentage(result))
-        c2.metric("Avg. Cross-Sell Profit", f"€{expected_cross_sell:.2f}")
+        c1.metric("Required Volume Growth", format_percent(result, 2, ratio=False))
+        c2.metric("Avg. Cross-Sell Profit", f"€{expected_cross_sell:.2f}", f"{len(basket):,} complements", delta_color="off")
         c3.metric("Total Margin / Bundle", f"€{(profit_base + expected_cross_sell):.2f}")
 
         # 2. Impact Table
@@ -116,7 +139,29 @@ def show_complementary_analysis():
         })
         st.table(impact_df)
 
-        # 3. Visual Context
+        # 3. Discount Grid (one call for every discount level)
+        st.divider()
+        st.subheader("🎚️ Required Growth Across Discounts")
+        with_cross_sell = bundle_volume_increase(price, DISCOUNT_GRID, profit_base, attach, profits)
+        core_only = bundle_volume_increase(price, DISCOUNT_GRID, profit_base, 0.0, 0.0)
+        charts.plotly_chart(required_growth_figure, DISCOUNT_GRID, with_cross_sell, core_only, abs(discount))
+        st.caption("Gaps in the curves mark discounts that wipe out the whole margin: no volume growth can offset them.")
+
+        # 4. Complement Drivers
+        st.subheader(f"🧩 Top {min(TOP_COMPLEMENTS, len(basket))} Complements by Expected Profit")
+        contribution = attach * profits
+        top = top_n(contribution, TOP_COMPLEMENTS)
+        sensitivity = attach_rate_sensitivity(price, discount, profit_base, attach, profits)
+        st.table(pd.DataFrame({
+            "Complement": basket["Name"].to_numpy()[top],
+            "Attach Rate": attach[top],
+            "Unit Profit (€)": profits[top],
+            "Expected Profit (€)": contribution[top],
+            "Growth Needed per +1pp Attach": sensitivity[top],
+        }).style.format({"Attach Rate": "{:.1%}", "Unit Profit (€)": "{:,.2f}", "Expected Profit (€)": "{:,.2f}",
+                         "Growth Needed per +1pp Attach": "{:+.3f} pp"}))
+
+        # 5. Visual Context
         st.divider()
         st.subheader("💡 Strategic Assessment")
         
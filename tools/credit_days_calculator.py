@@ -1,17 +1,115 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from core.batch import table_columns
+from core.engine.operations import calculate_weighted_average
+from core.formatting import format_frame
+from core.receivables import LEDGER_COLUMNS, ingest_receivables
+from ui import charts
+from ui.uploads import pick_column
+
+PARETO_DISPLAY_LIMIT = 25  # segments drawn / listed; totals always cover the full ledger
+
+# -----------------------------------------
+# VISUALIZATION
+# -----------------------------------------
+def draw_receivables_pareto(fig, categories, amounts, cumulative_pct):
+    ax1 = fig.subplots()
+    # Bar chart
+    ax1.bar(categories, amounts, color="#1f77b4", label="Debt Amount")
+    ax1.set_ylabel("Debt Amount (€)")
+    
+    # Cumulative line
+    ax2 = ax1.twinx()
+    ax2.plot(categories, cumulative_pct, color="#d62728", marker="D", ms=7, label="Cumulative %")
+    ax2.axhline(y=80, color='gray', linestyle='--') # 80% threshold
+    ax2.set_ylabel("Cumulative Percentage (%)")
+    ax2.set_ylim(0, 110)
+
+    ax1.set_title("Receivables Concentration (Pareto)")
 
 # -----------------------------------------
-# LOGIC
+# ANALYSIS (shared by manual entry and ledger upload)
 # -----------------------------------------
-def calculate_weighted_average(amounts, credit_days):
-    total_amount = sum(amounts)
-    if total_amount == 0:
-        return 0, 0.0
-    weighted_sum = sum(a * d for a, d in zip(amounts, credit_days))
-    weighted_avg = weighted_sum / total_amount
-    return total_amount, weighted_avg
+def show_receivables_analysis(df, total_amount, weighted_avg):
+    # 1. CORE METRICS
+    st.divider()
+    m1, m2 = st.columns(2)
+    m1.metric("Total Receivables", f"€ {total_amount:,.0f}".replace(",", "."))
+    m2.metric("Weighted Avg. Days", f"{weighted_avg:.1f} Days")
+
+    # 2. PARETO DATA PREPARATION
+    df = df.sort_values(by="Amount", ascending=False)
+    df["Weight %"] = (df["Amount"] / total_amount) * 100
+    df["Cumulative %"] = df["Weight %"].cumsum()
+    top = df.head(PARETO_DISPLAY_LIMIT)
+
+    # 3. PARETO CHART
+    st.subheader("📈 Pareto Exposure Chart")
+    st.caption("Identify the 'Vital Few' segments that constitute the majority of your debt.")
+    if len(df) > len(top):
+        st.caption(f"Showing the top {len(top)} of {len(df):,} segments.")
+    
+    
+    
+    charts.pyplot(draw_receivables_pareto, top["Category"].astype(str).tolist(),
+                  top["Amount"].to_numpy(dtype=float), top["Cumulative %"].to_numpy(dtype=float))
+
+    # 4. PARETO TABLE
+    st.subheader("📋 Concentration Table")
+    st.table(format_frame(top, {"Amount": "{:,.0f} €", "Days": "{:.1f}", "Weight %": "{:.1f}%", "Cumulative %": "{:.1f}%"}))
+
+    # 5. MANAGERIAL VERDICT
+    st.divider()
+    core = df[df["Cumulative %"] <= 85]
+    key_segments = core["Category"].astype(str).tolist()
+    listed = ', '.join(key_segments[:10]) + (f" and {len(key_segments) - 10:,} more" if len(key_segments) > 10 else "")
+    
+    st.markdown("### 🧠 Strategic Verdict")
+    st.write(f"The following segments constitute **over 80%** of your total exposure: **{listed}**.")
+    
+    # Checking if high-volume customers pay late
+    avg_days_top = core["Days"].mean()
+    if avg_days_top > weighted_avg:
+        st.error(f"⚠️ **High-Risk Concentration:** Your core debtors (top 80%) have a collection period ({avg_days_top:.1f} days) higher than the average. Your liquidity is overly dependent on these specific accounts.")
+    else:
+        st.success("✅ **Balanced Risk:** Your primary debtors have collection terms that align with or are faster than your average.")
+
+# -----------------------------------------
+# LEDGER UPLOAD
+# -----------------------------------------
+def show_ledger_upload():
+    st.subheader("📥 Receivables Ledger")
+    st.caption("One row per open invoice. The file is streamed in chunks, so ledgers of any length are supported.")
+    upload = st.file_uploader("Invoice-level ledger", type=["csv", "parquet", "pq"])
+    if upload is None:
+        return
+
+    try:
+        columns = table_columns(upload)
+    except (ImportError, ValueError) as e:
+        st.error(f"⚠️ Cannot read file: {e}")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    segment_col = pick_column(c1, "Segment / Customer Column", columns, LEDGER_COLUMNS["segment"], 0)
+    amount_col = pick_column(c2, "Open Amount Column (€)", columns, LEDGER_COLUMNS["amount"], 1)
+    days_col = pick_column(c3, "Credit Days Column", columns, LEDGER_COLUMNS["days"], 2)
+
+    if st.button("📊 Run Analytical Engine", type="primary"):
+        try:
+            with st.spinner("Streaming ledger..."):
+                segments, total_amount, weighted_avg = ingest_receivables(upload, segment_col, amount_col, days_col)
+        except (ImportError, ValueError, KeyError) as e:
+            st.error(f"⚠️ Cannot process ledger: {e}")
+            return
+
+        if total_amount == 0:
+            st.error("⚠️ The ledger holds no open amounts.")
+            return
+
+        st.caption(f"{int(segments['Invoices'].sum()):,} invoices across {len(segments):,} segments.")
+        show_receivables_analysis(segments.reset_index(), total_amount, weighted_avg)
 
 # -----------------------------------------
 # UI
@@ -22,10 +120,16 @@ def show_credit_days_calculator():
 
     with st.sidebar:
         st.subheader("Configuration")
-        num_categories = st.number_input("Number of customer categories", min_value=1, max_value=15, value=5)
+        input_mode = st.radio("Input Mode", ["Manual Entry", "Upload Ledger (CSV / Parquet)"])
+        if input_mode == "Manual Entry":
+            num_categories = st.number_input("Number of customer categories", min_value=1, max_value=15, value=5)
         st.divider()
         st.info("Pareto Analysis (80/20) helps identify which key accounts dominate your credit exposure.")
 
+    if input_mode != "Manual Entry":
+        show_ledger_upload()
+        return
+
     st.subheader("📥 Input Data")
     names, customers, amounts, credit_days = [], [], [], []
 
@@ -49,60 +153,12 @@ def show_credit_days_calculator():
             st.error("⚠️ Enter values to generate analysis.")
             return
 
-        # 1. CORE METRICS
-        st.divider()
-        m1, m2 = st.columns(2)
-        m1.metric("Total Receivables", f"€ {total_amount:,.0f}".replace(",", "."))
-        m2.metric("Weighted Avg. Days", f"{weighted_avg:.1f} Days")
-
-        # 2. PARETO DATA PREPARATION
         df = pd.DataFrame({
             "Category": names,
             "Amount": amounts,
             "Days": credit_days
-        }).sort_values(by="Amount", ascending=False)
-
-        df["Weight %"] = (df["Amount"] / total_amount) * 100
-        df["Cumulative %"] = df["Weight %"].cumsum()
-
-        # 3. PARETO CHART
-        st.subheader("📈 Pareto Exposure Chart")
-        st.caption("Identify the 'Vital Few' segments that constitute the majority of your debt.")
-        
-        
-        
-        fig, ax1 = plt.subplots(figsize=(10, 5))
-        # Bar chart
-        ax1.bar(df["Category"], df["Amount"], color="#1f77b4", label="Debt Amount")
-        ax1.set_ylabel("Debt Amount (€)")
-        
-        # Cumulative line
-        ax2 = ax1.twinx()
-        ax2.plot(df["Category"], df["Cumulative %"], color="#d62728", marker="D", ms=7, label="Cumulative %")
-        ax2.axhline(y=80, color='gray', linestyle='--') # 80% threshold
-        ax2.set_ylabel("Cumulative Percentage (%)")
-        ax2.set_ylim(0, 110)
-
-        plt.title("Receivables Concentration (Pareto)")
-        st.pyplot(fig)
-
-        # 4. PARETO TABLE
-        st.subheader("📋 Concentration Table")
-        st.table(df.style.format({"Amount": "{:,.0f} €", "Weight %": "{:.1f}%", "Cumulative %": "{:.1f}%"}))
-
-        # 5. MANAGERIAL VERDICT
-        st.divider()
-        key_segments = df[df["Cumulative %"] <= 85]["Category"].tolist()
-        
-        st.markdown("### 🧠 Strategic Verdict")
-        st.write(f"The following segments constitute **over 80%** of your total exposure: **{', '.join(key_segments)}**.")
-        
-        # Checking if high-volume customers pay late
-        avg_days_top = df[df["Cumulative %"] <= 85]["Days"].mean()
-        if avg_days_top > weighted_avg:
-            st.error(f"⚠️ **High-Risk Concentration:** Your core debtors (top 80%) have a collection period ({avg_days_top:.1f} days) higher than the average. Your liquidity is overly dependent on these specific accounts.")
-        else:
-            st.success("✅ **Balanced Risk:** Your primary debtors have collection terms that align with or are faster than your average.")
+        })
+        show_receivables_analysis(df, total_amount, weighted_avg)
 
 if __name__ == "__main__":
     show_credit_days_calculator()
@@ -1,15 +1,19 @@
 import streamlit as st
 
+from core.engine.cash_cycle import days_to_value
+from core.system_state import get_baseline, update_baseline
+
 def show_credit_policy_analysis():
     st.header("💳 Credit Policy Analysis")
     st.info("Analyze the financial impact of changing your payment terms for customers.")
 
     # 1. SYNC WITH SHARED CORE
     # Χρειαζόμαστε τον ετήσιο τζίρο (Revenue)
-    p = st.session_state.get('price', 20.0)
-    q = st.session_state.get('volume', 1000)
+    base = get_baseline()
+    p = base.price
+    q = base.volume
     annual_revenue = p * q
-    current_ar_days = st.session_state.get('ar_days', 45)
+    current_ar_days = base.ar_days
     
     st.write(f"**Current Baseline:** Annual Revenue: {annual_revenue:,.2f} € | Current Terms: {current_ar_days} days")
 
@@ -20,13 +24,13 @@ def show_credit_policy_analysis():
     with col1:
         st.subheader("Current Policy")
         st.write(f"Days: {current_ar_days}")
-        current_ar_value = (current_ar_days / 365) * annual_revenue
+        current_ar_value = days_to_value(current_ar_days, annual_revenue)
         st.metric("Capital Locked", f"{current_ar_value:,.2f} €")
 
     with col2:
         st.subheader("Proposed Policy")
         new_ar_days = st.slider("New Credit Terms (Days)", 0, 180, 60)
-        new_ar_value = (new_ar_days / 365) * annual_revenue
+        new_ar_value = days_to_value(new_ar_days, annual_revenue)
         st.metric("New Capital Locked", f"{new_ar_value:,.2f} €")
 
     # 3. IMPACT ANALYSIS
@@ -63,6 +67,6 @@ def show_credit_policy_analysis():
         st.success(f"Shortening credit terms by {current_ar_days - new_ar_days} days improves your survival runway immediately.")
 
     if st.button("🔄 Update Global Credit Days"):
-        st.session_state.ar_days = new_ar_days
+        update_baseline(ar_days=new_ar_days)
         st.success("Global AR Days updated!")
         st.rerun()
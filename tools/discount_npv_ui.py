@@ -1,79 +1,62 @@
 import streamlit as st
-from decimal import Decimal, getcontext
+import numpy as np
 import pandas as pd
-
-# --- CALCULATION LOGIC (Preserving your exact logic) ---
-def calculate_discount_npv(
-    current_sales, extra_sales, discount_trial, prc_clients_take_disc,
-    days_curently_paying_clients_take_discount, days_curently_paying_clients_not_take_discount,
-    new_days_payment_clients_take_disc, cogs, wacc, avg_days_pay_suppliers
-):
-    getcontext().prec = 20
-
-    prc_clients_not_take_disc = 1 - prc_clients_take_disc
-    avg_current_collection_days = (
-        prc_clients_take_disc * days_curently_paying_clients_take_discount +
-        prc_clients_not_take_disc * days_curently_paying_clients_not_take_discount
-    )
-    current_receivables = current_sales * avg_current_collection_days / 365
-
-    total_sales = current_sales + extra_sales
-    prcnt_new_policy = ((current_sales * prc_clients_take_disc) + extra_sales) / total_sales
-    prcnt_old_policy = 1 - prcnt_new_policy
-
-    new_avg_collection_period = (
-        prcnt_new_policy * new_days_payment_clients_take_disc +
-        prcnt_old_policy * days_curently_paying_clients_not_take_discount
-    )
-    new_receivables = total_sales * new_avg_collection_period / 365
-    free_capital = current_receivables - new_receivables
-
-    profit_from_extra_sales = extra_sales * (1 - cogs / current_sales)
-    profit_from_free_capital = free_capital * wacc
-    discount_cost = total_sales * prcnt_new_policy * discount_trial
-
-    i = wacc / 365
-
-    inflow = (
-        total_sales * prcnt_new_policy * (1 - discount_trial) /
-        ((1 + i) ** new_days_payment_clients_take_disc)
-    )
-    inflow += total_sales * prcnt_old_policy / ((1 + i) ** days_curently_paying_clients_not_take_discount)
-
-    outflow = (
-        (cogs / current_sales) * (extra_sales / current_sales) * current_sales /
-        ((1 + i) ** avg_days_pay_suppliers)
-    )
-    outflow += current_sales / ((1 + i) ** avg_current_collection_days)
-
-    npv = inflow - outflow
-
-    # Threshold & Optimum Calculations
-    max_discount = 1 - (
-        (1 + i) ** (new_days_payment_clients_take_disc - days_curently_paying_clients_not_take_discount) * (
-            (1 - 1 / prcnt_new_policy) + (
-                (1 + i) ** (days_curently_paying_clients_not_take_discount - avg_current_collection_days) +
-                (cogs / current_sales) * (extra_sales / current_sales) *
-                (1 + i) ** (days_curently_paying_clients_not_take_discount - avg_days_pay_suppliers)
-            ) / (prcnt_new_policy * (1 + extra_sales / current_sales))
-        )
-    )
-
-    optimum_discount = (1 - ((1 + i) ** (new_days_payment_clients_take_disc - avg_current_collection_days))) / 2
-
-    return {
-        "avg_current_collection_days": round(avg_current_collection_days, 2),
-        "current_receivables": round(current_receivables, 2),
-        "prcnt_new_policy": round(prcnt_new_policy, 4),
-        "new_avg_collection_period": round(new_avg_collection_period, 2),
-        "free_capital": round(free_capital, 2),
-        "profit_from_extra_sales": round(profit_from_extra_sales, 2),
-        "profit_from_free_capital": round(profit_from_free_capital, 2),
-        "discount_cost": round(discount_cost, 2),
-        "npv": round(npv, 2),
-        "max_discount": round(max_discount * 100, 2),
-        "optimum_discount": round(optimum_discount * 100, 2),
-    }
+import plotly.graph_objects as go
+
+from core.engine.arrays import outer_grid
+from core.engine.discount import allocate_discount_takers, calculate_discount_npv, discount_npv_surface
+from core.system_state import get_baseline
+
+# --- SURFACE MODE ---
+# label: (policy key, grid values, display multiplier)
+SURFACE_AXES = {
+    "Proposed Discount (%)": ("discount", np.arange(0, 10.25, 0.25) / 100, 100),
+    "Take-up (% of Revenue)": ("take", np.arange(0, 101, 2.5) / 100, 100),
+    "Discount Days": ("days", np.arange(0, 61, 2), 1),
+    "WACC (%)": ("wacc", np.arange(1, 41, 1) / 100, 100),
+}
+SURFACE_METRICS = {
+    "NPV (€)": "npv",
+    "Free Capital (€)": "free_capital",
+    "Max Sustainable Discount (%)": "max_discount",
+    "Optimum Discount (%)": "optimum_discount",
+}
+
+def evaluate_policy_grid(current_sales, extra_sales, cogs, supplier_days, segments, allocation_mode,
+                         discount, take, days, wacc):
+    """Discount-policy KPIs over any broadcastable mix of discount / take-up / days / WACC arrays."""
+    eff_take, eff_no_take = allocate_discount_takers(segments, take, allocation_mode)
+    return discount_npv_surface(current_sales, extra_sales, discount, take, eff_take, eff_no_take,
+                                days, cogs, wacc, supplier_days)
+
+def show_discount_surface(current_sales, extra_sales, cogs, supplier_days, segments, allocation_mode, policy):
+    c1, c2, c3 = st.columns(3)
+    x_label = c1.selectbox("X Axis", list(SURFACE_AXES), index=0)
+    y_label = c2.selectbox("Y Axis", [a for a in SURFACE_AXES if a != x_label], index=0)
+    metric = c3.selectbox("Metric", list(SURFACE_METRICS))
+
+    (x_key, x_vals, x_mult), (y_key, y_vals, y_mult) = SURFACE_AXES[x_label], SURFACE_AXES[y_label]
+    params = dict(policy)
+    params[y_key], params[x_key] = outer_grid(y_vals, x_vals)
+    res = evaluate_policy_grid(current_sales, extra_sales, cogs, supplier_days, segments, allocation_mode, **params)
+
+    key = SURFACE_METRICS[metric]
+    z = np.broadcast_to(res[key] * (100 if key in ("max_discount", "optimum_discount") else 1), (len(y_vals), len(x_vals)))
+    x_show, y_show = x_vals * x_mult, y_vals * y_mult
+    fig = go.Figure(go.Heatmap(x=x_show, y=y_show, z=z, colorscale="RdYlGn", colorbar=dict(title=metric)))
+    if key == "npv":
+        fig.add_trace(go.Contour(x=x_show, y=y_show, z=z, contours=dict(start=0, end=0, coloring="none"),
+                                 line=dict(color="white", width=2), showscale=False, name="NPV = 0"))
+    fig.update_layout(xaxis_title=x_label, yaxis_title=y_label, height=500, template="plotly_dark")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Full scan: every discount x take-up x days x WACC combination of the grid
+    scan = evaluate_policy_grid(current_sales, extra_sales, cogs, supplier_days, segments, allocation_mode,
+                                *outer_grid(*(values for _, values, _ in SURFACE_AXES.values())))
+    positive = np.nan_to_num(scan["npv"], nan=-np.inf) > 0
+    s1, s2 = st.columns(2)
+    s1.metric("Policy Variants Scanned", f"{positive.size:,}")
+    s2.metric("Value-Creating Share", f"{positive.mean():.1%}")
 
 # --- UI ---
 def show_discount_npv_ui():
@@ -86,8 +69,9 @@ def show_discount_npv_ui():
     with col1:
         st.subheader("📈 Core Financials")
         # Τραβάμε τα defaults από το session_state αν υπάρχουν
-        cur_p = st.session_state.get('price', 1.0)
-        cur_q = st.session_state.get('volume', 1000.0)
+        base = get_baseline()
+        cur_p = base.price
+        cur_q = base.volume
         cur_sales = cur_p * cur_q
         
         current_sales = st.number_input("Current Annual Sales (€)", value=float(cur_sales))
@@ -124,20 +108,7 @@ def show_discount_npv_ui():
 
         # Segmentation Logic
         segments = [{"pct": fast_pct, "dso": fast_dso}, {"pct": med_pct, "dso": med_dso}, {"pct": slow_pct, "dso": slow_dso}]
-        if allocation_mode == "Slow Payers First": segments.sort(key=lambda x: x["dso"], reverse=True)
-        elif allocation_mode == "Fast Payers First": segments.sort(key=lambda x: x["dso"])
-
-        remaining = prc_clients_take_disc
-        weighted_take_dso = 0
-        weighted_no_take_dso = 0
-        for seg in segments:
-            take = min(seg["pct"], remaining)
-            weighted_take_dso += take * seg["dso"]
-            weighted_no_take_dso += (seg["pct"] - take) * seg["dso"]
-            remaining -= take
-
-        eff_take = weighted_take_dso / prc_clients_take_disc if prc_clients_take_disc > 0 else 0
-        eff_no_take = weighted_no_take_dso / (1 - prc_clients_take_disc) if prc_clients_take_disc < 1 else 0
+        eff_take, eff_no_take = allocate_discount_takers(segments, prc_clients_take_disc, allocation_mode)
 
         res = calculate_discount_npv(current_sales, extra_sales, discount_trial, prc_clients_take_disc, 
                                      eff_take, eff_no_take, new_days_cash_payment, cogs, wacc, avg_days_pay_suppliers)
@@ -171,3 +142,15 @@ def show_discount_npv_ui():
             st.success("✅ **Verdict:** The policy is financially sound. The benefit of liquidity outweighs the margin cost.")
         else:
             st.error("❌ **Verdict:** Reject policy. The discount is too expensive compared to your cost of capital.")
+
+    # SURFACE MODE
+    st.divider()
+    st.subheader("🗺️ Policy Surface")
+    st.caption("Sweeps two policy levers at once while the others stay at the values above.")
+    if st.toggle("Enable Surface Mode"):
+        if abs((fast_pct + med_pct + slow_pct) - 1.0) > 0.01:
+            st.error("Segmentation must sum to 100%.")
+            return
+        segments = [{"pct": fast_pct, "dso": fast_dso}, {"pct": med_pct, "dso": med_dso}, {"pct": slow_pct, "dso": slow_dso}]
+        policy = {"discount": discount_trial, "take": prc_clients_take_disc, "days": new_days_cash_payment, "wacc": wacc}
+        show_discount_surface(current_sales, extra_sales, cogs, avg_days_pay_suppliers, segments, allocation_mode, policy)
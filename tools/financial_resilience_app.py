@@ -1,14 +1,38 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from core.engine.stress import analyze_resilience, shocked_current_ratio
+from ui import charts
 
 # -------------------------------------------------
-# CALCULATION LOGIC
+# VISUALIZATION
 # -------------------------------------------------
-def analyze_resilience(profit, assets, current_assets, current_liabilities):
-    roa = (profit / assets) * 100 if assets > 0 else 0
-    current_ratio = current_assets / current_liabilities if current_liabilities > 0 else 0
-    return round(roa, 2), round(current_ratio, 2)
+def draw_resilience_map(fig, c_ratio, roa):
+    """2x2 Resilience Matrix: liquidity buffer vs efficiency, current position marked."""
+    ax = fig.subplots()
+    
+    # Set Axis Limits (Standardized)
+    ax.set_xlim(0, 4)  # Current Ratio Axis
+    ax.set_ylim(-10, 30) # ROA Axis
+    
+    # Draw Quadrants
+    ax.axhline(10, color='black', linewidth=1, linestyle='--') # Profitability Threshold
+    ax.axvline(1.5, color='black', linewidth=1, linestyle='--') # Liquidity Threshold
+    
+    # Label Quadrants
+    ax.text(0.5, 25, "Growth Trap\n(High Profit / Low Cash)", fontsize=10, color='orange', alpha=0.7)
+    ax.text(2.5, 25, "The Fortress\n(High Profit / High Cash)", fontsize=10, color='green', alpha=0.7)
+    ax.text(0.5, -5, "Danger Zone\n(Critical Vulnerability)", fontsize=10, color='red', alpha=0.7)
+    ax.text(2.5, -5, "Safe Storage\n(Low Efficiency)", fontsize=10, color='blue', alpha=0.7)
+
+    # Plot Current Position
+    ax.scatter(c_ratio, roa, color='red', s=200, edgecolors='black', zorder=5)
+    ax.annotate(f"Current State\n(CR: {c_ratio}, ROA: {roa}%)", (c_ratio, roa), 
+                textcoords="offset points", xytext=(0,10), ha='center', fontweight='bold')
+
+    ax.set_xlabel("Liquidity Buffer (Current Ratio)")
+    ax.set_ylabel("Efficiency (Return on Assets %)")
+    ax.grid(True, alpha=0.3)
 
 # -------------------------------------------------
 # UI INTERFACE
@@ -35,32 +59,7 @@ def show_resilience_map():
     st.subheader("📍 Strategic Position")
     
     # 2x2 Resilience Matrix Plot
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    # Set Axis Limits (Standardized)
-    ax.set_xlim(0, 4)  # Current Ratio Axis
-    ax.set_ylim(-10, 30) # ROA Axis
-    
-    # Draw Quadrants
-    ax.axhline(10, color='black', linewidth=1, linestyle='--') # Profitability Threshold
-    ax.axvline(1.5, color='black', linewidth=1, linestyle='--') # Liquidity Threshold
-    
-    # Label Quadrants
-    ax.text(0.5, 25, "Growth Trap\n(High Profit / Low Cash)", fontsize=10, color='orange', alpha=0.7)
-    ax.text(2.5, 25, "The Fortress\n(High Profit / High Cash)", fontsize=10, color='green', alpha=0.7)
-    ax.text(0.5, -5, "Danger Zone\n(Critical Vulnerability)", fontsize=10, color='red', alpha=0.7)
-    ax.text(2.5, -5, "Safe Storage\n(Low Efficiency)", fontsize=10, color='blue', alpha=0.7)
-
-    # Plot Current Position
-    ax.scatter(c_ratio, roa, color='red', s=200, edgecolors='black', zorder=5)
-    ax.annotate(f"Current State\n(CR: {c_ratio}, ROA: {roa}%)", (c_ratio, roa), 
-                textcoords="offset points", xytext=(0,10), ha='center', fontweight='bold')
-
-    ax.set_xlabel("Liquidity Buffer (Current Ratio)")
-    ax.set_ylabel("Efficiency (Return on Assets %)")
-    ax.grid(True, alpha=0.3)
-    
-    st.pyplot(fig)
+    charts.pyplot(draw_resilience_map, c_ratio, roa, figsize=(8, 8))
 
     
 
@@ -93,7 +92,7 @@ def show_resilience_map():
     st.subheader("🌪️ Stress Test Simulation")
     shock_pct = st.slider("Simulate Revenue/Cash Drop (%)", 0, 50, 20)
     
-    new_c_ratio = (c_assets * (1 - shock_pct/100)) / c_liabilities
+    new_c_ratio = shocked_current_ratio(c_assets, c_liabilities, shock_pct / 100)
     st.write(f"In the event of a **{shock_pct}%** sudden cash shock, your liquidity buffer would drop from **{c_ratio}** to **{new_c_ratio:.2f}**.")
     
     if new_c_ratio < 1:
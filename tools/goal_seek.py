@@ -0,0 +1,125 @@
+import io
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from core.batch import DEFAULT_CHUNKSIZE, goal_seek_baselines, iter_table_chunks, table_columns
+from core.engine.goal_seek import default_bracket, goal_seek
+from core.engine.path import evaluate_path
+from core.formatting import format_frame
+from core.system_state import get_baseline
+
+PARAM_LABELS = {
+    "price": "Price (€)", "volume": "Sales Volume (units)", "variable_cost": "Variable Cost (€)", "fixed_cost": "Fixed Costs (€)",
+    "ar_days": "Receivables Days", "inventory_days": "Inventory Days", "payables_days": "Payables Days",
+    "debt": "Debt (€)", "interest_rate": "Interest Rate", "retention_rate": "Retention Rate",
+}
+
+KPI_LABELS = {
+    "net_profit": "Net Profit (€)",
+    "ebit": "EBIT (€)",
+    "stressed_profit": "Stress-Tested Profit (€)",
+    "working_capital_req": "Liquidity Gap (€)",
+    "clv_npv": "CLV NPV (€)",
+    "ltv_cac": "LTV / CAC (x)",
+    "safety_margin": "Margin of Safety (%)",
+    "cac_payback_months": "CAC Payback (Months)",
+}
+
+# Target ladder: multiples of the current KPI value solved in one batch
+LADDER = np.array([0.0, 0.5, 0.75, 1.25, 1.5, 2.0])
+
+def show_single_seek(base, kpi, param, method):
+    current = float(evaluate_path(base)[kpi])
+    lo, hi = (float(x) for x in default_bracket(base, param))
+
+    c1, c2, c3 = st.columns(3)
+    target = c1.number_input(f"Target {KPI_LABELS[kpi]}", value=0.0 if kpi.endswith("profit") else round(current, 2))
+    lo = c2.number_input("Search From", value=lo)
+    hi = c3.number_input("Search To", value=hi)
+
+    res = goal_seek(base, kpi, target, param, lo, hi, method=method)
+    st.divider()
+    if not res["bracketed"]:
+        st.error(f"🚨 {KPI_LABELS[kpi]} does not reach {target:,.2f} for any {PARAM_LABELS[param]} between {lo:,.2f} and {hi:,.2f}. Widen the search range.")
+        return
+
+    now = float(base[param])
+    r1, r2, r3 = st.columns(3)
+    r1.metric(f"Required {PARAM_LABELS[param]}", f"{res['root']:,.4f}", f"{res['root'] - now:+,.4f} vs current")
+    r2.metric(f"Current {KPI_LABELS[kpi]}", f"{current:,.2f}")
+    r3.metric("Solver", "Converged ✅" if res["converged"] else "Not converged ⚠️",
+              f"{res['iterations']} iterations", delta_color="off")
+    st.caption(f"Residual at the solution: {res['residual']:.2e} · {res['evaluations']} path evaluations.")
+
+    # Target ladder (one vectorized solve)
+    st.subheader("🪜 Target Ladder")
+    targets = current * LADDER if current else LADDER
+    ladder = goal_seek(base, kpi, targets, param, lo, hi, method=method)
+    st.table(format_frame(pd.DataFrame({
+        f"Target {KPI_LABELS[kpi]}": targets,
+        f"Required {PARAM_LABELS[param]}": ladder["root"],
+        "Change vs Current": ladder["root"] - now,
+        "Converged": ladder["converged"],
+    }), {f"Target {KPI_LABELS[kpi]}": "{:,.2f}", f"Required {PARAM_LABELS[param]}": "{:,.4f}",
+         "Change vs Current": "{:+,.4f}"}, na_rep="—"))
+
+def show_bulk_seek(kpi, param, method):
+    st.subheader("📥 Baselines File")
+    st.caption("One row per scenario; columns named after the baseline keys (price, volume, ...). Missing columns use the Shared Core defaults.")
+    upload = st.file_uploader("Baselines file", type=["csv", "parquet", "pq"])
+    if upload is None:
+        return
+
+    try:
+        columns = table_columns(upload)
+    except (ImportError, ValueError) as e:
+        st.error(f"⚠️ Cannot read file: {e}")
+        return
+
+    c1, c2 = st.columns(2)
+    target_mode = c1.radio("Target", ["Same for every row", "From a column"], horizontal=True)
+    if target_mode == "Same for every row":
+        target = c2.number_input(f"Target {KPI_LABELS[kpi]}", value=0.0)
+    else:
+        target = c2.selectbox("Target Column", columns)
+
+    if st.button("🎯 Solve All Scenarios", type="primary"):
+        try:
+            with st.spinner("Solving..."):
+                result = pd.concat(
+                    [goal_seek_baselines(chunk, kpi, target, param, method=method) for chunk in iter_table_chunks(upload, DEFAULT_CHUNKSIZE)],
+                    ignore_index=True,
+                )
+        except (ImportError, ValueError, KeyError) as e:
+            st.error(f"⚠️ Cannot process file: {e}")
+            return
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Scenarios", f"{len(result):,}")
+        m2.metric("Converged", f"{result['converged'].mean():.1%}")
+        m3.metric("Max Iterations", f"{result['iterations'].max():,}")
+        st.dataframe(result.head(1000), use_container_width=True)
+
+        buffer = io.StringIO()
+        result.to_csv(buffer, index=False)
+        st.download_button("⬇️ Download Results (CSV)", buffer.getvalue(), file_name=f"goal_seek_{param}.csv", mime="text/csv")
+
+def show_goal_seek():
+    st.header("🎯 Goal Seek — What Must Be True?")
+    st.info("Pick a KPI and a target; the solver finds the value of one baseline input that delivers it, holding everything else.")
+
+    base = get_baseline()
+    st.write(f"**🔗 Core Baseline Linked:** Price {base.price:,.2f} € | Volume {base.volume:,} | VC {base.variable_cost:,.2f} € | FC {base.fixed_cost:,.2f} €")
+
+    c1, c2, c3 = st.columns(3)
+    kpi = c1.selectbox("KPI", list(KPI_LABELS), format_func=KPI_LABELS.get)
+    param = c2.selectbox("Solve For", list(PARAM_LABELS), format_func=PARAM_LABELS.get)
+    method = c3.radio("Method", ["newton", "bisect"], horizontal=True, format_func=str.title)
+
+    mode = st.radio("Scope", ["Current Baseline", "Bulk (Upload Scenarios)"], horizontal=True)
+    if mode == "Current Baseline":
+        show_single_seek(base, kpi, param, method)
+    else:
+        show_bulk_seek(kpi, param, method)
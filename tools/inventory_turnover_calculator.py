@@ -1,15 +1,121 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+from core.batch import table_columns
+from core.engine.operations import DEAD_STOCK_DAYS, abc_classes, calculate_turnover, classify_inventory, top_n
+from core.formatting import format_frame
+from core.inventory import SKU_COLUMNS, load_sku_table
+from ui import charts
+from ui.uploads import pick_column
+
+PARETO_DISPLAY_LIMIT = 25
 
 # -------------------------------------------------
-# Logic Functions
+# Visualization
 # -------------------------------------------------
-def calculate_turnover(avg_inv, usage_val):
-    if usage_val == 0:
-        return 0
-    # Χρήση 365 ημερών βάσει των οδηγιών σου
-    return round((avg_inv * 365) / usage_val, 2)
+def draw_inventory_pareto(fig, names, amounts, cumulative_pct):
+    ax1 = fig.subplots()
+    ax1.bar(names, amounts, color="#2ca02c", label="Inventory Amount")
+    ax1.set_ylabel("Inventory Amount")
+    
+    ax2 = ax1.twinx()
+    ax2.plot(names, cumulative_pct, color="#d62728", marker="o", label="Cumulative %")
+    ax2.axhline(y=80, color='black', linestyle='--', alpha=0.5)
+    ax2.set_ylim(0, 110)
+    ax2.set_ylabel("Cumulative %")
+
+# -------------------------------------------------
+# Bulk Mode (SKU catalog upload)
+# -------------------------------------------------
+def show_sku_analysis(df, method, dead_stock_days, n_offenders):
+    res = classify_inventory(df["AvgInventory"].to_numpy(), df["Usage"].to_numpy(), dead_stock_days=dead_stock_days)
+    inv = df["AvgInventory"].to_numpy()
+    usage = df["Usage"].to_numpy()
+    total_inv = inv.sum()
+    dead_inv = inv[res["dead_stock"]].sum()
+
+    # 1. SUMMARY METRICS
+    m1, m2, m3, m4 = st.columns(4)
+    label_inv = "Total Inventory Value" if "Value" in method else "Total Units in Stock"
+    m1.metric("SKUs Analyzed", f"{len(df):,}")
+    m2.metric(label_inv, f"{total_inv:,.0f}")
+    m3.metric("Weighted Avg. Turnover", f"{res['weighted_turnover_days']} Days")
+    m4.metric("Dead Stock Share", f"{dead_inv / total_inv:.1%}" if total_inv > 0 else "0.0%")
+
+    # 2. ABC SUMMARY
+    st.subheader("🔤 ABC Classification")
+    st.caption(f"A: first 80% of inventory, B: next 15%, C: last 5%. Dead stock: no usage or more than {dead_stock_days} days of cover.")
+    codes = np.searchsorted(np.array(["A", "B", "C"]), res["abc"])
+    count = np.bincount(codes, minlength=3)
+    inv_by_class = np.bincount(codes, weights=inv, minlength=3)
+    usage_by_class = np.bincount(codes, weights=usage, minlength=3)
+    dead_by_class = np.bincount(codes, weights=res["dead_stock"], minlength=3)
+    st.table(pd.DataFrame({
+        "SKUs": count,
+        "Inventory Share": inv_by_class / total_inv if total_inv > 0 else 0.0,
+        "Turnover Days": calculate_turnover(inv_by_class, usage_by_class),
+        "Dead Stock SKUs": dead_by_class.astype(int),
+    }, index=["A", "B", "C"]).style.format({"Inventory Share": "{:.1%}", "Turnover Days": "{:.1f}"}))
+
+    # 3. PARETO (top items only: partial selection, no full sort)
+    st.subheader("📈 Pareto Analysis: Capital Concentration")
+    top = top_n(inv, PARETO_DISPLAY_LIMIT)
+    charts.pyplot(draw_inventory_pareto, df["Name"].to_numpy()[top].tolist(), inv[top], res["cumulative_share"][top] * 100)
+
+    # 4. TOP-N OFFENDERS
+    def offenders(idx):
+        return format_frame(pd.DataFrame({
+            "Name": df["Name"].to_numpy()[idx],
+            "AvgInventory": inv[idx],
+            "Usage": usage[idx],
+            "Turnover Days": res["turnover_days"][idx],
+            "Class": res["abc"][idx],
+        }), {"AvgInventory": "{:,.2f}", "Usage": "{:,.2f}", "Turnover Days": "{:,.1f}"})
+
+    col_o1, col_o2 = st.columns(2)
+    with col_o1:
+        st.subheader(f"🐢 Slowest {n_offenders} Movers")
+        moving = np.flatnonzero(usage > 0)
+        st.table(offenders(moving[top_n(res["turnover_days"][moving], n_offenders)]))
+    with col_o2:
+        st.subheader(f"🧊 Largest {n_offenders} Dead-Stock Positions")
+        dead = np.flatnonzero(res["dead_stock"])
+        st.table(offenders(dead[top_n(inv[dead], n_offenders)]))
+
+def show_sku_upload(method):
+    st.subheader("📥 SKU Catalog")
+    st.caption("One row per SKU with average inventory and annual usage (units or value, matching the calculation basis).")
+    upload = st.file_uploader("SKU file", type=["csv", "parquet", "pq"])
+    if upload is None:
+        return
+
+    try:
+        columns = table_columns(upload)
+    except (ImportError, ValueError) as e:
+        st.error(f"⚠️ Cannot read file: {e}")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    name_col = pick_column(c1, "SKU Column", columns, SKU_COLUMNS["name"], 0)
+    inv_col = pick_column(c2, "Avg. Inventory Column", columns, SKU_COLUMNS["inventory"], 1)
+    usage_col = pick_column(c3, "Annual Usage Column", columns, SKU_COLUMNS["usage"], 2)
+
+    c4, c5 = st.columns(2)
+    dead_stock_days = c4.number_input("Dead Stock Threshold (Days of Cover)", min_value=30, value=DEAD_STOCK_DAYS, step=30)
+    n_offenders = c5.number_input("Offenders to List", min_value=5, max_value=200, value=20, step=5)
+
+    if st.button("📊 Run Inventory Analysis", type="primary"):
+        try:
+            with st.spinner("Loading catalog..."):
+                df = load_sku_table(upload, name_col, inv_col, usage_col)
+        except (ImportError, ValueError, KeyError) as e:
+            st.error(f"⚠️ Cannot process catalog: {e}")
+            return
+        if df.empty:
+            st.error("⚠️ The file holds no SKUs.")
+            return
+        show_sku_analysis(df, method, dead_stock_days, int(n_offenders))
 
 # -------------------------------------------------
 # UI Interface
@@ -25,11 +131,17 @@ def show_inventory_turnover_calculator():
             "Calculation Basis",
             ["📊 Quantity-Based", "💶 Value-Based"]
         )
-        num_items = st.number_input("Number of Products", min_value=1, max_value=20, value=5)
+        input_mode = st.radio("Input Mode", ["Manual Entry", "Upload SKU File (CSV / Parquet)"])
+        if input_mode == "Manual Entry":
+            num_items = st.number_input("Number of Products", min_value=1, max_value=20, value=5)
         
         st.divider()
         st.info("Value-Based analysis is recommended for identifying where your cash is 'trapped'.")
 
+    if input_mode != "Manual Entry":
+        show_sku_upload(method)
+        return
+
     # INPUT AREA
     st.subheader("📥 Inventory Data")
     
@@ -60,7 +172,8 @@ def show_inventory_turnover_calculator():
         df = pd.DataFrame(data_list)
         
         # Calculate Turnover Days for each item
-        df["Turnover Days"] = df.apply(lambda x: calculate_turnover(x["AvgInventory"], x["Usage"]), axis=1)
+        df["Turnover Days"] = calculate_turnover(df["AvgInventory"].to_numpy(), df["Usage"].to_numpy())
+        df["Class"] = abc_classes(df["AvgInventory"].to_numpy())[0]
         
         # 1. SUMMARY METRICS
         total_inv = df["AvgInventory"].sum()
@@ -83,21 +196,12 @@ def show_inventory_turnover_calculator():
 
         
 
-        fig, ax1 = plt.subplots(figsize=(10, 5))
-        ax1.bar(df_pareto["Name"], df_pareto["AvgInventory"], color="#2ca02c", label="Inventory Amount")
-        ax1.set_ylabel("Inventory Amount")
-        
-        ax2 = ax1.twinx()
-        ax2.plot(df_pareto["Name"], df_pareto["Cumulative %"], color="#d62728", marker="o", label="Cumulative %")
-        ax2.axhline(y=80, color='black', linestyle='--', alpha=0.5)
-        ax2.set_ylim(0, 110)
-        ax2.set_ylabel("Cumulative %")
-        
-        st.pyplot(fig)
+        charts.pyplot(draw_inventory_pareto, df_pareto["Name"].astype(str).tolist(),
+                      df_pareto["AvgInventory"].to_numpy(dtype=float), df_pareto["Cumulative %"].to_numpy(dtype=float))
 
         # 3. DETAILED DATA TABLE
         st.subheader("📋 Analytical Breakdown")
-        st.table(df_pareto.style.format({
+        st.table(format_frame(df_pareto, {
             "AvgInventory": "{:,.2f}",
             "Usage": "{:,.2f}",
             "Weight %": "{:.1f}%",
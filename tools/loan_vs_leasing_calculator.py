@@ -1,43 +1,40 @@
 import streamlit as st
-import numpy_financial as npf
-import matplotlib.pyplot as plt
+import numpy as np
+
+from core.engine.arrays import outer_grid
+from core.engine.financing import (
+    indifference_duration, indifference_rate, indifference_residual, run_calculations,
+)
+from core.formatting import format_numbers
+from ui import charts
 
 # -------------------------------------------------
 # Formatting Helpers
 # -------------------------------------------------
-def pmt(rate, nper, pv, fv=0, when=0):
-    return -npf.pmt(rate, nper, pv, fv, when)
-
 def format_eur(x):
-    return f"€ {x:,.0f}".replace(",", ".")
+    """The tool's fixed rendering in any app locale: "€ 1.234.567", "€ -1.234"."""
+    return f"€ {format_numbers(x, 0, locale='el_GR')}"
 
-# CALCULATION ENGINE (Original Formulas Preserved)
-def run_calculations(loan_rate, wc_rate, years, tax_rate, when, value, loan_pct, lease_pct, exp_loan, exp_lease, residual, dep_years):
-    months = years * 12
-    
-    # --- LOAN ---
-    loan_inst = pmt(loan_rate / 12, months, value * loan_pct, 0, when)
-    wc_loan = value * (1 - loan_pct) + exp_loan
-    wc_inst = pmt(wc_rate / 12, months, wc_loan, 0, when)
-
-    loan_cash = (loan_inst + wc_inst) * months
-    loan_interest = loan_cash - value
-    loan_depr = (value + exp_loan) / dep_years * years
-    loan_tax = (loan_interest + loan_depr) * tax_rate
-    loan_final = value + loan_interest - loan_tax
-
-    # --- LEASING ---
-    lease_inst = pmt(loan_rate / 12, months, value * lease_pct, 0, when)
-    wc_lease = value * (1 - lease_pct) + exp_lease
-    wc_lease_inst = pmt(wc_rate / 12, months, wc_lease, 0, when)
-
-    lease_cash = (lease_inst + wc_lease_inst) * months
-    lease_interest = lease_cash - value
-    lease_depr = value + exp_lease + residual
-    lease_tax = ((wc_lease_inst * months - wc_lease) + lease_depr) * tax_rate
-    lease_final = value + lease_interest - lease_tax
-    
-    return loan_final, lease_final, loan_cash, loan_interest, loan_depr, loan_tax, lease_cash, lease_interest, lease_depr, lease_tax
+# -------------------------------------------------
+# Charts
+# -------------------------------------------------
+def draw_rate_equilibrium(fig, test_rates, ls_burdens, l_final):
+    ax = fig.subplots()
+    ax.plot(test_rates * 100, ls_burdens, label='Leasing Cost Curve', color='#1f77b4', marker='o')
+    ax.axhline(y=l_final, color='r', linestyle='--', label=f'Loan Fixed Burden')
+    ax.set_xlabel("Leasing Rate (%)")
+    ax.set_ylabel("Final Burden (€)")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+def draw_advantage_map(fig, grid_years, grid_rates, advantage):
+    ax_map = fig.subplots()
+    limit = np.abs(advantage).max() or 1.0
+    mesh = ax_map.pcolormesh(grid_years, grid_rates * 100, advantage, cmap="RdYlGn", vmin=-limit, vmax=limit, shading="auto")
+    ax_map.contour(grid_years, grid_rates * 100, advantage, levels=[0], colors="black", linewidths=1.5)
+    fig.colorbar(mesh, ax=ax_map, label="Loan − Leasing Burden (€)")
+    ax_map.set_xlabel("Duration (years)")
+    ax_map.set_ylabel("Interest Rate (%)")
 
 # -------------------------------------------------
 # MAIN INTERFACE
@@ -100,33 +97,34 @@ def loan_vs_leasing_ui():
 
         # EQUILIBRIUM ANALYSIS
         st.subheader("📈 Rate Equilibrium (Sensitivity)")
-        test_rates = [loan_rate_input + (i/1000) for i in range(-50, 55, 5)]
-        ls_burdens = []
-        for r in test_rates:
-            res = run_calculations(r, wc_rate_input, years_input, tax_rate_input, when_val, 
-                                 value_input, loan_pct_input, lease_pct_input, exp_loan_input, 
-                                 exp_lease_input, residual_input, dep_years_input)
-            ls_burdens.append(res[1])
-            
-        fig, ax = plt.subplots(figsize=(10, 4))
-        ax.plot([r*100 for r in test_rates], ls_burdens, label='Leasing Cost Curve', color='#1f77b4', marker='o')
-        ax.axhline(y=l_final, color='r', linestyle='--', label=f'Loan Fixed Burden')
-        ax.set_xlabel("Leasing Rate (%)")
-        ax.set_ylabel("Final Burden (€)")
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        st.pyplot(fig)
-
-        indifference_rate = None
-        for i in range(len(test_rates) - 1):
-            if (ls_burdens[i] - l_final) * (ls_burdens[i+1] - l_final) <= 0:
-                r1, r2 = test_rates[i], test_rates[i+1]
-                b1, b2 = ls_burdens[i], ls_burdens[i+1]
-                indifference_rate = r1 + (l_final - b1) * (r2 - r1) / (b2 - b1)
-                break
-        
-        if indifference_rate:
-            st.warning(f"**Indifference Point:** Leasing is superior if its rate is below **{indifference_rate*100:.2f}%**.")
+        deal = (wc_rate_input, years_input, tax_rate_input, when_val, value_input, loan_pct_input,
+                lease_pct_input, exp_loan_input, exp_lease_input, residual_input, dep_years_input)
+        test_rates = loan_rate_input + np.arange(-50, 55, 5) / 1000
+        ls_burdens = run_calculations(test_rates, *deal)[1]
+        charts.pyplot(draw_rate_equilibrium, test_rates, ls_burdens, l_final, figsize=(10, 4))
+
+        rate_star, rate_ok = indifference_rate(loan_rate_input, *deal)
+        residual_star = indifference_residual(loan_rate_input, *deal)
+        years_star, years_ok = indifference_duration(loan_rate_input, *deal)
+
+        if rate_ok:
+            st.warning(f"**Indifference Point:** Leasing is superior if its rate is below **{rate_star*100:.4f}%**.")
+        else:
+            st.caption("No leasing rate between 0% and 100% equalizes the two burdens.")
+
+        i1, i2 = st.columns(2)
+        i1.metric("Indifference Residual Value", format_eur(residual_star) if np.isfinite(residual_star) else "N/A")
+        i2.metric("Indifference Duration", f"{years_star:.2f} years" if years_ok else "None within 50 years")
+
+        # GRID ANALYSIS: leasing advantage over rate x duration in one evaluation
+        st.subheader("🗺️ Leasing Advantage Map (Rate × Duration)")
+        grid_rates = np.linspace(max(loan_rate_input - 0.05, 0.0), loan_rate_input + 0.05, 41)
+        grid_years = np.arange(1, 31)
+        rates, years = outer_grid(grid_rates, grid_years)
+        grid = run_calculations(rates, wc_rate_input, years, tax_rate_input, when_val, value_input, loan_pct_input,
+                                lease_pct_input, exp_loan_input, exp_lease_input, residual_input, dep_years_input)
+        advantage = grid[0] - grid[1]  # > 0: leasing carries the lower burden
+        charts.pyplot(draw_advantage_map, grid_years, grid_rates, advantage, figsize=(10, 4))
         
         st.divider()
         if l_final < ls_final:
@@ -1,18 +1,22 @@
 import streamlit as st
 import pandas as pd
 
+from core.engine.break_even import contribution_margin, required_volume_increase
+from core.system_state import get_baseline
+
 def show_loss_threshold_before_price_cut():
     st.header("📉 Loss Threshold Analysis")
     st.info("Calculates the required volume increase to maintain profit after a price drop.")
 
     # 1. SYNC WITH SHARED CORE
     # Τραβάμε τις τιμές που ορίστηκαν στο Home ή στο Survival Anchor
-    p = st.session_state.get('price', 20.0)
-    vc = st.session_state.get('variable_cost', 12.0)
-    q = st.session_state.get('volume', 1000)
+    base = get_baseline()
+    p = base.price
+    vc = base.variable_cost
+    q = base.volume
     
     current_margin_euro = p - vc
-    current_margin_pct = (current_margin_euro / p) if p > 0 else 0
+    current_margin_pct = contribution_margin(p, vc)
 
     # Εμφάνιση των τρεχόντων δεδομένων για επιβεβαίωση
     st.write(f"**Current Baseline:** Price: {p:.2f}€ | Unit VC: {vc:.2f}€ | Current Margin: {current_margin_pct:.1%}")
@@ -28,11 +32,8 @@ def show_loss_threshold_before_price_cut():
 
     # 3. CALCULATIONS (The Cold Math)
     # Τύπος: Required Q Change = (Price Cut %) / (Original Margin % - Price Cut %)
-    if current_margin_pct > price_cut_pct:
-        req_vol_increase = price_cut_pct / (current_margin_pct - price_cut_pct)
-        new_q = q * (1 + req_vol_increase)
-    else:
-        req_vol_increase = float('inf') # Η επιχείρηση μπαίνει μέσα σε κάθε μονάδα
+    req_vol_increase = required_volume_increase(current_margin_pct, price_cut_pct)
+    new_q = q * (1 + req_vol_increase)
 
     # 4. RESULTS DISPLAY
     st.subheader("Results")
@@ -48,10 +49,10 @@ def show_loss_threshold_before_price_cut():
     # 5. SENSITIVITY TABLE
     st.write("### Discount Sensitivity Table")
     discounts = [0.02, 0.05, 0.10, 0.15, 0.20]
+    increases = required_volume_increase(current_margin_pct, discounts)
     data = []
-    for d in discounts:
+    for d, inc in zip(discounts, increases):
         if current_margin_pct > d:
-            inc = d / (current_margin_pct - d)
             data.append({"Discount": f"{d:.0%}", "Req. Vol. Increase": f"+{inc:.1%}", "New Price": f"{p*(1-d):.2f}€"})
     
     st.table(pd.DataFrame(data))
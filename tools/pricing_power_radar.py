@@ -1,48 +1,114 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 
-# -----------------------------------
-# Core Calculations
-# -----------------------------------
-
-def normalize(value, min_val, max_val):
-    if max_val - min_val == 0:
-        return 0
-    return (value - min_val) / (max_val - min_val)
-
-def calculate_pricing_power_score(margin, substitution, elasticity, concentration):
-
-    # Margin strength (higher = better)
-    margin_score = normalize(margin, 0, 0.8)
-
-    # Substitution exposure (lower = better)
-    substitution_score = 1 - normalize(substitution, 0, 1)
-
-    # Elasticity fragility (lower elasticity = stronger power)
-    elasticity_score = 1 - normalize(elasticity, 0, 3)
+from core.batch import table_columns
+from core.engine.pricing import POWER_BANDS, POWER_CLASSES, calculate_pricing_power_score, power_class, score_portfolio
+from core.pricing_catalog import PRODUCT_COLUMNS, load_product_table
+from ui import charts
+from ui.uploads import pick_column
 
-    # Revenue concentration risk (lower = better)
-    concentration_score = 1 - normalize(concentration, 0, 1)
+CLASS_COLORS = ["#EF553B", "#FFA15A", "#00CC96", "#FECB52"]
+SCORE_BINS = np.linspace(0, 100, 51)
 
-    final_score = (
-        margin_score * 0.35 +
-        substitution_score * 0.25 +
-        elasticity_score * 0.25 +
-        concentration_score * 0.15
-    )
+# Strategic interpretation per POWER_CLASSES entry
+INTERPRETATIONS = [
+    (st.error, "Business is highly exposed. Price increases likely destroy volume."),
+    (st.warning, "Pricing decisions must be cautious. Substitution pressure limits flexibility."),
+    (st.success, "Company has measurable pricing flexibility."),
+    (st.success, "Structural pricing dominance. Brand or positioning creates insulation."),
+]
 
-    return round(final_score * 100, 1)
+# -----------------------------------
+# Portfolio (catalog) mode
+# -----------------------------------
 
-def classify_power(score):
-    if score < 30:
-        return "Weak Pricing Power", "🔴"
-    elif score < 55:
-        return "Defensive Structure", "🟠"
-    elif score < 75:
-        return "Strong Position", "🟢"
+def score_distribution_figure(scores):
+    counts, edges = np.histogram(scores[np.isfinite(scores)], bins=SCORE_BINS)
+    mids = (edges[:-1] + edges[1:]) / 2
+    colors = [CLASS_COLORS[k] for k in np.digitize(mids, POWER_BANDS)]
+    fig = go.Figure(go.Bar(x=mids, y=counts, width=edges[1] - edges[0], marker_color=colors))
+    for band in POWER_BANDS:
+        fig.add_vline(x=band, line_dash="dot", line_color="white")
+    fig.update_layout(xaxis_title="Pricing Power Score", yaxis_title="Products", bargap=0.05,
+                      height=380, template="plotly_dark")
+    return fig
+
+def show_portfolio_analysis(df, n_weakest):
+    res = score_portfolio(df["Margin"].to_numpy(), df["Substitution"].to_numpy(),
+                          df["Elasticity"].to_numpy(), df["Concentration"].to_numpy(), weakest=n_weakest)
+
+    st.divider()
+    st.subheader("🏁 Portfolio Pricing Assessment")
+    cols = st.columns(len(POWER_CLASSES) + 1)
+    cols[0].metric("Median Score", f"{res['median']:.1f}/100")
+    for col, (label, icon), count, share in zip(cols[1:], POWER_CLASSES, res["counts"], res["share"]):
+        col.metric(f"{icon} {label}", f"{count:,}", f"{share:.1%} of catalog", delta_color="off")
+
+    skipped = int(np.sum(res["class"] < 0))
+    if skipped:
+        st.warning(f"⚠️ {skipped:,} products have a missing or non-numeric input and were not scored.")
+
+    charts.plotly_chart(score_distribution_figure, res["score"])
+
+    st.subheader(f"🔻 Weakest {len(res['weakest'])} Products")
+    idx = res["weakest"]
+    weakest = pd.DataFrame({
+        "Product": df["Name"].to_numpy()[idx],
+        "Score": res["score"][idx],
+        "Classification": [" ".join(reversed(POWER_CLASSES[k])) for k in res["class"][idx]],
+        "Margin": df["Margin"].to_numpy()[idx],
+        "Substitution": df["Substitution"].to_numpy()[idx],
+        "Elasticity": df["Elasticity"].to_numpy()[idx],
+        "Concentration": df["Concentration"].to_numpy()[idx],
+    })
+    st.table(weakest.style.format({"Score": "{:.1f}", "Margin": "{:.1%}", "Substitution": "{:.1%}",
+                                   "Elasticity": "{:.2f}", "Concentration": "{:.1%}"}))
+
+    weak_share = res["share"][0]
+    if weak_share > 0.25:
+        st.error(f"🚨 {weak_share:.0%} of the catalog has weak pricing power. Price increases across the range will destroy volume.")
     else:
-        return "Dominant Pricing Power", "🏆"
+        st.info(f"💡 {res['share'][2] + res['share'][3]:.0%} of the catalog has measurable pricing flexibility; start price moves there, not in the weakest list.")
+
+def show_catalog_upload():
+    st.subheader("📥 Product Catalog")
+    st.caption("One row per product with contribution margin, substitution exposure, price elasticity and revenue concentration.")
+    upload = st.file_uploader("Catalog file", type=["csv", "parquet", "pq"])
+    if upload is None:
+        return
+
+    try:
+        columns = table_columns(upload)
+    except (ImportError, ValueError) as e:
+        st.error(f"⚠️ Cannot read file: {e}")
+        return
+
+    c = st.columns(5)
+    name_col = pick_column(c[0], "Product Column", columns, PRODUCT_COLUMNS["name"], 0)
+    margin_col = pick_column(c[1], "Margin Column", columns, PRODUCT_COLUMNS["margin"], 1)
+    sub_col = pick_column(c[2], "Substitution Column", columns, PRODUCT_COLUMNS["substitution"], 2)
+    elast_col = pick_column(c[3], "Elasticity Column", columns, PRODUCT_COLUMNS["elasticity"], 3)
+    conc_col = pick_column(c[4], "Concentration Column", columns, PRODUCT_COLUMNS["concentration"], 4)
+
+    c6, c7 = st.columns(2)
+    in_percent = c6.checkbox("Margin, substitution and concentration are in % (0-100)", value=True)
+    n_weakest = c7.number_input("Weakest Products to List", min_value=5, max_value=200, value=20, step=5)
+
+    if st.button("📊 Score Catalog", type="primary"):
+        try:
+            with st.spinner("Loading catalog..."):
+                df = load_product_table(upload, name_col, margin_col, sub_col, elast_col, conc_col)
+        except (ImportError, ValueError, KeyError) as e:
+            st.error(f"⚠️ Cannot process catalog: {e}")
+            return
+        if df.empty:
+            st.error("⚠️ The file holds no products.")
+            return
+        if in_percent:
+            df[["Margin", "Substitution", "Concentration"]] /= 100
+        show_portfolio_analysis(df, int(n_weakest))
 
 # -----------------------------------
 # UI
@@ -53,6 +119,13 @@ def show_pricing_power_radar():
     st.header("📊 Pricing Power Radar")
     st.write("Evaluate structural pricing strength beyond simple elasticity calculations.")
 
+    with st.sidebar:
+        input_mode = st.radio("Input Mode", ["Single Product", "Product Catalog (CSV / Parquet)"])
+
+    if input_mode != "Single Product":
+        show_catalog_upload()
+        return
+
     with st.sidebar:
         st.subheader("Core Structural Inputs")
 
@@ -72,7 +145,8 @@ def show_pricing_power_radar():
             concentration
         )
 
-        label, icon = classify_power(score)
+        power = int(power_class(score))
+        label, icon = POWER_CLASSES[power]
 
         st.divider()
         st.subheader("🏁 Structural Pricing Assessment")
@@ -84,14 +158,8 @@ def show_pricing_power_radar():
         st.divider()
         st.subheader("📌 Strategic Interpretation")
 
-        if score < 30:
-            st.error("Business is highly exposed. Price increases likely destroy volume.")
-        elif score < 55:
-            st.warning("Pricing decisions must be cautious. Substitution pressure limits flexibility.")
-        elif score < 75:
-            st.success("Company has measurable pricing flexibility.")
-        else:
-            st.success("Structural pricing dominance. Brand or positioning creates insulation.")
+        show, message = INTERPRETATIONS[power]
+        show(message)
 
         st.divider()
         st.subheader("🧠 Structural Drivers")
@@ -1,77 +1,101 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 
+from core.engine.break_even import break_even_units, unit_contribution
+from core.engine.cash_cycle import cash_conversion_cycle
+from core.engine.qspm import qspm_totals, rank_order, weighted_scores
+from core.system_state import get_baseline
+from ui.qspm_robustness import show_weight_robustness
+
+DEFAULT_STRATEGIES = ["Market Expansion", "Product Innovation", "Cost Leadership", "Strategic Partnership",
+                      "Vertical Integration", "Niche Focus"]
+
+# Critical Success Factors (CSFs) με την αρχική βαρύτητά τους (Weight)
+DEFAULT_FACTORS = [
+    ("Financial Stability (Cash Flow)", 0.30),
+    ("Profitability (Margin)", 0.25),
+    ("Market Share / Growth", 0.20),
+    ("Operational Complexity", 0.15),
+    ("Resource Availability", 0.10)
+]
+
 def show_qspm_tool():
     st.header("🧭 QSPM – Strategy Comparison")
     st.info("Quantitative Strategic Planning Matrix: Evaluate which strategy best fits your current business reality.")
 
     # 1. LOAD SYSTEM CONTEXT (For Reference)
-    survival = st.session_state.get('volume', 0) / (st.session_state.get('fixed_cost', 1) / (st.session_state.get('price', 1) - st.session_state.get('variable_cost', 0.1)) + 0.001) - 1
-    cash_days = st.session_state.get('ar_days', 0) + st.session_state.get('inventory_days', 0) - st.session_state.get('payables_days', 0)
+    base = get_baseline()
+    cash_days = cash_conversion_cycle(base.inventory_days, base.ar_days, base.payables_days)
+    if unit_contribution(base.price, base.variable_cost) > 0:
+        be_units = break_even_units(base.fixed_cost, base.price, base.variable_cost)
+        survival = f"{base.volume / (be_units + 0.001) - 1:.1%}"
+    else:
+        survival = "N/A (no break-even: price does not cover variable cost)"
 
-    st.write(f"**Current Strategic Context:** Survival Margin: {survival:.1%} | Cash Cycle: {int(cash_days)} Days")
+    st.write(f"**Current Strategic Context:** Survival Margin: {survival} | Cash Cycle: {int(cash_days)} Days")
 
     st.divider()
 
     # 2. DEFINE STRATEGIES
-    col_s1, col_s2 = st.columns(2)
-    with col_s1:
-        strat1_name = st.text_input("Strategy A", value="Market Expansion")
-    with col_s2:
-        strat2_name = st.text_input("Strategy B", value="Product Innovation")
-
-    # 3. CRITICAL SUCCESS FACTORS (CSFs)
-    # Ορίζουμε τους παράγοντες και τη βαρύτητά τους (Weight)
-    factors = [
-        ("Financial Stability (Cash Flow)", 0.30),
-        ("Profitability (Margin)", 0.25),
-        ("Market Share / Growth", 0.20),
-        ("Operational Complexity", 0.15),
-        ("Resource Availability", 0.10)
-    ]
-
-    st.subheader("Attractiveness Scoring (1-4)")
-    st.caption("1: Not attractive | 2: Somewhat attractive | 3: Reasonably attractive | 4: Highly attractive")
-
-    scores_a = []
-    scores_b = []
-
-    for factor, weight in factors:
-        st.markdown(f"**{factor}** (Weight: {weight:.0%})")
-        c1, c2 = st.columns(2)
-        with c1:
-            s_a = st.slider(f"Score for {strat1_name}", 1, 4, 2, key=f"a_{factor}")
-            scores_a.append(s_a * weight)
-        with c2:
-            s_b = st.slider(f"Score for {strat2_name}", 1, 4, 2, key=f"b_{factor}")
-            scores_b.append(s_b * weight)
-
-    # 4. FINAL CALCULATION
-    total_a = sum(scores_a)
-    total_b = sum(scores_b)
+    n_strategies = st.number_input("Number of Strategies", min_value=2, max_value=len(DEFAULT_STRATEGIES), value=2)
+    cols = st.columns(n_strategies)
+    names = [cols[i].text_input(f"Strategy {chr(65 + i)}", value=DEFAULT_STRATEGIES[i], key=f"qspm_name_{i}")
+             for i in range(n_strategies)]
+    # Duplicate names would collapse the editor columns
+    names = [n if names.index(n) == i else f"{n} ({i + 1})" for i, n in enumerate(names)]
+
+    # 3. CRITICAL SUCCESS FACTORS x ATTRACTIVENESS SCORES
+    st.subheader("Weights & Attractiveness Scoring (1-4)")
+    st.caption("1: Not attractive | 2: Somewhat attractive | 3: Reasonably attractive | 4: Highly attractive. "
+               "Add or remove factor rows as needed.")
+
+    template = pd.DataFrame({"Factor": [f for f, _ in DEFAULT_FACTORS], "Weight": [w for _, w in DEFAULT_FACTORS],
+                             **{name: 2 for name in names}})
+    column_config = {
+        "Factor": st.column_config.TextColumn("Factor", required=True),
+        "Weight": st.column_config.NumberColumn("Weight", min_value=0.0, max_value=1.0, step=0.05, format="%.2f", required=True),
+        **{name: st.column_config.NumberColumn(name, min_value=1, max_value=4, step=1, required=True) for name in names},
+    }
+    matrix = st.data_editor(template, column_config=column_config, num_rows="dynamic", hide_index=True,
+                            use_container_width=True, key="qspm_matrix_" + "|".join(names))
+    matrix = matrix.dropna(subset=["Weight"])
+    if matrix.empty:
+        st.warning("⚠️ Add at least one factor.")
+        return
+
+    weights = matrix["Weight"].to_numpy(dtype=float)
+    scores = matrix[names].fillna(1).to_numpy(dtype=float)
+    total_w = weights.sum()
+    if round(total_w, 2) != 1.0:
+        st.warning(f"⚠️ Weights sum to {total_w:.2f}; adjust them to 1.0 for a valid QSPM analysis.")
+
+    # 4. FINAL CALCULATION (one weights @ scores product)
+    totals = qspm_totals(weights, scores)
+    order = rank_order(weights, scores)
 
     st.divider()
 
     # 5. RESULTS DISPLAY
-    res_a, res_b = st.columns(2)
-    with res_a:
-        st.metric(f"Total Score: {strat1_name}", f"{total_a:.2f}")
-    with res_b:
-        st.metric(f"Total Score: {strat2_name}", f"{total_b:.2f}")
+    res_cols = st.columns(n_strategies)
+    for i, name in enumerate(names):
+        res_cols[i].metric(f"Total Score: {name}", f"{totals[i]:.2f}", f"Rank {int(np.flatnonzero(order == i)[0]) + 1}",
+                           delta_color="off")
 
     # Strategic Verdict
-    if abs(total_a - total_b) < 0.2:
-        st.warning("**Strategic Stalemate:** The options are too close. Re-evaluate the weights or consider if both can be executed in phases.")
-    elif total_a > total_b:
-        st.success(f"**Winner: {strat1_name}** – This strategy aligns better with your success factors and current risk profile.")
+    first, second = order[0], order[1]
+    if abs(totals[first] - totals[second]) < 0.2:
+        st.warning(f"**Strategic Stalemate:** {names[first]} and {names[second]} are too close. Re-evaluate the weights or consider if both can be executed in phases.")
     else:
-        st.success(f"**Winner: {strat2_name}** – This strategy is quantitatively superior based on your scoring.")
+        st.success(f"**Winner: {names[first]}** – This strategy aligns better with your success factors and current risk profile.")
 
     # 6. VISUALIZATION TABLE
-    df_qspm = pd.DataFrame({
-        "Factor": [f[0] for f in factors],
-        "Weight": [f[1] for f in factors],
-        f"{strat1_name} (Weighted)": scores_a,
-        f"{strat2_name} (Weighted)": scores_b
-    })
+    tas = weighted_scores(weights, scores)
+    df_qspm = pd.DataFrame({"Factor": matrix["Factor"].to_numpy(), "Weight": weights,
+                            **{f"{name} (Weighted)": tas[:, i] for i, name in enumerate(names)}})
     st.table(df_qspm)
+
+    st.divider()
+
+    # 7. ROBUSTNESS TO THE WEIGHTS
+    show_weight_robustness(weights, scores, names, key="qspm_tool")
@@ -1,53 +1,116 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
-# -------------------------------
-# Calculation Engines
-# -------------------------------
-
-def parse_number(x):
-    try:
-        return float(str(x).replace(",", ""))
-    except:
-        return 0.0
-
-def calculate_max_drop(old_price, price_inc_pct, profit_A, profit_B, profit_C, profit_D, pB, pC, pD):
-    # Weighted profit from customers who switch
-    weighted_sub_profit = (pB * profit_B + pC * profit_C + pD * profit_D)
-    
-    numerator = -price_inc_pct
-    # Strategic Formula: Maintenance of total profit including substitution recovery
-    denominator = ((profit_A - weighted_sub_profit) / old_price) + price_inc_pct
-    
-    if denominator == 0:
-        return 0.0
-    return (numerator / denominator) * 100
+from core.diversion import load_diversion, load_portfolio
+from core.engine.operations import top_n
+from core.engine.pricing import required_sales_increase
+from core.engine.substitution import calculate_max_drop, diversion_leakage, max_drop_matrix, portfolio_profit_change
+from core.formatting import format_numbers, parse_numbers
+from ui import charts
 
-def required_sales_increase(price_red_pct, contribution_margin):
-    if contribution_margin <= 0:
-        return 0.0
-    return (price_red_pct / contribution_margin) * 100
+FRAGILE_DROP = 8.0          # % volume drop below which a price increase is fragile (matches the verdict bands)
+FRAGILE_DISPLAY_LIMIT = 25
 
 # -------------------------------
 # Visualization
 # -------------------------------
 
-def plot_sensitivity(base_value, scenarios):
+def plot_sensitivity(fig, base_value, scenarios):
     labels = list(scenarios.keys())
     impacts = [base_value * factor - base_value for factor in scenarios.values()]
     
-    fig, ax = plt.subplots(figsize=(10, 5))
+    ax = fig.subplots()
     colors = ['#2ca02c' if x <= 0 else '#d62728' for x in impacts]
     ax.barh(labels, impacts, color=colors, alpha=0.8)
     ax.axvline(0, color='black', linewidth=1)
     ax.set_title("Sensitivity Analysis: Impact on Required Growth", fontsize=12, fontweight='bold')
     ax.set_xlabel("Percentage Point Shift vs Base Case (%)")
     ax.grid(True, linestyle=':', alpha=0.4)
+
+def drop_distribution_figure(max_drops):
+    fig = go.Figure(go.Histogram(x=-max_drops, nbinsx=40, marker_color="#636EFA"))
+    fig.add_vline(x=FRAGILE_DROP, line_dash="dot", line_color="#EF553B")
+    fig.update_layout(xaxis_title="Max Tolerable Volume Drop (%)", yaxis_title="Products", height=350, template="plotly_dark")
     return fig
 
+# -------------------------------
+# Portfolio Mode (Diversion Matrix)
+# -------------------------------
+
+def show_portfolio_substitution(products, diversion, default_increase):
+    names = products["Name"].to_numpy()
+    price = products["Price"].to_numpy()
+    profit = products["UnitProfit"].to_numpy()
+    volume = products["Volume"].to_numpy()
+    increase = products["PriceIncrease"].fillna(default_increase).to_numpy() if "PriceIncrease" in products else np.full(len(products), default_increase)
+
+    leakage = diversion_leakage(diversion)
+    if (leakage < -1e-9).any():
+        st.error(f"❌ Invalid Distribution: {int(np.sum(leakage < -1e-9))} products divert more than 100% of their lost volume.")
+        return
+
+    # One pass for every product
+    max_drop = max_drop_matrix(price, profit, increase, diversion)
+    raised = np.flatnonzero(increase > 0)  # unchanged prices have no drop limit (-0) and are not fragile
+    fragile = np.abs(max_drop[raised]) < FRAGILE_DROP
+
+    st.subheader("📊 Portfolio Drop Limits")
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Products", f"{len(products):,}")
+    m2.metric("Median Max Drop", f"{np.median(max_drop):.2f}%")
+    m3.metric("Fragile Products", f"{int(fragile.sum()):,}", f"< {FRAGILE_DROP:.0f}% tolerable drop", delta_color="off")
+    m4.metric("Avg. Leakage", f"{np.mean(leakage):.1%}")
+
+    charts.plotly_chart(drop_distribution_figure, max_drop)
+
+    st.subheader(f"🔴 Most Fragile {min(FRAGILE_DISPLAY_LIMIT, raised.size)} Products")
+    idx = raised[top_n(max_drop[raised], FRAGILE_DISPLAY_LIMIT)]  # least negative = least room
+    if idx.size:
+        st.table(pd.DataFrame({
+            "Product": names[idx],
+            "Price Increase": increase[idx],
+            "Max Allowed Vol. Drop": max_drop[idx],
+            "Recaptured In-House": 1 - leakage[idx],
+        }).style.format({"Price Increase": "{:.1%}", "Max Allowed Vol. Drop": "{:.2f}%", "Recaptured In-House": "{:.1%}"}))
+    else:
+        st.info("No product has a price increase.")
+
+    if "Elasticity" not in products:
+        st.info("💡 Add an `elasticity` column to the product file to test the price move against expected demand loss.")
+        return
+
+    # Expected loss (elasticity x increase) vs the limit, portfolio-wide with cannibalization
+    st.divider()
+    st.subheader("🧠 Portfolio Verdict")
+    expected = np.clip(products["Elasticity"].fillna(0).to_numpy() * increase, 0, 1)
+    passes = expected * 100 <= np.abs(max_drop)
+    scenarios = np.stack([increase, np.where(passes, increase, 0.0)])
+    drops = np.stack([expected, np.where(passes, expected, 0.0)])
+    change, _ = portfolio_profit_change(price, profit, volume, scenarios, drops, diversion)
+
+    v1, v2, v3 = st.columns(3)
+    v1.metric("Products Clearing Their Limit", f"{int(passes.sum()):,} / {len(products):,}")
+    v2.metric("Profit Change: Reprice All", f"{change[0]:,.2f} €")
+    v3.metric("Profit Change: Reprice Only Clearing", f"{change[1]:,.2f} €")
+
+    if passes.all():
+        st.success("🟢 **Strong Pricing Power:** every product's expected volume loss stays inside its tolerable drop.")
+    elif change[1] > change[0]:
+        st.success(f"🟢 **Selective repricing wins:** raising prices only on the {int(passes.sum()):,} products that clear their limit adds {change[1] - change[0]:,.2f} € over a blanket increase.")
+    else:
+        st.warning("🟡 **Blanket repricing holds:** cannibalization inside the portfolio recaptures enough volume to carry the products that miss their individual limit.")
+
+def show_portfolio_inputs():
+    st.subheader("Portfolio Files")
+    st.caption("Products: product, price, unit_profit [, volume, price_increase, elasticity]. "
+               "Diversion: long form (from, to, share) or a square product x product table.")
+    products_file = st.file_uploader("Product table", type=["csv", "parquet", "pq"])
+    diversion_file = st.file_uploader("Diversion matrix", type=["csv", "parquet", "pq"])
+    increase = st.slider("Price Increase (where not in file) (%)", 0.0, 50.0, 5.0) / 100
+    return products_file, diversion_file, increase
+
 # -------------------------------
 # Main UI Logic
 # -------------------------------
@@ -61,14 +124,18 @@ def show_substitutes_sensitivity_tool():
     # -------------------------------
     with st.sidebar:
         st.header("Parameters")
-        mode = st.radio("Strategic Action:", ["Price Increase (Drop Limit)", "Price Reduction (Growth Required)"])
+        mode = st.radio("Strategic Action:", ["Price Increase (Drop Limit)", "Price Reduction (Growth Required)",
+                                              "Portfolio Price Increase (Diversion Matrix)"])
         
         st.divider()
-        if mode == "Price Increase (Drop Limit)":
+        if mode == "Portfolio Price Increase (Diversion Matrix)":
+            products_file, diversion_file, portfolio_increase = show_portfolio_inputs()
+
+        elif mode == "Price Increase (Drop Limit)":
             st.subheader("Core Product A")
-            old_p = st.text_input("Current Price (€)", "1.50")
+            old_p = st.text_input("Current Price (€)", format_numbers(1.5))
             p_inc = st.slider("Proposed Price Increase (%)", 0.0, 50.0, 10.0) / 100
-            p_A = st.text_input("Unit Profit (€)", "0.30")
+            p_A = st.text_input("Unit Profit (€)", format_numbers(0.3))
             
             st.subheader("Substitution Matrix")
             st.caption("Profit per unit if they switch to:")
@@ -104,7 +171,23 @@ def show_substitutes_sensitivity_tool():
 
     st.divider()
     
-    if mode == "Price Increase (Drop Limit)":
+    if mode == "Portfolio Price Increase (Diversion Matrix)":
+        if products_file is None or diversion_file is None:
+            st.error("⚠️ Upload both the product table and the diversion matrix.")
+            return
+        try:
+            with st.spinner("Loading portfolio..."):
+                products = load_portfolio(products_file)
+                diversion = load_diversion(diversion_file, products["Name"])
+        except (ImportError, ValueError, KeyError) as e:
+            st.error(f"⚠️ Cannot process files: {e}")
+            return
+        if products.empty:
+            st.error("⚠️ The product table holds no products.")
+            return
+        show_portfolio_substitution(products, diversion, portfolio_increase)
+
+    elif mode == "Price Increase (Drop Limit)":
         # Check for logical errors
         total_switch = pct_B + pct_C + pct_D
         leakage = 1.0 - total_switch
@@ -125,7 +208,7 @@ def show_substitutes_sensitivity_tool():
 
         # 2. Key Metrics
         max_drop = calculate_max_drop(
-            parse_number(old_p), p_inc, parse_number(p_A),
+            parse_numbers(old_p, default=0.0), p_inc, parse_numbers(p_A, default=0.0),
             p_B, p_C, p_D, pct_B, pct_C, pct_D
         )
 
@@ -171,7 +254,7 @@ def show_substitutes_sensitivity_tool():
         st.table(pd.DataFrame(results_data))
         
         # Tornado Chart
-        st.pyplot(plot_sensitivity(base_req, scenarios))
+        charts.pyplot(plot_sensitivity, base_req, scenarios)
 
         
 
@@ -1,15 +1,19 @@
 import streamlit as st
 
+from core.engine.cash_cycle import days_to_value
+from core.system_state import get_baseline, update_baseline
+
 def show_supplier_credit_analysis():
     st.header("🤝 Supplier Credit Analysis")
     st.info("Analyze how supplier payment terms affect your working capital and cash position.")
 
     # 1. SYNC WITH SHARED CORE
     # Χρειαζόμαστε το ετήσιο κόστος αγορών (Annual COGS)
-    q = st.session_state.get('volume', 1000)
-    vc = st.session_state.get('variable_cost', 12.0)
+    base = get_baseline()
+    q = base.volume
+    vc = base.variable_cost
     annual_cogs = q * vc
-    current_ap_days = st.session_state.get('payables_days', 30)
+    current_ap_days = base.payables_days
     
     st.write(f"**Current Baseline:** Annual Purchases (COGS): {annual_cogs:,.2f} € | Current Terms: {current_ap_days} days")
 
@@ -20,13 +24,13 @@ def show_supplier_credit_analysis():
     with col1:
         st.subheader("Current Terms")
         st.write(f"Days: {current_ap_days}")
-        current_ap_value = (current_ap_days / 365) * annual_cogs
+        current_ap_value = days_to_value(current_ap_days, annual_cogs)
         st.metric("Financing from Suppliers", f"{current_ap_value:,.2f} €")
 
     with col2:
         st.subheader("Target Terms")
         new_ap_days = st.slider("New Payment Terms (Days)", 0, 180, 45)
-        new_ap_value = (new_ap_days / 365) * annual_cogs
+        new_ap_value = days_to_value(new_ap_days, annual_cogs)
         st.metric("New Financing Value", f"{new_ap_value:,.2f} €")
 
     # 3. IMPACT ANALYSIS
@@ -62,6 +66,6 @@ def show_supplier_credit_analysis():
     st.info("⚠️ Warning: Be careful not to lose 'Early Payment Discounts'. If a supplier offers 2% discount for payment in 10 days, it is usually better to pay early than to keep the cash.")
 
     if st.button("🔄 Update Global AP Days"):
-        st.session_state.payables_days = new_ap_days
+        update_baseline(payables_days=new_ap_days)
         st.success("Global AP Days updated!")
         st.rerun()
@@ -0,0 +1,84 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from core.engine.path import PATH_ASSUMPTIONS
+from core.engine.tornado import rank_by_swing, tornado
+from core.system_state import get_baseline
+from ui import charts
+
+PARAM_LABELS = {
+    "price": "Price", "volume": "Sales Volume", "variable_cost": "Variable Cost", "fixed_cost": "Fixed Costs",
+    "ar_days": "Receivables Days", "inventory_days": "Inventory Days", "payables_days": "Payables Days",
+    "debt": "Debt", "interest_rate": "Interest Rate", "retention_rate": "Retention Rate",
+}
+
+KPI_LABELS = {
+    "net_profit": "Net Profit (€)",
+    "be_units": "Break-Even Units",
+    "working_capital_req": "Liquidity Gap (€)",
+    "clv_npv": "CLV NPV (€)",
+    "ebit": "EBIT (€)",
+    "stressed_profit": "Stress-Tested Profit (€)",
+    "safety_margin": "Margin of Safety (%)",
+    "ccc": "Cash Conversion Cycle (Days)",
+    "liquidity_drain": "Liquidity Drain (€/year)",
+    "ltv_cac": "LTV / CAC (x)",
+    "cac_payback_months": "CAC Payback (Months)",
+}
+
+def tornado_figure(labels, low_delta, high_delta, pct, title):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=labels, x=low_delta, orientation="h", name=f"-{pct:.0%}", marker_color="#EF553B"))
+    fig.add_trace(go.Bar(y=labels, x=high_delta, orientation="h", name=f"+{pct:.0%}", marker_color="#00CC96"))
+    fig.add_vline(x=0, line_color="white")
+    fig.update_layout(title=title, barmode="overlay", xaxis_title="Change vs Base Case",
+                      yaxis=dict(autorange="reversed"), height=420, template="plotly_dark")
+    return fig
+
+def show_tornado_sensitivity():
+    st.header("🌪️ Tornado Sensitivity — All Parameters, All KPIs")
+    st.info("Each baseline parameter is moved down and up by the same percentage; every path KPI is recomputed for all moves in one pass.")
+
+    base = get_baseline()
+    st.write(f"**🔗 Core Baseline Linked:** Price {base.price:,.2f} € | Volume {base.volume:,} | VC {base.variable_cost:,.2f} € | FC {base.fixed_cost:,.2f} €")
+
+    c1, c2 = st.columns([1, 2])
+    pct = c1.slider("Perturbation (±%)", 1, 50, 10) / 100
+    selected = c2.multiselect("KPIs", list(KPI_LABELS), default=["net_profit", "be_units", "working_capital_req", "clv_npv"],
+                              format_func=KPI_LABELS.get)
+
+    with st.expander("⚙️ Path Assumptions"):
+        a1, a2, a3 = st.columns(3)
+        assumptions = {
+            "dead_stock_pct": a1.number_input("Dead Stock (%)", 0.0, 50.0, base.dead_stock_pct * 100) / 100,
+            "cac": a2.number_input("CAC (€)", 0.0, value=PATH_ASSUMPTIONS["cac"]),
+            "clv_discount_rate": a3.number_input("CLV Discount Rate (%)", 0.0, 50.0, PATH_ASSUMPTIONS["clv_discount_rate"] * 100) / 100,
+        }
+
+    res = tornado(base, pct, **assumptions)
+    params = res["params"]
+
+    st.divider()
+    summary = {}
+    for i, kpi in enumerate(selected):
+        order, swing = rank_by_swing(res, kpi)
+        labels = [PARAM_LABELS[params[j]] for j in order]
+        b = res["base"][kpi]
+        low = res["low"][kpi][order] - b
+        high = res["high"][kpi][order] - b
+
+        col = st.columns(2)[i % 2] if len(selected) > 1 else st.container()
+        with col:
+            charts.plotly_chart(tornado_figure, labels, low, high, pct, f"{KPI_LABELS[kpi]} — base {b:,.2f}")
+        summary[KPI_LABELS[kpi]] = pd.Series(np.abs(res["high"][kpi] - res["low"][kpi]), index=[PARAM_LABELS[p] for p in params])
+
+    if summary:
+        st.subheader("📋 Swing Table (|High − Low|)")
+        table = pd.DataFrame(summary)
+        table = table.sort_values(by=table.columns[0], ascending=False)
+        st.table(table.style.format("{:,.2f}"))
+
+        top = table.index[0]
+        st.info(f"💡 **Cold Insight:** **{top}** is the dominant driver of {table.columns[0]} — a ±{pct:.0%} move swings it by **{table.iloc[0, 0]:,.2f}**.")
@@ -1,26 +1,42 @@
+import time
+
 import streamlit as st
+import pandas as pd
 
-def show_unit_cost_app():
-    st.header("📊 Industrial Unit Cost Calculator")
-    st.info("Analyze the components of your Variable Cost. Use 'Sync to Core' to update all other tools.")
+from core.bom import COST_COLUMNS, STRUCTURE_COLUMNS, load_bom
+from core.engine.operations import top_n
+from core.system_state import get_baseline, update_baseline
 
-    # 1. LOAD CURRENT STATE
-    if 'variable_cost' not in st.session_state:
-        st.session_state.variable_cost = 12.0
+TOP_DRIVERS = 15
 
+def show_sync(total_vc, global_vc, key="sync_vc"):
+    c1, c2 = st.columns([2, 1])
+    
+    with c1:
+        st.metric("Calculated Variable Cost", f"{total_vc:.2f} €", 
+                  delta=f"{total_vc - global_vc:.2f} € vs Global",
+                  delta_color="inverse")
+    
+    with c2:
+        if st.button("🔄 Sync to Shared Core", use_container_width=True, key=key):
+            update_baseline(variable_cost=total_vc)
+            st.success("Global Variable Cost Updated!")
+            st.rerun()
+
+def show_quick_breakdown(global_vc):
     st.subheader("Cost Breakdown")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 🛠 Direct Costs")
-        raw_materials = st.number_input("Raw Materials per unit (€)", min_value=0.0, value=st.session_state.variable_cost * 0.7)
-        labor_cost = st.number_input("Direct Labor per unit (€)", min_value=0.0, value=st.session_state.variable_cost * 0.2)
+        raw_materials = st.number_input("Raw Materials per unit (€)", min_value=0.0, value=global_vc * 0.7)
+        labor_cost = st.number_input("Direct Labor per unit (€)", min_value=0.0, value=global_vc * 0.2)
         
     with col2:
         st.markdown("### ⚡ Variable Overheads")
-        energy_cost = st.number_input("Energy/Utilities per unit (€)", min_value=0.0, value=st.session_state.variable_cost * 0.05)
-        packaging_shipping = st.number_input("Packaging & Shipping (€)", min_value=0.0, value=st.session_state.variable_cost * 0.05)
+        energy_cost = st.number_input("Energy/Utilities per unit (€)", min_value=0.0, value=global_vc * 0.05)
+        packaging_shipping = st.number_input("Packaging & Shipping (€)", min_value=0.0, value=global_vc * 0.05)
 
     # 2. CALCULATE TOTAL VC
     total_vc = raw_materials + labor_cost + energy_cost + packaging_shipping
@@ -28,18 +44,7 @@ def show_unit_cost_app():
     st.divider()
     
     # 3. ANALYSIS & SYNC
-    c1, c2 = st.columns([2, 1])
-    
-    with c1:
-        st.metric("Calculated Variable Cost", f"{total_vc:.2f} €", 
-                  delta=f"{total_vc - st.session_state.variable_cost:.2f} € vs Global",
-                  delta_color="inverse")
-    
-    with c2:
-        if st.button("🔄 Sync to Shared Core", use_container_width=True):
-            st.session_state.variable_cost = total_vc
-            st.success("Global Variable Cost Updated!")
-            st.rerun()
+    show_sync(total_vc, global_vc)
 
     # 4. VISUALIZATION OF COST STRUCTURE
     st.write("### Cost Structure Analysis")
@@ -57,5 +62,94 @@ def show_unit_cost_app():
             st.write(f"**{label}:** {value:.2f}€ ({pct:.1%})")
             st.progress(pct)
 
+def load_session_bom(structure, costs):
+    """The session's BillOfMaterials, rebuilt only when a different file is uploaded (edits survive reruns)."""
+    signature = (structure.name, structure.size, getattr(costs, "name", None), getattr(costs, "size", None))
+    if st.session_state.get("bom_signature") != signature:
+        with st.spinner("Building component graph..."):
+            st.session_state.bom = load_bom(structure, costs)
+        st.session_state.bom_signature = signature
+        st.session_state.bom_log = []
+    return st.session_state.bom
+
+def show_bom_rollup(global_vc):
+    st.subheader("🧩 Bill of Materials")
+    st.caption(f"Structure: {', '.join(STRUCTURE_COLUMNS.values())} (one row per component usage). "
+               f"Costs: {', '.join(COST_COLUMNS.values())} (purchase price of bought parts, conversion cost of assemblies).")
+    u1, u2 = st.columns(2)
+    structure = u1.file_uploader("BOM Structure", type=["csv", "parquet", "pq"], key="bom_structure")
+    costs = u2.file_uploader("Component Costs", type=["csv", "parquet", "pq"], key="bom_costs")
+    if structure is None:
+        return
+
+    try:
+        bom = load_session_bom(structure, costs)
+    except (ImportError, ValueError, KeyError) as e:
+        st.error(f"⚠️ Cannot build BOM: {e}")
+        return
+    show_bom_editor(bom, global_vc)
+
+def show_bom_editor(bom, global_vc):
+    roots = sorted(bom.roots())
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Components", f"{bom.names.size:,}")
+    m2.metric("Finished Products", f"{len(roots):,}")
+    m3.metric("BOM Depth (Levels)", f"{bom.depth}")
+
+    product = st.selectbox("Finished Product", roots)
+
+    # 1. PRICE CHANGE (incremental roll-up)
+    st.markdown("### ✏️ Component Price Change")
+    e1, e2 = st.columns(2)
+    component = e1.text_input("Component Code", placeholder="e.g. a raw material code")
+    if component:
+        if component not in bom.index:
+            e2.error(f"⚠️ Unknown component: {component}")
+        else:
+            current = float(bom.own_cost[bom.index[component]])
+            new_cost = e2.number_input(f"Own Cost of {component} (€)", min_value=0.0, value=current, key=f"bom_cost_{component}")
+            if new_cost != current:
+                start = time.perf_counter()
+                affected = bom.update({component: new_cost})
+                elapsed = (time.perf_counter() - start) * 1000
+                st.session_state.bom_log.append({"Component": component, "Old Cost": current, "New Cost": new_cost,
+                                                 "Nodes Recomputed": affected.size})
+                st.caption(f"Recomputed {affected.size:,} of {bom.names.size:,} nodes in {elapsed:.1f} ms.")
+
+    st.divider()
+
+    # 2. ANALYSIS & SYNC
+    total_vc = bom.unit_cost(product)
+    show_sync(total_vc, global_vc, key="sync_vc_bom")
+
+    # 3. COST DRIVERS
+    st.write(f"### Cost Structure Analysis: {product}")
+    names, quantity, contribution = bom.breakdown(product)
+    top = top_n(contribution, TOP_DRIVERS)
+    st.table(pd.DataFrame({
+        "Component": names[top],
+        "Qty per Unit": quantity[top],
+        "Own Cost (€)": bom.own_cost[[bom.index[n] for n in names[top]]],
+        "Contribution (€)": contribution[top],
+        "Share": contribution[top] / total_vc if total_vc > 0 else 0.0,
+    }).style.format({"Qty per Unit": "{:,.3f}", "Own Cost (€)": "{:,.4f}", "Contribution (€)": "{:,.4f}", "Share": "{:.1%}"}))
+
+    if st.session_state.bom_log:
+        with st.expander(f"📝 Price Changes This Session ({len(st.session_state.bom_log)})"):
+            st.table(pd.DataFrame(st.session_state.bom_log))
+
+def show_unit_cost_app():
+    st.header("📊 Industrial Unit Cost Calculator")
+    st.info("Analyze the components of your Variable Cost. Use 'Sync to Core' to update all other tools.")
+
+    # 1. LOAD CURRENT STATE
+    global_vc = get_baseline().variable_cost
+
+    mode = st.radio("Input Mode", ["Quick Breakdown", "Bill of Materials (CSV / Parquet)"], horizontal=True)
+    if mode == "Quick Breakdown":
+        show_quick_breakdown(global_vc)
+    else:
+        show_bom_rollup(global_vc)
+
     st.divider()
     st.caption("Tip: If raw material prices increase, update them here and sync. Your Break-Even and Survival Margin will adjust automatically.")
@@ -0,0 +1,37 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from core.engine.cash_cycle import daily_cash_ledger
+from ui import charts
+
+def ledger_figure(collections, payments, balance):
+    days = np.arange(1, len(balance) + 1)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=days, y=np.cumsum(collections), name="Cumulative Collections",
+                             line=dict(color="#00CC96", dash="dot")))
+    fig.add_trace(go.Scatter(x=days, y=-np.cumsum(payments), name="Cumulative Supplier Payments",
+                             line=dict(color="#EF553B", dash="dot")))
+    fig.add_trace(go.Scatter(x=days, y=balance, name="Cash Balance", line=dict(color="#636EFA", width=4)))
+    fig.add_hline(y=0, line_dash="dot", line_color="white")
+    fig.update_layout(xaxis_title="Day", yaxis_title="€", height=450, template="plotly_dark")
+    return fig
+
+def show_cash_ledger(price, volume, variable_cost, inv_days, ar_days, ap_days, fixed_cost=0.0):
+    """365-day cash ledger: purchases, collections and supplier payments scheduled from the cycle days."""
+    st.subheader("📅 365-Day Cash Ledger")
+    st.caption("Day 1 is the first stock purchase. Sales follow after the inventory days, "
+               "collections after the receivable days, supplier payments after the payable days.")
+
+    include_fc = st.checkbox("Include daily fixed costs", value=False, key="ledger_fixed_costs",
+                             help=f"Spreads the baseline fixed costs ({fixed_cost:,.2f} €/year) evenly over the year.")
+    ledger = daily_cash_ledger(price, volume, variable_cost, inv_days, ar_days, ap_days,
+                               fixed_cost=fixed_cost if include_fc else 0.0)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Peak Funding Need", f"{ledger['peak_funding']:,.2f} €")
+    m2.metric("Lowest Balance On", f"Day {ledger['min_day']}")
+    m3.metric("Days Below Zero", f"{ledger['days_negative']}")
+    m4.metric("Day-365 Balance", f"{ledger['ending_balance']:,.2f} €")
+
+    charts.plotly_chart(ledger_figure, ledger["collections"], ledger["payments"], ledger["balance"])
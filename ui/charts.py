@@ -0,0 +1,44 @@
+"""
+Chart rendering service.
+Matplotlib charts are drawn on object-oriented `Figure`s (never the global pyplot
+state machine, so concurrent sessions cannot cross-draw), rasterized to PNG and
+released at once. PNGs and Plotly figures are cached by the memo layer, keyed on
+the builder function and its inputs, so an unchanged chart costs nothing on rerun.
+Builders must be module-level functions of plain values (numbers, lists, arrays, dicts).
+"""
+
+import io
+
+import streamlit as st
+from matplotlib.figure import Figure
+
+from core.engine.memo import memoize
+
+DPI = 100
+
+@memoize(maxsize=128, copy_results=False)
+def render_png(draw, *args, figsize=(10, 5), **kwargs):
+    """Run `draw(fig, *args, **kwargs)` on a fresh Figure and return the PNG bytes."""
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig, *args, **kwargs)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=DPI, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+@memoize(maxsize=64, copy_results=False)
+def build_plotly(build, *args, **kwargs):
+    """Cached `build(*args, **kwargs)` -> plotly Figure (treated as read-only)."""
+    return build(*args, **kwargs)
+
+def pyplot(draw, *args, figsize=(10, 5), **kwargs):
+    """Drop-in for `st.pyplot`: draw, render and cache a matplotlib chart."""
+    # No width keyword: its name changed across Streamlit versions (use_column_width / use_container_width / width);
+    # the default already shrinks a wider image to the column
+    st.image(render_png(draw, *args, figsize=figsize, **kwargs))
+
+def plotly_chart(build, *args, **kwargs):
+    """Drop-in for `st.plotly_chart`: build (cached) and display a plotly chart."""
+    st.plotly_chart(build_plotly(build, *args, **kwargs), use_container_width=True)
@@ -1,5 +1,41 @@
+import sqlite3
 import streamlit as st
 
+from core.engine.path import evaluate_path
+from core.scenario_store import get_store
+from core.system_state import get_baseline, get_metrics
+
+def show_scenario_picker(allow_save):
+    """Load (and optionally save) named baselines from the shared scenario store."""
+    try:
+        store = get_store()
+        scenarios = store.list()
+    except (sqlite3.Error, OSError) as e:
+        st.caption(f"Scenario store unavailable: {e}")
+        return
+
+    if scenarios:
+        labels = {f"{s['name']}" + (f" — {s['analyst']}" if s['analyst'] else ""): s['name'] for s in scenarios}
+        c1, c2 = st.columns([3, 1])
+        choice = c1.selectbox("Saved Scenarios", list(labels), label_visibility="collapsed")
+        if c2.button("📂 Load Scenario", use_container_width=True):
+            st.session_state.baseline = store.load(labels[choice])
+            st.session_state.baseline_locked = True
+            st.session_state.mode = "home"
+            st.rerun()
+    else:
+        st.caption("No saved scenarios yet.")
+
+    if allow_save:
+        c1, c2, c3 = st.columns([2, 1, 1])
+        name = c1.text_input("Scenario Name", placeholder="e.g. Q3 price test")
+        analyst = c2.text_input("Analyst", placeholder="optional")
+        c3.write("")
+        if c3.button("💾 Save Current", use_container_width=True, disabled=not name.strip()):
+            base = get_baseline()
+            store.save(name.strip(), base, analyst=analyst.strip(), kpis=evaluate_path(base))
+            st.success(f"Scenario '{name.strip()}' saved.")
+
 def show_home():
     # PHASE A: Entry Mode (No Baseline Defined)
     if not st.session_state.get('baseline_locked', False):
@@ -17,25 +53,21 @@ def show_home():
             st.session_state.flow_step = 0
             st.rerun()
 
+        with st.expander("📂 Open a Saved Scenario"):
+            show_scenario_picker(allow_save=False)
+
     # PHASE B: Control Center Mode (System Operational)
     else:
         st.title("🧪 Managers’ Lab — Control Center")
         st.caption("Structural Overview — 365-Day Operating Model")
         st.markdown("---")
 
-        # Calculations from Shared Core
-        # Ensure these keys exist in core/system_state.py
-        p = st.session_state.get('price', 0.0)
-        v = st.session_state.get('volume', 0)
-        vc = st.session_state.get('variable_cost', 0.0)
-        fc = st.session_state.get('fixed_cost', 0.0)
-        debt = st.session_state.get('debt', 0.0)
-        rate = st.session_state.get('interest_rate', 0.0)
-        
-        rev = p * v
-        ebit = ((p - vc) * v) - fc
-        net_profit = ebit - (debt * rate)
-        margin = (p - vc) / p if p > 0 else 0
+        # Derived metrics from the Shared Core graph (only recomputed when a pillar changes)
+        metrics = get_metrics()
+        rev = metrics["revenue"]
+        ebit = metrics["ebit"]
+        net_profit = metrics["net_profit"]
+        margin = metrics["contribution_margin"]
 
         # Executive Metrics
         c1, c2, c3 = st.columns(3)
@@ -58,6 +90,10 @@ def show_home():
                 st.session_state.mode = "library"
                 st.rerun()
 
+        st.divider()
+        st.subheader("💾 Scenarios")
+        show_scenario_picker(allow_save=True)
+
         st.divider()
         with st.expander("System Configuration"):
             st.write(
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from core import telemetry
+
 def show_library():
     st.title("📚 Tool Library")
     st.caption("Direct access to all analytical modules.")
@@ -8,6 +10,7 @@ def show_library():
         "📈 Pricing & Break-Even": [
             ("Break-Even Shift Analysis",  "break_even_shift_calculator", "show_break_even_shift_calculator"),
             ("Loss Threshold Analysis",    "loss_threshold",              "show_loss_threshold_before_price_cut"),
+            ("Goal Seek",                  "goal_seek",                   "show_goal_seek"),
             ("Pricing Power Radar",        "pricing_power_radar",         "show_pricing_power_radar"),
         ],
         "💰 Finance & Cash Flow": [
@@ -22,6 +25,7 @@ def show_library():
             ("QSPM Strategy Tool",         "qspm_two_strategies",         "show_qspm_tool"),
             ("Substitutes Sensitivity",    "substitution_analysis_tool",  "show_substitutes_sensitivity_tool"),
             ("Complementary Analysis",     "complementary_analysis",      "show_complementary_analysis"),
+            ("Tornado Sensitivity",        "tornado_sensitivity",         "show_tornado_sensitivity"),
         ],
         "📦 Operations": [
             ("Unit Cost Calculator",       "unit_cost_app",               "show_unit_cost_app"),
@@ -77,9 +81,11 @@ def show_library():
 
     # ── FIX 5: Show the real exception so developers can debug ──
     try:
-        module = __import__(f"tools.{file_name}", fromlist=[function_name])
-        func   = getattr(module, function_name)
-        func()
+        with telemetry.target("tool", file_name) as timing:
+            with timing.phase("import"):
+                module = __import__(f"tools.{file_name}", fromlist=[function_name])
+            func   = getattr(module, function_name)
+            func()
     except ModuleNotFoundError:
         st.error(f"❌ Module not found: `tools/{file_name}.py`")
     except AttributeError:
@@ -0,0 +1,54 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from core.engine.qspm import DEFAULT_CONCENTRATION, DEFAULT_SAMPLES, weight_robustness
+from ui import charts
+
+def win_share_figure(names, win_share):
+    fig = go.Figure(go.Bar(x=list(names), y=win_share * 100, marker_color="#636EFA",
+                           text=[f"{s:.1%}" for s in win_share], textposition="outside"))
+    fig.update_layout(yaxis_title="Ranked First (% of weight draws)", yaxis_range=[0, 105], height=350, template="plotly_dark")
+    return fig
+
+def show_weight_robustness(weights, scores, names, key="qspm"):
+    """Dirichlet weight sampling around `weights`: how often each strategy ranks first."""
+    st.subheader("🎲 Weight Robustness")
+    st.caption("Weights are rarely known exactly. The weights are redrawn many times around your choice "
+               "(Dirichlet sampling) and every draw re-ranks the strategies.")
+
+    c1, c2 = st.columns(2)
+    confidence = c1.select_slider("Confidence in Weights", options=[5, 10, 20, 50, 100, 200, 500],
+                                  value=int(DEFAULT_CONCENTRATION), key=f"{key}_concentration",
+                                  help="Dirichlet concentration: low = draws spread widely, high = draws stay close to your weights.")
+    samples = c2.select_slider("Weight Draws", options=[10_000, 50_000, 100_000, 200_000],
+                               value=DEFAULT_SAMPLES, key=f"{key}_samples")
+
+    if np.clip(np.asarray(weights, dtype=float), 0, None).sum() <= 0:
+        st.warning("⚠️ Give at least one factor a positive weight.")
+        return
+
+    res = weight_robustness(weights, scores, samples=samples, concentration=float(confidence))
+    charts.plotly_chart(win_share_figure, tuple(names), res["win_share"])
+
+    table = pd.DataFrame({
+        "Strategy": list(names),
+        "Ranked First": res["win_share"],
+        "Ranked Last": res["rank_share"][:, -1],
+        "Mean TAS": res["mean"],
+        "TAS 5%–95%": [f"{lo:.2f} – {hi:.2f}" for lo, hi in zip(res["p05"], res["p95"])],
+    })
+    st.table(table.style.format({"Ranked First": "{:.1%}", "Ranked Last": "{:.1%}", "Mean TAS": "{:.2f}"}))
+
+    if res["tie_share"] > 0:
+        st.caption(f"{res['tie_share']:.1%} of the draws end in a tie for first place (identical weighted scores).")
+
+    best = int(np.argmax(res["win_share"]))
+    share = res["win_share"][best]
+    if share >= 0.8:
+        st.success(f"✅ **Robust verdict:** {names[best]} ranks first in {share:.0%} of the weight draws.")
+    elif share >= 0.5:
+        st.warning(f"⚖️ **Leaning verdict:** {names[best]} wins {share:.0%} of the draws — small changes in priorities can flip it.")
+    else:
+        st.error(f"🚨 **Fragile verdict:** no strategy wins a majority of the draws (best: {names[best]}, {share:.0%}). Agree on the weights before committing.")
@@ -1,5 +1,17 @@
 import streamlit as st
 
+
+def render_metric_trace():
+    """Lists the derived metrics the dependency graph recomputed during this rerun."""
+    graph = st.session_state.get("metrics")
+    if graph is None:
+        return
+    with st.sidebar.expander(f"🔍 Recomputed This Rerun ({len(graph.recomputed)})"):
+        if graph.recomputed:
+            st.caption(" → ".join(graph.recomputed))
+        else:
+            st.caption("Nothing: every metric shown came from the graph cache.")
+
 def render_sidebar():
     with st.sidebar:
         st.title("🧪 Managers’ Lab")
@@ -0,0 +1,12 @@
+"""
+Widgets shared by the file-upload modes of the tools.
+"""
+
+
+def pick_column(container, label, columns, default, fallback):
+    """
+    Selectbox over the uploaded file's `columns` in `container` (st or a column).
+    Preselects `default` when the file has it, else the `fallback`-th column (clamped to the last one).
+    """
+    index = columns.index(default) if default in columns else min(fallback, len(columns) - 1)
+    return container.selectbox(label, columns, index=index)
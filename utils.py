@@ -1,23 +1,24 @@
+import math
+
+from core.formatting import format_numbers, format_percent, parse_numbers
+
+# Μεμονωμένες τιμές· για ολόκληρες στήλες χρησιμοποίησε απευθείας το core.formatting (locale="el_GR")
+
 def format_number_gr(value, symbol=""):
     """Μορφοποίηση αριθμού σε ελληνικό στυλ: κόμμα για δεκαδικά, τελεία για χιλιάδες"""
     try:
-        formatted = f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        formatted = format_numbers(float(value), 2, locale="el_GR")
         return f"{formatted} {symbol}".strip()
     except Exception:
         return str(value)
 
 def parse_gr_number(x):
-    try:
-        if isinstance(x, (float, int)):
-            return x
-        return float(x.replace(".", "").replace(",", "."))
-    except:
-        return None
+    if isinstance(x, (float, int)):
+        return x
+    value = parse_numbers(str(x), locale="el_GR")
+    return None if math.isnan(value) else value
 
 def format_percentage_gr(value, decimals=2):
     if value is None:
         return "-"
-    sign = "-" if value < 0 else ""
-    abs_val = abs(value)
-    formatted = f"{abs_val:,.{decimals}f}".replace(",", "#").replace(".", ",").replace("#", ".")
-    return f"{sign}{formatted}%"
+    return format_percent(value, decimals, locale="el_GR", ratio=False)